@@ -78,6 +78,7 @@ setup(
             "sdphost=spsdk.apps.sdphost:safe_main",
             "sdpshost=spsdk.apps.sdpshost:safe_main",
             "spsdk=spsdk.apps.spsdk_apps:safe_main",
+            "spsdk-cache=spsdk.apps.spsdk_cache:safe_main",
             "nxpdebugmbox=spsdk.apps.nxpdebugmbox:safe_main",
             "nxpcrypto=spsdk.apps.nxpcrypto:safe_main",
             "nxpdevscan=spsdk.apps.nxpdevscan:safe_main",
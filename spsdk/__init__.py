@@ -44,6 +44,22 @@ SPSDK_CACHE_DISABLED = bool(
     os.environ.get(SPSDK_ENV_CACHE_DISABLED) or os.environ.get("SPSDK_CACHE_DISABLED") or False
 )
 
+# SPSDK_CACHE_DEEP_CHECK might be redefined by SPSDK_CACHE_DEEP_CHECK_{version} env variable,
+# default is False. When enabled the whole data folder is checked for changes at start.
+SPSDK_ENV_CACHE_DEEP_CHECK = "SPSDK_CACHE_DEEP_CHECK_" + version.replace(".", "_")
+SPSDK_CACHE_DEEP_CHECK = bool(
+    os.environ.get(SPSDK_ENV_CACHE_DEEP_CHECK) or os.environ.get("SPSDK_CACHE_DEEP_CHECK") or False
+)
+
+# SPSDK_KEY_CACHE_DISABLED might be redefined by SPSDK_KEY_CACHE_DISABLED_{version} env variable,
+# default is False. When enabled the keys are loaded from files each time they are used.
+SPSDK_ENV_KEY_CACHE_DISABLED = "SPSDK_KEY_CACHE_DISABLED_" + version.replace(".", "_")
+SPSDK_KEY_CACHE_DISABLED = bool(
+    os.environ.get(SPSDK_ENV_KEY_CACHE_DISABLED)
+    or os.environ.get("SPSDK_KEY_CACHE_DISABLED")
+    or False
+)
+
 SPSDK_YML_INDENT = 2
 
 
@@ -13,7 +13,7 @@ import logging
 import os
 import shlex
 import sys
-from typing import Optional
+from typing import List, Optional
 
 import click
 
@@ -44,10 +44,26 @@ from spsdk.apps.utils.utils import (
     progress_bar,
 )
 from spsdk.exceptions import SPSDKError
+from spsdk.mboot.differential import write_memory_differential
 from spsdk.mboot.error_codes import stringify_status_code
 from spsdk.mboot.mcuboot import GenerateKeyBlobSelect, McuBoot, StatusCode, parse_property_value
-from spsdk.mboot.scanner import get_mboot_interface
-from spsdk.utils.misc import Endianness, load_hex_string
+from spsdk.mboot.parallel import FlashPlan, flash_devices
+from spsdk.mboot.properties import PropertyCache
+from spsdk.mboot.scanner import get_mboot_interface, get_mboot_interfaces
+from spsdk.utils.misc import Endianness, load_hex_string, write_file
+
+logger = logging.getLogger(__name__)
+
+
+def get_mcuboot(ctx: click.Context) -> McuBoot:
+    """Create McuBoot for the interface of the invoked command.
+
+    The commands of one batch share its property cache.
+
+    :param ctx: Context of the invoked command
+    :return: McuBoot instance, not opened yet
+    """
+    return McuBoot(ctx.obj["interface"], property_cache=ctx.obj.get("property_cache"))
 
 
 @click.group(name="blhost", no_args_is_help=True, cls=CommandsTreeGroup)
@@ -93,8 +109,10 @@ def main(
 
     # if --help is provided anywhere on command line, skip interface lookup and display help message
     if not is_click_help(ctx, sys.argv):
-        ctx.obj = {
-            "interface": get_mboot_interface(
+        interface = None
+        # the multi-device command opens interfaces of all devices by itself
+        if ctx.invoked_subcommand != "flash-image-parallel":
+            interface = get_mboot_interface(
                 port=port,
                 usb=usb,
                 sdio=sdio,
@@ -102,7 +120,10 @@ def main(
                 timeout=timeout,
                 buspal=buspal,
                 lpcusbsio=lpcusbsio,
-            ),
+            )
+        ctx.obj = {
+            "interface": interface,
+            "timeout": timeout,
             "use_json": use_json,
             "suppress_progress_bar": use_json or silent or log_level < logging.WARNING,
             "silent": silent,
@@ -123,10 +144,12 @@ def batch(ctx: click.Context, command_file: str) -> None:
     Comment are supported. Everything after '#' is a comment (just like in Python/Shell)
 
     Note: This is an early experimental format, it may change at any time.
+    Property values read from the target are cached for the whole batch.
 
     \b
     COMMAND_FILE    - path to blhost command file
     """
+    ctx.obj["property_cache"] = PropertyCache()
     with open(command_file) as f:
         for line in f.readlines():
             tokes = shlex.split(line, comments=True)
@@ -142,6 +165,7 @@ def batch(ctx: click.Context, command_file: str) -> None:
                 raise SPSDKError(f"Unknown command: {command_name}")
             cmd_obj.parse_args(ctx, command_args)
             ctx.invoke(cmd_obj, **ctx.params)
+    logger.info(f"Batch finished: {ctx.obj['property_cache']}")
 
 
 @main.command()
@@ -155,7 +179,7 @@ def call(ctx: click.Context, address: int, argument: int) -> None:
     ADDRESS     - function code address
     ARGUMENT    - argument for the function
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.call(address, argument)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -173,7 +197,7 @@ def configure_memory(ctx: click.Context, address: int, memory_id: int) -> None:
     MEMORY_ID   - id of memory
     ADDRESS     - starting address
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.configure_memory(address, memory_id)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -208,7 +232,7 @@ def efuse_program_once(
     """
     if lock == "lock":
         address = address | (1 << 24)
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.efuse_program_once(address, data, verify=verify)
         display_output([response], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -222,7 +246,7 @@ def efuse_read_once(ctx: click.Context, address: int) -> None:
     \b
     ADDRESS - is the address of OTP word, not the shadowed memory address.
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.efuse_read_once(address)
         display_output(
             None if response is None else [4, response],
@@ -251,7 +275,7 @@ def execute(ctx: click.Context, address: int, argument: int, stackpointer: int)
     ARGUMENT     - Argument passed to the application
     STACKPOINTER - Stack pointer for the application
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.execute(address, argument, stackpointer)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -272,7 +296,7 @@ def flash_erase_region(ctx: click.Context, address: int, byte_count: int, memory
     BYTE_COUNT  - number of bytes to erase
     MEMORY_ID   - id of memory to erase (default: 0)
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.flash_erase_region(address, byte_count, memory_id)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -289,7 +313,7 @@ def flash_erase_all(ctx: click.Context, memory_id: int) -> None:
     \b
     Note: excluding protected regions.
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.flash_erase_all(memory_id)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -298,19 +322,42 @@ def flash_erase_all(ctx: click.Context, memory_id: int) -> None:
 @click.pass_context
 def flash_erase_all_unsecure(ctx: click.Context) -> None:
     """Erase complete flash memory and recover flash security section."""
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.flash_erase_all_unsecure()
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
 
 @main.command(no_args_is_help=True)
+@click.option(
+    "--diff",
+    is_flag=True,
+    default=False,
+    help="Differential mode, read the flash back and erase and write only the changed sectors.",
+)
+@click.option(
+    "-w",
+    "--pipeline-window",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Count of read commands queued in the device during the differential compare (default: 1)",
+)
 @click.argument("image_file_path", metavar="FILE", type=str, required=True)
 @click.argument("erase", type=str, required=False, default="none")
 @click.argument("memory_id", type=INT(), required=False, default="0")
 @click.pass_context
-def flash_image(ctx: click.Context, image_file_path: str, erase: str, memory_id: int) -> None:
+def flash_image(
+    ctx: click.Context,
+    diff: bool,
+    pipeline_window: int,
+    image_file_path: str,
+    erase: str,
+    memory_id: int,
+) -> None:
     """Write the formatted image in <FILE> to the memory specified by memoryID.
 
+    In differential mode (--diff) the ERASE argument is ignored, only the sectors
+    whose content differs from the image are erased and written.
+
     \b
     FILE       - path to image file
     ERASE      - string 'erase' determines if flash is erased before writing
@@ -333,7 +380,28 @@ def flash_image(ctx: click.Context, image_file_path: str, erase: str, memory_id:
     if memory_id:
         mem_id = memory_id
     bin_image = BinaryImage.load_binary_image(image_file_path)
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
+        if diff:
+            for i, segment in enumerate(bin_image.sub_images, start=1):
+                with progress_bar(
+                    suppress=ctx.obj["suppress_progress_bar"], label=f"Writing segment #{i}"
+                ) as progress_callback:
+                    report = write_memory_differential(
+                        mboot,
+                        address=segment.absolute_address,
+                        data=segment.export(),
+                        mem_id=mem_id,
+                        progress_callback=progress_callback,
+                        pipeline_window=pipeline_window,
+                    )
+                display_output(
+                    [],
+                    report.status_code,
+                    ctx.obj["use_json"],
+                    ctx.obj["silent"],
+                    str(report),
+                )
+            return
         if erase == "erase":
             for segment in bin_image.sub_images:
                 mboot.flash_erase_region(
@@ -357,6 +425,95 @@ def flash_image(ctx: click.Context, image_file_path: str, erase: str, memory_id:
             display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
 
+@main.command(no_args_is_help=True)
+@click.option(
+    "-d",
+    "--device",
+    "devices",
+    type=str,
+    multiple=True,
+    required=True,
+    help=(
+        "Interface of a device to be flashed in format <type>:<params>, use several times for "
+        "more devices. Type is one of 'port', 'usb', 'sdio', 'lpcusbsio' or 'plugin' and params "
+        "are same as for the corresponding option, e.g. -d usb:0x1fc9:0x0021 -d port:COM3"
+    ),
+)
+@click.option("--verify", is_flag=True, default=False, help="Read back and compare written data.")
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Number of devices flashed at once, all devices by default.",
+)
+@click.option(
+    "-r",
+    "--report",
+    "report_file",
+    type=click.Path(dir_okay=False),
+    help="Path to JSON report with the results of all devices.",
+)
+@click.argument("image_file_path", metavar="FILE", type=str, required=True)
+@click.argument("erase", type=str, required=False, default="none")
+@click.argument("memory_id", type=INT(), required=False, default="0")
+@click.pass_context
+def flash_image_parallel(
+    ctx: click.Context,
+    devices: List[str],
+    verify: bool,
+    workers: Optional[int],
+    report_file: Optional[str],
+    image_file_path: str,
+    erase: str,
+    memory_id: int,
+) -> None:
+    """Write the formatted image in <FILE> into several devices concurrently.
+
+    Same as flash-image, but the image is programmed into all devices given by '-d' options
+    (the global interface options are ignored). The results are aggregated into a JSON report.
+
+    \b
+    FILE       - path to image file
+    ERASE      - string 'erase' determines if flash is erased before writing
+    MEMORY_ID  - id of memory to erase (default: 0)
+    """
+    from spsdk.utils.images import BinaryImage
+
+    if not os.path.isfile(image_file_path):
+        raise SPSDKError("The image file does not exist")
+    if erase not in ["erase", "none"]:
+        raise SPSDKError(
+            "The option for erasing was not declared properly. Choose from 'erase' or 'none'."
+        )
+    interfaces = get_mboot_interfaces(devices, timeout=ctx.obj["timeout"])
+    plan = FlashPlan.from_binary_image(
+        BinaryImage.load_binary_image(image_file_path),
+        erase=erase == "erase",
+        verify=verify,
+        mem_id=memory_id,
+    )
+    with progress_bar(
+        suppress=ctx.obj["suppress_progress_bar"], label=f"Flashing {len(interfaces)} devices"
+    ) as progress_callback:
+        report = flash_devices(
+            interfaces, plan, max_workers=workers, progress_callback=progress_callback
+        )
+    report_json = json.dumps(report.to_dict(), indent=4)
+    if report_file:
+        write_file(report_json, report_file)
+    if ctx.obj["use_json"]:
+        click.echo(report_json)
+    elif not ctx.obj["silent"]:
+        for result in report.results:
+            status = "OK" if result.success else f"FAILED ({result.error or 'status code'})"
+            click.echo(
+                f"{result.device}: {status}, {stringify_status_code(result.status_code)}, "
+                f"{result.duration:.3f}s"
+            )
+    if not report.success:
+        raise SPSDKAppError()
+
+
 @main.command(no_args_is_help=True)
 @click.argument("index", type=INT(), required=True)
 @click.argument("byte_count", type=click.Choice(["4", "8"]), required=True)
@@ -382,7 +539,7 @@ def flash_program_once(
     """
     byte_order = Endianness.BIG if endianness == "MSB" else Endianness.LITTLE
     input_data = data.to_bytes(int(byte_count), byteorder=byte_order.value)
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.flash_program_once(index=index, data=input_data)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -398,7 +555,7 @@ def flash_read_once(ctx: click.Context, index: int, byte_count: str) -> None:
     INDEX        - fuse word index
     BYTE_COUNT   - width in bits (acceptable only 4 or 8-byte long data)
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.flash_read_once(index=index, count=int(byte_count))
         display_output(
             None
@@ -425,7 +582,7 @@ def flash_security_disable(ctx: click.Context, key: str) -> None:
         key_bytes = bytes.fromhex(key)
     except ValueError as e:
         raise SPSDKError("Key is not a valid hex-string [A-Fa-f0-9]") from e
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.flash_security_disable(backdoor_key=key_bytes)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -456,7 +613,7 @@ def flash_read_resource(
     OPTION       - Area to be read. 0 means Flash IFR, 1 means Flash Firmware ID.
     OUT_FILE     - Path to file, where the output will be stored
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.flash_read_resource(address=address, length=length, option=int(option))
 
         if response:
@@ -498,7 +655,7 @@ def fill_memory(
     FORMAT      - format of the pattern [word|short|byte] (default: word)
     """
     del pattern_format  # temporary workaround for not unused parameter
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.fill_memory(address, byte_count, pattern)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -526,7 +683,7 @@ def fuse_program(ctx: click.Context, address: int, data_source: str, memory_id:
         with open(file_path, "rb") as f:
             data = f.read(size)
 
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.fuse_program(address, data, memory_id)
         display_output(
             [len(data)] if response else None,
@@ -561,7 +718,7 @@ def fuse_read(
     FILE        - store result into this file, if not specified use stdout
     MEMORY_ID   - id of memory to read from (default: 0)
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.fuse_read(address, byte_count, memory_id)
 
     if response:
@@ -583,7 +740,7 @@ def fuse_read(
 @click.pass_context
 def list_memory(ctx: click.Context) -> None:
     """Lists all memories, supported by the current device."""
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         print("Internal Flash:")
         int_flash = mboot._get_internal_flash()  # pylint: disable=protected-access
         for flash in int_flash:
@@ -611,7 +768,7 @@ def load_image(ctx: click.Context, boot_file: click.File) -> None:
     FILE  - boot file to load
     """
     data = boot_file.read()  # type: ignore
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         with progress_bar(
             suppress=ctx.obj["suppress_progress_bar"], label="Loading image"
         ) as progress_callback:
@@ -682,7 +839,7 @@ def get_property(
     Note: Not all the properties are available for all devices.
     """
     property_tag_enum = parse_property_tag(property_tag, family)
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.get_property(property_tag_enum, index=index)
         property_text = (
             str(parse_property_value(property_tag_enum.tag, response, None, family))
@@ -729,7 +886,7 @@ def set_property(
     Note: Not all properties can be set on all devices.
     """
     property_tag_int = parse_property_tag(property_tag, family)
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.set_property(prop_tag=property_tag_int, value=value)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -747,6 +904,13 @@ def set_property(
     default=False,
     help="Fast mode for USB-HID data transfer, not reliable !!!",
 )
+@click.option(
+    "-w",
+    "--pipeline-window",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Count of read commands queued in the device in USB-HID reliable mode (default: 1)",
+)
 @click.pass_context
 def read_memory(
     ctx: click.Context,
@@ -756,6 +920,7 @@ def read_memory(
     memory_id: int,
     use_hexdump: bool,
     fast_mode: bool,
+    pipeline_window: int,
 ) -> None:
     """Reads the memory and writes it to the file or stdout.
 
@@ -769,26 +934,38 @@ def read_memory(
                  to print to stdout.
     MEMORY_ID   - id of memory to read from (default: 0)
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    to_file = out_file and out_file.name != "<stdout>"
+    response: Optional[bytes] = None
+    with get_mcuboot(ctx) as mboot:
         with progress_bar(
             suppress=ctx.obj["suppress_progress_bar"], label="Reading memory"
         ) as progress_callback:
-            response = mboot.read_memory(
-                address, byte_count, memory_id, progress_callback, fast_mode
-            )
+            if to_file:
+                # stream the data straight into the file to keep memory footprint flat
+                read_count = mboot.read_memory_into(
+                    address,
+                    out_file,  # type: ignore
+                    byte_count,
+                    memory_id,
+                    progress_callback,
+                    fast_mode,
+                    pipeline_window,
+                )
+            else:
+                response = mboot.read_memory(
+                    address, byte_count, memory_id, progress_callback, fast_mode, pipeline_window
+                )
+                read_count = len(response) if response else 0
 
-    if response:
-        if out_file and out_file.name != "<stdout>":
-            out_file.write(response)  # type: ignore
-        else:
-            click.echo(format_raw_data(response, use_hexdump=use_hexdump))
+    if not to_file and response:
+        click.echo(format_raw_data(response, use_hexdump=use_hexdump))
 
     display_output(
-        [len(response) if response else 0],
+        [read_count or 0],
         mboot.status_code,
         ctx.obj["use_json"],
         ctx.obj["silent"],
-        f"Read {len(response) if response else 0} of {byte_count} bytes.",
+        f"Read {read_count or 0} of {byte_count} bytes.",
     )
 
 
@@ -817,7 +994,7 @@ def receive_sb_file(ctx: click.Context, sb_file: click.File, check_errors: bool)
     \b
     FILE    - SB file to send to the target
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         with progress_bar(
             suppress=ctx.obj["suppress_progress_bar"], label="Sending SB file"
         ) as progress_callback:
@@ -835,7 +1012,7 @@ def reliable_update(ctx: click.Context, address: int) -> None:
     \b
     ADDRESS     - starting address
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.reliable_update(address)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -847,21 +1024,43 @@ def reset(ctx: click.Context) -> None:
 
     A response packet is sent before resetting the device.
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.reset(reopen=False)
     display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
 
 @main.command(no_args_is_help=True)
+@click.option(
+    "--diff",
+    is_flag=True,
+    default=False,
+    help="Differential mode, read the flash back and erase and write only the changed sectors.",
+)
+@click.option(
+    "-w",
+    "--pipeline-window",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Count of read commands queued in the device during the differential compare (default: 1)",
+)
 @click.argument("address", type=INT(), required=True)
 @click.argument("data_source", metavar="FILE[,BYTE_COUNT] | {{HEX-DATA}}", type=str, required=True)
 @click.argument("memory_id", type=INT(), required=False, default="0")
 @click.pass_context
-def write_memory(ctx: click.Context, address: int, data_source: str, memory_id: int) -> None:
+def write_memory(
+    ctx: click.Context,
+    diff: bool,
+    pipeline_window: int,
+    address: int,
+    data_source: str,
+    memory_id: int,
+) -> None:
     """Writes memory from a file or a hex-data.
 
     Writes memory specified by <MEMORY_ID> at <ADDRESS> from <FILE> or <HEX-DATA>
     Writes a provided buffer to a specified <BYTE_COUNT> in memory.
+    In differential mode (--diff) the target memory must be a flash, the changed
+    sectors are erased before writing.
 
     \b
     ADDRESS     - starting address
@@ -878,16 +1077,32 @@ def write_memory(ctx: click.Context, address: int, data_source: str, memory_id:
         with open(file_path, "rb") as f:
             data = f.read(size)
 
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
+        extra_output = None
         with progress_bar(
             suppress=ctx.obj["suppress_progress_bar"], label="Writing memory"
         ) as progress_callback:
-            response = mboot.write_memory(address, data, memory_id, progress_callback)
+            if diff:
+                report = write_memory_differential(
+                    mboot,
+                    address,
+                    data,
+                    memory_id,
+                    progress_callback=progress_callback,
+                    pipeline_window=pipeline_window,
+                )
+                response = report.success
+                status_code = report.status_code
+                extra_output = str(report)
+            else:
+                response = mboot.write_memory(address, data, memory_id, progress_callback)
+                status_code = mboot.status_code
         display_output(
             [len(data)] if response else None,
-            mboot.status_code,
+            status_code,
             ctx.obj["use_json"],
             ctx.obj["silent"],
+            extra_output,
         )
 
 
@@ -918,7 +1133,7 @@ def generate_key_blob(
                         3 or CMK: CMK from SNVS,
                    For devices without SNVS, this option will be ignored.
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         data = dek_file.read()  # type: ignore
         key_sel_int = (
             int(key_sel) if key_sel.isnumeric() else GenerateKeyBlobSelect.get_tag(key_sel)
@@ -945,7 +1160,7 @@ def key_provisioning(ctx: click.Context) -> None:  # pylint: disable=unused-argu
 @click.pass_context
 def enroll(ctx: click.Context) -> None:
     """Enrolls key provisioning feature. No argument for this operation."""
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.kp_enroll()
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -960,7 +1175,7 @@ def program_aeskey(ctx: click.Context, file: click.File) -> None:
     FILE    - file, which contains an aes key
     """
     data = file.read()  # type: ignore
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.write_memory(address=0x0, data=data, mem_id=0x200)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -1022,7 +1237,7 @@ def set_user_key(ctx: click.Context, key_type: str, file_and_size: str, key_size
 
     key_data = load_hex_string(file_path, expected_size=key_size // 8)
 
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.kp_set_user_key(key_type=key_type_int, key_data=key_data)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -1054,7 +1269,7 @@ def set_key(ctx: click.Context, key_type: str, key_size: int) -> None:
     Note: Names are case insensitive
     """
     key_type_int = parse_key_prov_key_type(key_type)
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.kp_set_intrinsic_key(key_type_int, key_size)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -1068,7 +1283,7 @@ def write_key_nonvolatile(ctx: click.Context, memory_id: int) -> None:
     \b
     memoryID  - ID of the non-volatile memory, default: 0
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.kp_write_nonvolatile(memory_id)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -1082,7 +1297,7 @@ def read_key_nonvolatile(ctx: click.Context, memory_id: int) -> None:
     \b
     memoryID  - ID of the non-volatile memory, default: 0
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.kp_read_nonvolatile(memory_id)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -1107,7 +1322,7 @@ def write_key_store(ctx: click.Context, file_and_size: str) -> None:
     with open(file_path, "rb") as key_file:
         key_data = key_file.read(size)
 
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.kp_write_key_store(key_data)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -1123,7 +1338,7 @@ def read_key_store(ctx: click.Context, key_store_file: click.File) -> None:
     \b
     FILE  - Binary file to save the key store.
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.kp_read_key_store()
         if response:
             key_store_file.write(response)  # type: ignore
@@ -1172,7 +1387,7 @@ def hsm_store_key(
     KEY_BLOB_OUTPUT_SIZE  - The output buffer size in byte
     """
     key_type_int = parse_trust_prov_key_type(key_type)
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.tp_hsm_store_key(
             key_type_int,
             key_property,
@@ -1228,7 +1443,7 @@ def hsm_gen_key(
     ECDSA_PUK_OUTPUT_SIZE - Output buffer size in bytes
     """
     key_type_int = parse_trust_prov_oem_key_type(key_type)
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.tp_hsm_gen_key(
             key_type_int,
             reserved,
@@ -1303,7 +1518,7 @@ def hsm_enc_blk(
     BLOCK_DATA_SIZE                  - The byte count of the SB3 data block
     """
     kek_id_int = parse_trust_prov_key_type(kek_id)
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.tp_hsm_enc_blk(
             mfg_cust_mk_sk_0_blob_input_addr,
             mfg_cust_mk_sk_0_blob_input_size,
@@ -1346,7 +1561,7 @@ def hsm_enc_sign(
     SIGNATURE_OUTPUT_ADDR - The output buffer address where ROM writes the signature to
     SIGNATURE_OUTPUT_SIZE - The output buffer size in byte
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.tp_hsm_enc_sign(
             key_blob_input_addr,
             key_blob_input_size,
@@ -1411,7 +1626,7 @@ def oem_gen_master_share(
                                        the OEM Customer Certificate Public Key to
     OEM_CUST_CERT_PUK_OUTPUT_SIZE    - The output buffer size in byte
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.tp_oem_gen_master_share(
             oem_share_input_addr,
             oem_share_input_size,
@@ -1459,7 +1674,7 @@ def oem_set_master_share(
     oem_enc_master_share_input_size: int,
 ) -> None:
     """Takes the entropy seed and the Encrypted OEM Master Share."""
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.tp_oem_set_master_share(
             oem_share_input_addr,
             oem_share_input_size,
@@ -1491,7 +1706,7 @@ def oem_get_cust_cert_dice_puk(
                                          Certificate Public Key for DICE to
     OEM_CUST_CERT_DICE_PUK_OUTPUT_SIZE - The output buffer size in byte
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         response = mboot.tp_oem_get_cust_cert_dice_puk(
             oem_rkth_input_addr,
             oem_rkth_input_size,
@@ -1528,7 +1743,7 @@ def wpc_get_id(
     WPC_ID_BLOB_ADDR - Buffer address
     WPC_ID_BLOB_SIZE - Buffer size
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.wpc_get_id(
             wpc_id_blob_addr,
             wpc_id_blob_size,
@@ -1553,7 +1768,7 @@ def nxp_get_id(
     ID_BLOB_ADDR            - address of ID blob defined by Round-trip trust provisioning specification.
     ID_BLOB_SIZE            - length of buffer in bytes
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.nxp_get_id(
             id_blob_addr,
             id_blob_size,
@@ -1586,7 +1801,7 @@ def wpc_insert_cert(
     EC_ID_OFFSET    - offset to 72-bit ECID
     WPC_PUK_OFFSET  - WPC PUK offset from beginning of inserted certificate
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.wpc_insert_cert(
             wpc_cert_addr,
             wpc_cert_len,
@@ -1617,7 +1832,7 @@ def wpc_sign_csr(
     SIGNATURE_ADDR - address where to store signature
     SIGNATURE_LEN  - expected length of signature
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.wpc_sign_csr(
             csr_tbs_addr,
             csr_tbs_len,
@@ -1648,7 +1863,7 @@ def dsc_hsm_create_session(
     OEM_SHARE_OUTPUT_ADDR   - A 128-bit encrypted token.
     OEM_SHARE_OUTPUT_SIZE   - size in bytes
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.dsc_hsm_create_session(
             oem_seed_input_addr,
             oem_seed_input_size,
@@ -1685,7 +1900,7 @@ def dsc_hsm_enc_blk(
     BLOCK_DATA_ADDR       - Address of data block
     BLOCK_DATA_SIZE       - Size of data block
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.dsc_hsm_enc_blk(
             sbx_header_input_addr,
             sbx_header_input_size,
@@ -1719,7 +1934,7 @@ def dsc_hsm_enc_sign(
     SIGNATURE_OUTPUT_ADDR - Addres to output signature data
     SIGNATURE_OUTPUT_SIZE - Size of the output signature data in bytes
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.dsc_hsm_enc_sign(
             block_data_input_addr,
             block_data_input_size,
@@ -1738,7 +1953,7 @@ def update_life_cycle(ctx: click.Context, life_cycle: int) -> None:
     \b
     LIFE CYCLE    - Device life cycle to be device move to.
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.update_life_cycle(life_cycle)
         display_output([], mboot.status_code, ctx.obj["use_json"], ctx.obj["silent"])
 
@@ -1768,7 +1983,7 @@ def ele_message(
     RESPONSE MESSAGE ADDRESS    - Address in target memory space where the ELE store response.
     RESPONSE MESSAGE COUNT      - Maximal count of words reserved for response.
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.ele_message(
             cmdMsgAddr=cmd_msg_addr,
             cmdMsgCnt=cmd_msg_cnt,
@@ -1789,7 +2004,7 @@ def prove_genuinity(ctx: click.Context, address: int, buffer_size: int) -> None:
     ADDRESS     - Address where is the prove_genuinity request stored
     BUFFER_SIZE - Maximal size of the generated prove_genuinity response
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         tp_response_length = mboot.tp_prove_genuinity(address=address, buffer_size=buffer_size)
         display_output(
             [tp_response_length],
@@ -1814,7 +2029,7 @@ def set_wrap_data(ctx: click.Context, address: int, control: int, stage: int) ->
     CONTROL - Controls location of the Wrapped data package (1 - by address /default/, 2 - in firmware)
     STAGE   - Stage of the OEM TrustProvisioning process
     """
-    with McuBoot(ctx.obj["interface"]) as mboot:
+    with get_mcuboot(ctx) as mboot:
         mboot.tp_set_wrapped_data(address=address, control=control, stage=stage)
         display_output(None, mboot.status_code, use_json=ctx.obj["use_json"])
 
@@ -541,17 +541,24 @@ def sb31_group() -> None:
 @sb31_group.command(name="export", no_args_is_help=True)
 @spsdk_config_option(required=True)
 @spsdk_plugin_option
-def sb31_export_command(config: str, plugin: str) -> None:
+@click.option(
+    "-s",
+    "--stream",
+    is_flag=True,
+    default=False,
+    help="Write the SB3.1 file block by block, the memory usage stays bounded for large files.",
+)
+def sb31_export_command(config: str, plugin: str, stream: bool) -> None:
     """Generate Secure Binary v3.1 Image from YAML/JSON configuration.
 
     SB3KDK is printed out in verbose mode.
 
     The configuration template files could be generated by subcommand 'get-template'.
     """
-    sb31_export(config, plugin)
+    sb31_export(config, plugin, stream)
 
 
-def sb31_export(config: str, plugin: Optional[str] = None) -> None:
+def sb31_export(config: str, plugin: Optional[str] = None, stream: bool = False) -> None:
     """Generate Secure Binary v3.1 Image from YAML/JSON configuration."""
     if plugin:
         load_plugin_from_source(plugin)
@@ -562,9 +569,13 @@ def sb31_export(config: str, plugin: Optional[str] = None) -> None:
     check_config(config_data, schemas, search_paths=[config_dir])
     sb3 = SecureBinary31.load_from_config(config_data, search_paths=[config_dir, "."])
 
-    sb3_data = sb3.export()
     sb3_output_file_path = get_abs_path(config_data["containerOutputFile"], config_dir)
-    write_file(sb3_data, sb3_output_file_path, mode="wb")
+    if stream:
+        os.makedirs(os.path.dirname(sb3_output_file_path), exist_ok=True)
+        with open(sb3_output_file_path, "w+b") as f:
+            sb3.export_to_stream(f)
+    else:
+        write_file(sb3.export(), sb3_output_file_path, mode="wb")
 
     click.echo(f"RKTH: {sb3.cert_block.rkth.hex()}")
     click.echo(f"Success. (Secure binary 3.1: {sb3_output_file_path} created.)")
@@ -762,10 +773,11 @@ def ahab_export(config: str, plugin: Optional[str] = None) -> None:
     schemas = AHABImage.get_validation_schemas()
     check_config(config_data, schemas, search_paths=[config_dir])
     ahab = AHABImage.load_from_config(config_data, search_paths=[config_dir])
-    ahab_data = ahab.export()
 
     ahab_output_file_path = get_abs_path(config_data["output"], config_dir)
-    write_file(ahab_data, ahab_output_file_path, mode="wb")
+    os.makedirs(os.path.dirname(ahab_output_file_path), exist_ok=True)
+    with open(ahab_output_file_path, "wb") as f:
+        ahab.export_to_stream(f)
 
     logger.info(f"Created AHAB Image:\n{str(ahab.image_info())}")
     logger.info(f"Created AHAB Image memory map:\n{ahab.image_info().draw()}")
@@ -35,6 +35,7 @@ from .pfr import main as pfr_main
 from .sdphost import main as sdphost_main
 from .sdpshost import main as sdpshost_main
 from .shadowregs import main as shadowregs_main
+from .spsdk_cache import main as spsdk_cache_main
 
 try:
     TP = True
@@ -67,6 +68,7 @@ main.add_command(sdphost_main, name="sdphost")
 main.add_command(sdpshost_main, name="sdpshost")
 main.add_command(shadowregs_main, name="shadowregs")
 main.add_command(dk6prog_main, name="dk6prog")
+main.add_command(spsdk_cache_main, name="spsdk-cache")
 
 if TP:
     main.add_command(tpconfig_main, name="tpconfig")
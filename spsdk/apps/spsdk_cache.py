@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Management of SPSDK caches."""
+
+import logging
+import os
+import sys
+import time
+from typing import Any, Callable, List, Tuple
+
+import click
+
+from spsdk import SPSDK_CACHE_DISABLED, SPSDK_DATA_FOLDER_SCHEMAS
+from spsdk.apps.utils import spsdk_logger
+from spsdk.apps.utils.common_cli_options import CommandsTreeGroup, spsdk_apps_common_options
+from spsdk.apps.utils.utils import SPSDKAppError, catch_spsdk_error
+from spsdk.exceptions import SPSDKError
+from spsdk.utils.database import DatabaseManager
+from spsdk.utils.registers import registers_cache
+from spsdk.utils.schema_validator import validator_cache, warm_validator
+
+logger = logging.getLogger(__name__)
+
+
+def warm_database() -> int:
+    """Load all devices and validation schemas into the database cache.
+
+    :return: Number of cached items.
+    """
+    db = DatabaseManager().db
+    count = len(db.devices)
+    for file_name in sorted(os.listdir(SPSDK_DATA_FOLDER_SCHEMAS)):
+        if os.path.splitext(file_name)[1] in [".json", ".yaml"]:
+            db.load_db_cfg_file(os.path.join(SPSDK_DATA_FOLDER_SCHEMAS, file_name))
+            count += 1
+    return count
+
+
+def warm_validators() -> int:
+    """Compile validators of the family dependent configurations.
+
+    :return: Number of compiled validators.
+    """
+    # pylint: disable=import-outside-toplevel  # the modules are needed just here
+    from spsdk.image.trustzone import TrustZone
+    from spsdk.pfr.pfr import CFPA, CMPA
+    from spsdk.sbfile.sb31.images import SecureBinary31
+    from spsdk.shadowregs.shadowregs import ShadowRegisters
+    from spsdk.utils.crypto.iee import IeeNxp
+    from spsdk.utils.crypto.otfad import OtfadNxp
+
+    classes: List[Any] = [SecureBinary31, OtfadNxp, IeeNxp, TrustZone, CMPA, CFPA, ShadowRegisters]
+    count = 0
+    for cls in classes:
+        warm_validator(cls.get_validation_schemas_family())
+        count += 1
+        for family in cls.get_supported_families():
+            try:
+                warm_validator(cls.get_validation_schemas(family))
+                count += 1
+            except SPSDKError as exc:
+                logger.debug(f"Cannot compile {cls.__name__} validator for {family}: {exc}")
+    return count
+
+
+def warm_registers() -> int:
+    """Load registers of the protected flash regions into the registers cache.
+
+    :return: Number of loaded register sets.
+    """
+    # pylint: disable=import-outside-toplevel  # the modules are needed just here
+    from spsdk.pfr.pfr import CFPA, CMPA
+
+    count = 0
+    for cls in [CMPA, CFPA]:
+        for family in cls.get_supported_families():
+            try:
+                cls(family)
+                count += 1
+            except SPSDKError as exc:
+                logger.debug(f"Cannot load {cls.__name__} registers for {family}: {exc}")
+    return count
+
+
+CACHE_WARMERS: List[Tuple[str, Callable[[], int]]] = [
+    ("Database", warm_database),
+    ("Validators", warm_validators),
+    ("Registers", warm_registers),
+]
+
+
+@click.group(name="spsdk-cache", no_args_is_help=True, cls=CommandsTreeGroup)
+@spsdk_apps_common_options
+def main(log_level: int) -> None:
+    """Utility managing SPSDK caches."""
+    spsdk_logger.install(level=log_level or logging.WARNING)
+
+
+@main.command(name="warm", no_args_is_help=False)
+def warm() -> None:
+    """Build all SPSDK caches in advance.
+
+    The database, compiled validators and other caches are created, so the next runs of
+    SPSDK applications (e.g. in CI containers) start with hot caches.
+    """
+    if SPSDK_CACHE_DISABLED:
+        raise SPSDKAppError("SPSDK cache is disabled, nothing to warm up.")
+    for name, warmer in CACHE_WARMERS:
+        start = time.perf_counter()
+        count = warmer()
+        click.echo(f"{name}: {count} items cached in {time.perf_counter() - start:.2f}s")
+    logger.info(str(validator_cache))
+    logger.info(str(registers_cache))
+
+
+@main.command(name="clear", no_args_is_help=False)
+def clear() -> None:
+    """Clear all SPSDK caches."""
+    if os.path.exists(DatabaseManager.get_cache_filename()[0]):
+        DatabaseManager.clear_cache()
+    click.echo("SPSDK cache has been cleared.")
+
+
+@catch_spsdk_error
+def safe_main() -> None:
+    """Call the main function."""
+    sys.exit(main())  # pylint: disable=no-value-for-parameter
+
+
+if __name__ == "__main__":
+    safe_main()
@@ -15,6 +15,32 @@ from cryptography.hazmat.primitives import hmac as hmac_cls
 from spsdk.crypto.hash import EnumHashAlgorithm, get_hash_algorithm
 
 
+class Hmac:
+    """SPSDK HMAC Class, the data are authenticated by parts."""
+
+    def __init__(self, key: bytes, algorithm: EnumHashAlgorithm = EnumHashAlgorithm.SHA256) -> None:
+        """Initialize HMAC object.
+
+        :param key: The key in bytes format
+        :param algorithm: Algorithm type for HASH function, defaults to EnumHashAlgorithm.SHA256
+        """
+        self.hmac_obj = hmac_cls.HMAC(key, get_hash_algorithm(algorithm))
+
+    def update(self, data: bytes) -> None:
+        """Update the HMAC by new data.
+
+        :param data: Data to be authenticated
+        """
+        self.hmac_obj.update(data)
+
+    def finalize(self) -> bytes:
+        """Finalize the HMAC and return its value.
+
+        :return: HMAC bytes
+        """
+        return self.hmac_obj.finalize()
+
+
 def hmac(key: bytes, data: bytes, algorithm: EnumHashAlgorithm = EnumHashAlgorithm.SHA256) -> bytes:
     """Return a HMAC from data with specified key and algorithm.
 
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+"""Process-wide cache of keys loaded from files."""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from spsdk import SPSDK_KEY_CACHE_DISABLED
+from spsdk.utils.misc import load_binary
+
+from .hash import EnumHashAlgorithm, get_hash
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+KeyCacheKey = Tuple[str, bytes, bytes]
+
+
+class KeyCache:
+    """LRU cache of parsed keys shared by the whole process.
+
+    Entries are keyed by the kind of the parsed object, digest of the key file content and
+    digest of the password. The key files are small, so they are read and hashed on each use,
+    but the expensive parsing (e.g. RSA key checks, key derivation of encrypted keys) runs just
+    once. A rewritten file is parsed again even if its time stamp and size didn't change.
+    Keys are kept in memory only, nothing is stored on disk.
+    """
+
+    def __init__(self, max_size: int = 64, enabled: bool = not SPSDK_KEY_CACHE_DISABLED) -> None:
+        """Initialize the cache.
+
+        :param max_size: Maximal number of cached objects, the least recently used are evicted
+        :param enabled: Enable the cache, disabled cache parses the keys each time
+        """
+        self.max_size = max_size
+        self.enabled = enabled
+        self._entries: "OrderedDict[KeyCacheKey, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __str__(self) -> str:
+        return (
+            f"Key cache: {len(self)} keys, {self.hits} hits, {self.misses} misses, "
+            f"{self.evictions} evictions"
+        )
+
+    def load(
+        self,
+        kind: str,
+        file_path: str,
+        parser: Callable[[bytes], T],
+        password: Optional[str] = None,
+        search_paths: Optional[List[str]] = None,
+    ) -> T:
+        """Load object from the key file, parse it only if it's not in the cache.
+
+        :param kind: Kind of the parsed object (e.g. class name), each kind is cached separately
+        :param file_path: Path to the key file
+        :param parser: Function parsing the file content
+        :param password: Password used by the parser
+        :param search_paths: List of paths where to search for the file, defaults to None
+        :return: Parsed object
+        """
+        data = load_binary(file_path, search_paths=search_paths)
+        if not self.enabled or self.max_size <= 0:
+            return parser(data)
+        key = (
+            kind,
+            get_hash(data, EnumHashAlgorithm.SHA256),
+            get_hash(password.encode("utf-8"), EnumHashAlgorithm.SHA256) if password else b"",
+        )
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        value = parser(data)
+        self._entries[key] = value
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        logger.debug(f"Key file {file_path} parsed into cache as {kind}")
+        return value
+
+    def clear(self) -> None:
+        """Drop all cached keys."""
+        self._entries.clear()
+
+
+key_cache = KeyCache()
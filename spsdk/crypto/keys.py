@@ -36,9 +36,10 @@ from typing_extensions import Self
 
 from spsdk.exceptions import SPSDKError, SPSDKNotImplementedError, SPSDKValueError
 from spsdk.utils.abstract import BaseClass
-from spsdk.utils.misc import Endianness, load_binary, write_file
+from spsdk.utils.misc import Endianness, write_file
 
 from .hash import EnumHashAlgorithm, get_hash, get_hash_algorithm
+from .key_cache import key_cache
 from .oscca import IS_OSCCA_SUPPORTED
 from .rng import rand_below, random_hex
 from .types import SPSDKEncoding
@@ -246,11 +247,17 @@ class PrivateKey(BaseClass, abc.ABC):
     def load(cls, file_path: str, password: Optional[str] = None) -> Self:
         """Load the Private key from the given file.
 
+        The parsed key is cached, see `spsdk.crypto.key_cache`.
+
         :param file_path: path to the file, where the key is stored
         :param password: password to private key; None to load without password
         """
-        data = load_binary(file_path)
-        return cls.parse(data=data, password=password)
+        return key_cache.load(
+            kind=cls.__qualname__,
+            file_path=file_path,
+            parser=lambda data: cls.parse(data=data, password=password),
+            password=password,
+        )
 
     @abc.abstractmethod
     def sign(self, data: bytes) -> bytes:
@@ -345,10 +352,13 @@ class PublicKey(BaseClass, abc.ABC):
     def load(cls, file_path: str) -> Self:
         """Load the Public key from the given file.
 
+        The parsed key is cached, see `spsdk.crypto.key_cache`.
+
         :param file_path: path to the file, where the key is stored
         """
-        data = load_binary(file_path)
-        return cls.parse(data=data)
+        return key_cache.load(
+            kind=cls.__qualname__, file_path=file_path, parser=lambda data: cls.parse(data=data)
+        )
 
     @abc.abstractmethod
     def verify_signature(
@@ -11,6 +11,9 @@ Each concrete signature provider needs to implement:
 - sign(data: bytes) -> bytes
 - signature_length -> int
 - into() -> str
+
+Signature providers able to sign several data at once (e.g. remote ones) may also implement:
+- sign_batch(data: List[bytes]) -> List[bytes]
 """
 
 import abc
@@ -64,6 +67,17 @@ class SignatureProvider(abc.ABC):
         """Verify if given public key matches private key."""
         raise SPSDKUnsupportedOperation("Verify method is not supported.")
 
+    def sign_batch(self, data: List[bytes]) -> List[bytes]:
+        """Return signatures for list of data.
+
+        The default implementation signs the data one by one, signature providers with expensive
+        round trips override it to sign all the data at once.
+
+        :param data: List of data to be signed
+        :return: List of signatures in the same order as data
+        """
+        return [self.sign(item) for item in data]
+
     def get_signature(self, data: bytes) -> bytes:
         """Get signature. In case of ECC signature, the NXP format(r+s) is used.
 
@@ -71,7 +85,30 @@ class SignatureProvider(abc.ABC):
         :return: Signature of the data
 
         """
-        signature = self.sign(data)
+        return self._format_signature(self.sign(data))
+
+    def get_signatures(self, data: List[bytes]) -> List[bytes]:
+        """Get signatures of several data at once. ECC signatures use the NXP format(r+s).
+
+        :param data: List of data to be signed.
+        :return: List of signatures in the same order as data
+        :raises SPSDKError: Number of signatures doesn't match number of data
+        """
+        if not data:
+            return []
+        signatures = self.sign_batch(data)
+        if len(signatures) != len(data):
+            raise SPSDKError(
+                f"Signature provider returned {len(signatures)} signatures for {len(data)} data"
+            )
+        return [self._format_signature(signature) for signature in signatures]
+
+    def _format_signature(self, signature: bytes) -> bytes:
+        """Convert ECC signature into NXP format(r+s) and check the signature length.
+
+        :param signature: Signature returned by the signature provider
+        :return: Signature in NXP format
+        """
         try:
             ecdsa_sig = ECDSASignature.parse(signature)
             signature = ecdsa_sig.export(SPSDKEncoding.NXP)
@@ -280,7 +317,18 @@ class InteractivePlainFileSP(PlainFileSP):
 
 
 class HttpProxySP(SignatureProvider):
-    """Signature Provider implementation that delegates all operations to a proxy server."""
+    """Signature Provider implementation that delegates all operations to a proxy server.
+
+    The server provides following REST API endpoints, all requests are GET with JSON payload
+    containing the 'data' member (if any) and all extra parameters of the signature provider.
+    The binary data are hex-encoded, the response is a JSON object with 'data' member:
+
+    - sign: {"data": hex} -> {"data": hex signature}
+    - sign_batch: {"data": [hex, ...]} -> {"data": [hex signature, ...]}, one signature per
+      item in the same order, optional; when it responds with 404, data are signed one by one
+    - signature_length: {} -> {"data": int}
+    - verify_public_key: {"data": hex public key} -> {"data": bool}
+    """
 
     sp_type = "proxy"
     reserved_keys = ["type", "search_paths", "data"]
@@ -294,6 +342,8 @@ class HttpProxySP(SignatureProvider):
     ) -> None:
         """Initialize Http Proxy Signature Provider.
 
+        The connection to the proxy server is kept alive and reused by all requests.
+
         :param host: Hostname (IP address) of the proxy server, defaults to "localhost"
         :param port: Port of the proxy server, defaults to "8000"
         :param url_prefix: REST API prefix, defaults to "api"
@@ -301,12 +351,28 @@ class HttpProxySP(SignatureProvider):
         self.base_url = f"http://{host}:{port}/"
         self.base_url += f"{url_prefix}/" if url_prefix else ""
         self.kwargs = kwargs
+        self.session = requests.Session()
+        self._signature_length: Optional[int] = None
+        self._batch_supported = True
+
+    def __eq__(self, obj: Any) -> bool:
+        """Check object equality, instances using the same proxy and key are equal."""
+        return (
+            isinstance(obj, HttpProxySP)
+            and self.base_url == obj.base_url
+            and self.kwargs == obj.kwargs
+        )
+
+    def __hash__(self) -> int:
+        """Object hash consistent with equality."""
+        return hash((self.base_url, tuple(sorted(self.kwargs.items()))))
 
     def _handle_request(self, url: str, data: Optional[Dict] = None) -> Dict:
         """Handle REST API request.
 
         :param url: REST API endpoint URL
         :param data: JSON payload data, defaults to None
+        :raises SPSDKUnsupportedOperation: REST API endpoint is not provided by the server
         :raises SPSDKError: HTTP Error during API request
         :raises SPSDKError: Invalid response data (not a valid dictionary)
         :return: REST API data response as dictionary
@@ -315,8 +381,10 @@ class HttpProxySP(SignatureProvider):
         json_payload.update(self.kwargs)
         full_url = self.base_url + url
         logger.info(f"Requesting: {full_url}")
-        response = requests.get(url=full_url, json=json_payload, timeout=60)
+        response = self.session.get(url=full_url, json=json_payload, timeout=60)
         logger.info(f"Response: {response}")
+        if response.status_code == 404:
+            raise SPSDKUnsupportedOperation(f"Endpoint {full_url} is not supported by the server")
         if not response.ok:
             try:
                 extra_message = response.json()
@@ -353,12 +421,44 @@ class HttpProxySP(SignatureProvider):
         self._check_response(response=response, names_types=[("data", str)])
         return bytes.fromhex(response["data"])
 
+    def sign_batch(self, data: List[bytes]) -> List[bytes]:
+        """Return signatures for list of data using a single request.
+
+        Servers without the 'sign_batch' endpoint are asked for the signatures one by one.
+
+        :param data: List of data to be signed
+        :raises SPSDKError: Number of signatures in response doesn't match the data
+        :return: List of signatures in the same order as data
+        """
+        if self._batch_supported and len(data) > 1:
+            try:
+                response = self._handle_request(
+                    "sign_batch", {"data": [item.hex() for item in data]}
+                )
+            except SPSDKUnsupportedOperation:
+                logger.debug("Proxy server doesn't support batch signing, signing one by one")
+                self._batch_supported = False
+            else:
+                self._check_response(response=response, names_types=[("data", list)])
+                if len(response["data"]) != len(data):
+                    raise SPSDKError(
+                        f"Response contains {len(response['data'])} signatures "
+                        f"instead of {len(data)}"
+                    )
+                return [bytes.fromhex(signature) for signature in response["data"]]
+        return super().sign_batch(data)
+
     @property
     def signature_length(self) -> int:
-        """Return length of the signature."""
-        response = self._handle_request("signature_length")
-        self._check_response(response=response, names_types=[("data", int)])
-        return int(response["data"])
+        """Return length of the signature.
+
+        The length is requested from the server just once.
+        """
+        if self._signature_length is None:
+            response = self._handle_request("signature_length")
+            self._check_response(response=response, names_types=[("data", int)])
+            self._signature_length = int(response["data"])
+        return self._signature_length
 
     def verify_public_key(self, public_key: bytes) -> bool:
         """Verify if given public key matches private key."""
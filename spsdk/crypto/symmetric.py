@@ -9,6 +9,8 @@
 
 
 # Used security modules
+import sys
+from array import array
 from typing import Optional
 
 from cryptography.hazmat.primitives import keywrap
@@ -53,6 +55,73 @@ class Counter:
         """
         self._ctr += value
 
+    def values(self, count: int, increment: int = 1) -> bytes:
+        """Get initial vectors of following blocks and increment the counter behind them.
+
+        :param count: Number of blocks
+        :param increment: Increment of counter between blocks
+        :return: Concatenated initial vectors
+        """
+        counters = array("I", range(self._ctr, self._ctr + count * increment, increment))
+        if self._ctr_byteorder_encoding.value != sys.byteorder:
+            counters.byteswap()
+        result = bytearray((self._nonce + bytes(4)) * count)
+        memoryview(result).cast("I")[3::4] = counters
+        self._ctr += count * increment
+        return bytes(result)
+
+
+class CounterKeystream:
+    """Keystream of AES in CTR mode with customizable counter increment.
+
+    The counter values of all blocks are encrypted by single AES-ECB context. The result is
+    equal to AES-CTR encryption of each block with its own counter value.
+    """
+
+    BLOCK_SIZE = 16
+
+    def __init__(self, key: bytes, counter: Counter, increment: int = 1) -> None:
+        """Constructor.
+
+        :param key: The key for data encryption
+        :param counter: Counter of the first block, it's incremented by generated blocks
+        :param increment: Increment of counter between blocks
+        """
+        self.counter = counter
+        self.increment = increment
+        self._encryptor = Cipher(algorithms.AES(key), modes.ECB()).encryptor()
+
+    def read(self, length: int) -> bytes:
+        """Get keystream of following blocks.
+
+        :param length: Length of the keystream, multiple of AES block size
+        :return: Keystream
+        :raises SPSDKError: Length is not aligned to AES block size
+        """
+        if length % self.BLOCK_SIZE:
+            raise SPSDKError(f"Keystream length must be aligned to {self.BLOCK_SIZE} bytes")
+        values = self.counter.values(length // self.BLOCK_SIZE, self.increment)
+        return self._encryptor.update(values)
+
+    def encrypt(self, data: bytes) -> bytes:
+        """Encrypt (or decrypt) following blocks of data.
+
+        :param data: Data aligned to AES block size
+        :return: Encrypted data
+        """
+        return xor_bytes(data, self.read(len(data)))
+
+
+def xor_bytes(data: bytes, mask: bytes) -> bytes:
+    """Exclusive-OR of two byte sequences of the same length.
+
+    :param data: Input data
+    :param mask: Mask applied to data
+    :return: Result of XOR
+    """
+    result = int.from_bytes(data, "little") ^ int.from_bytes(mask, "little")
+    return result.to_bytes(len(data), "little")
+
 
 def aes_key_wrap(kek: bytes, key_to_wrap: bytes) -> bytes:
     """Wraps a key using a key-encrypting key (KEK).
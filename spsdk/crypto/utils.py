@@ -10,10 +10,10 @@
 from typing import Iterable, List, Optional
 
 from spsdk.crypto.certificate import Certificate
+from spsdk.crypto.key_cache import key_cache
 from spsdk.crypto.keys import PrivateKey, PublicKey
 from spsdk.crypto.signature_provider import SignatureProvider
 from spsdk.exceptions import SPSDKError, SPSDKValueError
-from spsdk.utils.misc import load_binary
 
 
 def get_matching_key_id(public_keys: List[PublicKey], signature_provider: SignatureProvider) -> int:
@@ -67,8 +67,13 @@ def extract_public_key(
     :return: Public key of any type
     """
     try:
-        object_data = load_binary(file_path, search_paths=search_paths)
-        return extract_public_key_from_data(object_data, password)
+        return key_cache.load(
+            kind="extracted_public_key",
+            file_path=file_path,
+            parser=lambda data: extract_public_key_from_data(data, password),
+            password=password,
+            search_paths=search_paths,
+        )
     except SPSDKError as exc:
         raise SPSDKError(f"Unable to load secret file '{file_path}'.") from exc
 
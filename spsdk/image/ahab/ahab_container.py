@@ -15,7 +15,7 @@ import logging
 import math
 import os
 from struct import calcsize, pack, unpack
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
 
 from typing_extensions import Self
 
@@ -251,6 +251,7 @@ class ImageArrayEntry(Container):
             Used only for encrypted images.
         """
         self._image_offset = 0
+        self._hash_cache: Optional[Tuple[bytes, EnumHashAlgorithm, bytes]] = None
         self.parent = parent
         self.flags = flags
         self.already_encrypted_image = already_encrypted_image
@@ -379,13 +380,31 @@ class ImageArrayEntry(Container):
         self.image_size = self._get_valid_size(self.image)
         algorithm = self.get_hash_from_flags(self.flags)
         self.image_hash = extend_block(
-            get_hash(self.image, algorithm=algorithm),
+            self.get_image_hash(algorithm),
             self.HASH_LEN,
             padding=0,
         )
         if not self.image_iv and self.flags_is_encrypted:
             self.image_iv = get_hash(self.plain_image, algorithm=EnumHashAlgorithm.SHA256)
 
+    def get_image_hash(self, algorithm: EnumHashAlgorithm) -> bytes:
+        """Get hash of the image.
+
+        The hash is memoized, it's computed again only if the image object is replaced
+        (e.g. the image gets encrypted) or another algorithm is requested.
+
+        :param algorithm: Hash algorithm
+        :return: Hash of the image
+        """
+        image = self.image
+        if self._hash_cache and self._hash_cache[0] is image and self._hash_cache[1] == algorithm:
+            return self._hash_cache[2]
+        image_hash = get_hash(image, algorithm=algorithm)
+        # Only immutable images could be identified by the object itself
+        if isinstance(image, bytes):
+            self._hash_cache = (image, algorithm, image_hash)
+        return image_hash
+
     @staticmethod
     def create_meta(start_cpu_id: int = 0, mu_cpu_id: int = 0, start_partition_id: int = 0) -> int:
         """Create meta data field.
@@ -635,14 +654,14 @@ class ImageArrayEntry(Container):
                 f" but the loaded image length has only {hex(binary_size)}B size."
             )
         image = data[iae.image_offset - iae_offset : iae.image_offset - iae_offset + image_size]
-        image_hash_cmp = extend_block(
-            get_hash(image, algorithm=ImageArrayEntry.get_hash_from_flags(flags)),
-            ImageArrayEntry.HASH_LEN,
-            padding=0,
-        )
+        algorithm = ImageArrayEntry.get_hash_from_flags(flags)
+        raw_image_hash = get_hash(image, algorithm=algorithm)
+        image_hash_cmp = extend_block(raw_image_hash, ImageArrayEntry.HASH_LEN, padding=0)
         if image_hash != image_hash_cmp:
             raise SPSDKValueError("Parsed Container data image has invalid HASH!")
         iae.image = image
+        if iae.image is image:
+            iae._hash_cache = (image, algorithm, raw_image_hash)
         return iae
 
     @staticmethod
@@ -1387,6 +1406,7 @@ class ContainerSignature(HeaderContainer):
         super().__init__(tag=self.TAG, length=-1, version=self.VERSION)
         self._signature_data = signature_data or b""
         self.signature_provider = signature_provider
+        self._signed_data: Optional[Tuple[SignatureProvider, bytes]] = None
         self.length = len(self)
 
     def __eq__(self, other: object) -> bool:
@@ -1431,6 +1451,7 @@ class ContainerSignature(HeaderContainer):
         :param value: signature data.
         """
         self._signature_data = value
+        self._signed_data = None
         self.length = len(self)
 
     @classmethod
@@ -1449,8 +1470,31 @@ class ContainerSignature(HeaderContainer):
                 "The Signature container doesn't have specified the private key to sign."
             )
 
-        if self.signature_provider:
-            self._signature_data = self.signature_provider.get_signature(data_to_sign)
+        if self.signature_provider and not self.is_signed(data_to_sign):
+            self.store_signature(data_to_sign, self.signature_provider.get_signature(data_to_sign))
+
+    def is_signed(self, data_to_sign: bytes) -> bool:
+        """Check whether the stored signature was made by the signature provider over the data.
+
+        :param data_to_sign: Data to be signed
+        :return: True if the data don't have to be signed again.
+        """
+        return (
+            bool(self._signature_data)
+            and self._signed_data is not None
+            and self._signed_data[0] is self.signature_provider
+            and self._signed_data[1] == data_to_sign
+        )
+
+    def store_signature(self, data_to_sign: bytes, signature_data: bytes) -> None:
+        """Store signature made by the signature provider.
+
+        :param data_to_sign: Signed data
+        :param signature_data: Signature of the data
+        """
+        assert self.signature_provider
+        self._signature_data = signature_data
+        self._signed_data = (self.signature_provider, data_to_sign)
 
     def export(self) -> bytes:
         """Export signature data that is part of Signature Block.
@@ -2684,9 +2728,10 @@ class AHABContainerBase(HeaderContainer):
             + UINT16  # Reserved
         )
 
-    def update_fields(self) -> None:
+    def update_fields(self, sign: bool = True) -> None:
         """Updates all volatile information in whole container structure.
 
+        :param sign: Sign the container header, disable it to sign several containers at once.
         :raises SPSDKError: When inconsistent image array length is detected.
         """
         # Update the signature block to get overall size of it
@@ -2694,7 +2739,7 @@ class AHABContainerBase(HeaderContainer):
         # Update the Container header length
         self.length = self.header_length()
         # # Sign the image header
-        if self.flag_srk_set != "none":
+        if sign and self.flag_srk_set != "none":
             assert self.signature_block.signature
             self.signature_block.signature.sign(self.get_signature_data())
 
@@ -3005,9 +3050,10 @@ class AHABContainer(AHABContainerBase):
             + len(self.signature_block)
         )
 
-    def update_fields(self) -> None:
+    def update_fields(self, sign: bool = True) -> None:
         """Updates all volatile information in whole container structure.
 
+        :param sign: Sign the container header, disable it to sign several containers at once.
         :raises SPSDKError: When inconsistent image array length is detected.
         """
         # 1. Encrypt all images if applicable
@@ -3030,7 +3076,7 @@ class AHABContainer(AHABContainerBase):
         # 4. Update the Container header length
         self.length = self.header_length()
         # 5. Sign the image header
-        if self.flag_srk_set != "none":
+        if sign and self.flag_srk_set != "none":
             assert self.signature_block.signature
             self.signature_block.signature.sign(self.get_signature_data())
 
@@ -3340,10 +3386,12 @@ class AHABImage:
     def update_fields(self, update_offsets: bool = True) -> None:
         """Automatically updates all volatile fields in every AHAB container.
 
+        The containers are signed at the end, just once.
+
         :param update_offsets: Update also offsets for serial_downloader.
         """
         for ahab_container in self.ahab_containers:
-            ahab_container.update_fields()
+            ahab_container.update_fields(sign=False)
 
         if self.target_memory == TARGET_MEMORY_SERIAL_DOWNLOADER and update_offsets:
             # Update the Image offsets to be without gaps
@@ -3356,7 +3404,36 @@ class AHABImage:
                         image.image_offset = offset
                     offset = image.get_valid_offset(offset + image.image_size)
 
-                ahab_container.update_fields()
+                ahab_container.update_fields(sign=False)
+
+        self.sign_containers()
+
+    def sign_containers(self) -> None:
+        """Sign headers of all containers.
+
+        The signatures made by the same signature provider are requested at once,
+        so the remote signature providers need just one round trip. Containers whose signed
+        data didn't change since the last signing keep their signature.
+        """
+        batches: Dict[SignatureProvider, List[Tuple[ContainerSignature, bytes]]] = {}
+        for ahab_container in self.ahab_containers:
+            if ahab_container.flag_srk_set == "none":
+                continue
+            signature = ahab_container.signature_block.signature
+            assert signature
+            data_to_sign = ahab_container.get_signature_data()
+            if signature.signature_provider and not signature.is_signed(data_to_sign):
+                batches.setdefault(signature.signature_provider, []).append(
+                    (signature, data_to_sign)
+                )
+            else:
+                # Keeps the already present signature or raises an error
+                signature.sign(data_to_sign)
+
+        for signature_provider, batch in batches.items():
+            signatures = signature_provider.get_signatures([data for _, data in batch])
+            for (signature, data_to_sign), signature_data in zip(batch, signatures):
+                signature.store_signature(data_to_sign, signature_data)
 
     def __len__(self) -> int:
         """Get maximal size of AHAB Image.
@@ -3404,6 +3481,20 @@ class AHABImage:
         self.validate()
         return self.image_info().export()
 
+    def export_to_stream(self, stream: BinaryIO) -> int:
+        """Export AHAB Image into a stream.
+
+        The image is written region by region, it's never built in memory as a whole.
+
+        :param stream: Writable binary stream, e.g. file opened in "wb" mode
+        :raises SPSDKValueError: mismatch between number of containers and offsets.
+        :raises SPSDKValueError: number of images mismatch.
+        :return: Number of written bytes.
+        """
+        self.update_fields()
+        self.validate()
+        return self.image_info().export_to_stream(stream)
+
     def image_info(self) -> BinaryImage:
         """Get Image info object."""
         ret = BinaryImage(
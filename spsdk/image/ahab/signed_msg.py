@@ -1345,9 +1345,10 @@ class SignedMessage(AHABContainerBase):
             + "32s"  # IV - Initial Vector if encryption is enabled
         )
 
-    def update_fields(self) -> None:
+    def update_fields(self, sign: bool = True) -> None:
         """Updates all volatile information in whole container structure.
 
+        :param sign: Sign the message header.
         :raises SPSDKError: When inconsistent image array length is detected.
         """
         # 0. Update length
@@ -1355,7 +1356,7 @@ class SignedMessage(AHABContainerBase):
         # 1. Update the signature block to get overall size of it
         self.signature_block.update_fields()
         # 2. Sign the image header
-        if self.flag_srk_set != "none":
+        if sign and self.flag_srk_set != "none":
             assert self.signature_block.signature
             self.signature_block.signature.sign(self.get_signature_data())
 
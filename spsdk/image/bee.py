@@ -8,8 +8,9 @@
 
 
 import logging
+from bisect import bisect_right
 from struct import calcsize, pack, unpack_from
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from typing_extensions import Self
 
@@ -28,9 +29,9 @@ from spsdk.utils.misc import (
     Endianness,
     align_block_fill_random,
     extend_block,
+    find_first,
     load_binary,
     load_hex_string,
-    split_data,
     value_to_int,
 )
 from spsdk.utils.schema_validator import CommentedConfig
@@ -384,6 +385,76 @@ class BeeProtectRegionBlock(BeeBaseClass):
                     return aes_ctr_encrypt(key, data, cntr_key.value)
         return data
 
+    def _fac_index(self) -> Tuple[List[int], List[Optional[BeeFacRegion]]]:
+        """Create interval index of FAC regions.
+
+        :return: Sorted boundaries of the FAC regions and the FAC region which owns the interval
+            starting at each boundary (the first FAC region containing it, as in `encrypt_block`)
+        """
+        bounds = sorted(
+            {addr for fac in self.fac_regions for addr in (fac.start_addr, fac.end_addr)}
+        )
+        owners = [
+            find_first(self.fac_regions, lambda fac: fac.start_addr <= addr < fac.end_addr)
+            for addr in bounds
+        ]
+        return bounds, owners
+
+    def encrypt_data(self, key: bytes, start_addr: int, data: bytes) -> bytes:
+        """Encrypt all blocks of the data located in any FAC region.
+
+        The data are processed by blocks of BEE_ENCR_BLOCK_SIZE like in `encrypt_block`, the neighboring
+        blocks in the same FAC region are encrypted together in single AES-CTR pass.
+
+        :param key: user for encryption
+        :param start_addr: start address of the data
+        :param data: binary data to be encrypted
+        :return: data with encrypted blocks, the blocks outside FAC regions are untouched
+        :raises SPSDKError: When encryption mode different from AES/CTR provided
+        :raises SPSDKError: When invalid length of key
+        :raises SPSDKError: When invalid range of region
+        """
+        bounds, owners = self._fac_index()
+        runs: List[Tuple[int, int, BeeFacRegion]] = []
+        for offset in range(0, len(data), BEE_ENCR_BLOCK_SIZE):
+            addr = start_addr + offset
+            if not self.is_inside_region(addr):
+                continue
+            if self.mode != BeeProtectRegionBlockAesMode.CTR:
+                raise SPSDKError("only AES/CTR encryption mode supported now")
+            if len(key) != 16:
+                raise SPSDKError("Invalid length of key")
+            idx = bisect_right(bounds, addr) - 1
+            fac = owners[idx] if idx >= 0 else None
+            if not fac:
+                continue
+            end = min(offset + BEE_ENCR_BLOCK_SIZE, len(data))
+            if start_addr + end > fac.end_addr:
+                raise SPSDKError("Invalid range of region")
+            if runs and runs[-1][2] is fac and runs[-1][1] == offset:
+                runs[-1] = (runs[-1][0], end, fac)
+            else:
+                runs.append((offset, end, fac))
+        if not runs:
+            return data
+
+        result = bytearray(data)
+        view = memoryview(data)
+        for offset, end, fac in runs:
+            addr = start_addr + offset
+            logger.debug(
+                f"Encrypting data, start={hex(addr)},"
+                f"end={hex(start_addr + end)} with {str(self)} using fac {str(fac)}"
+            )
+            cntr_key = Counter(
+                self.counter, ctr_value=addr >> 4, ctr_byteorder_encoding=Endianness.BIG
+            )
+            run_data: Union[bytes, memoryview] = view[offset:end]
+            if len(run_data) % 16:
+                run_data = align_block_fill_random(bytes(run_data), 16)  # align data to 16 bytes
+            result[offset:end] = aes_ctr_encrypt(key, run_data, cntr_key.value)
+        return bytes(result)
+
 
 class BeeKIB(BeeBaseClass):
     """BEE Key block.
@@ -584,6 +655,15 @@ class BeeRegionHeader(BeeBaseClass):
         """
         return self._prdb.encrypt_block(self._sw_key, start_addr, data)
 
+    def encrypt_data(self, start_addr: int, data: bytes) -> bytes:
+        """Encrypt all blocks of the data located in any FAC region.
+
+        :param start_addr: start address of the data
+        :param data: binary data to be encrypted
+        :return: data with encrypted blocks, the blocks outside FAC regions are untouched
+        """
+        return self._prdb.encrypt_data(self._sw_key, start_addr, data)
+
 
 class BeeNxp:
     """BeeNxp class."""
@@ -609,19 +689,12 @@ class BeeNxp:
 
         :return: encrypted image
         """
-        encrypted_data = bytearray()
-        image_data = bytearray(self.input_image)
-        base_address = self.base_address
-
-        for block in split_data(image_data, BEE_ENCR_BLOCK_SIZE):
-            logger.debug(f"Reading {hex(base_address)}, size={hex(len(block))}")
-            for header in self.headers:
-                if header:
-                    block = header.encrypt_block(base_address, block)
-            encrypted_data.extend(block)
-            base_address += len(block)
+        encrypted_data = bytes(self.input_image)
+        for header in self.headers:
+            if header:
+                encrypted_data = header.encrypt_data(self.base_address, encrypted_data)
 
-        return bytes(encrypted_data)
+        return encrypted_data
 
     def export_headers(self) -> List[Optional[bytes]]:
         """Export BEE headers.
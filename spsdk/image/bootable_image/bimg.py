@@ -295,4 +295,4 @@ class BootableImage(BaseClass):
 
         :return: List of supported revisions.
         """
-        return DatabaseManager().db.devices.get(family).revisions.revision_names(True)
+        return DatabaseManager().db.get_device(family).revisions.revision_names(True)
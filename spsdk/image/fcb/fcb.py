@@ -138,7 +138,7 @@ class FCB(SegmentBase):
         try:
             sch_cfg["fcb_family_rev"]["properties"]["family"]["enum"] = FCB.get_supported_families()
             sch_cfg["fcb_family_rev"]["properties"]["family"]["template_value"] = family
-            revisions = DatabaseManager().db.devices.get(family).revisions.revision_names(True)
+            revisions = DatabaseManager().db.get_device(family).revisions.revision_names(True)
             sch_cfg["fcb_family_rev"]["properties"]["revision"]["enum"] = revisions
             sch_cfg["fcb_family_rev"]["properties"]["revision"]["template_value"] = revision
             sch_cfg["fcb_family_rev"]["properties"]["type"][
@@ -650,15 +650,9 @@ class SegBEE(BaseSegment):
         if align(start_addr, BEE_ENCR_BLOCK_SIZE) != start_addr:
             raise SPSDKError("Invalid start address")
         orig_len = len(data)
-        data = align_block(data, BEE_ENCR_BLOCK_SIZE)
-        result = bytes()
-        offset = 0
-        while offset < len(data):
-            blck = data[offset : offset + BEE_ENCR_BLOCK_SIZE]
-            for region in self._regions:
-                blck = region.encrypt_block(start_addr + offset, blck)
-            result += blck
-            offset += BEE_ENCR_BLOCK_SIZE
+        result = align_block(data, BEE_ENCR_BLOCK_SIZE)
+        for region in self._regions:
+            result = region.encrypt_data(start_addr, result)
         return result[:orig_len]
 
 
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Differential programming of flash memories, only the changed sectors are rewritten."""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from spsdk.mboot.error_codes import StatusCode
+from spsdk.mboot.exceptions import McuBootError
+from spsdk.mboot.mcuboot import McuBoot
+
+logger = logging.getLogger(__name__)
+
+ERASED_VALUE = 0xFF
+
+
+@dataclass
+class DifferentialReport:
+    """Summary of the differential programming."""
+
+    address: int
+    length: int
+    sector_size: int
+    skipped: List[int] = field(default_factory=list)
+    programmed: List[int] = field(default_factory=list)
+    compare_time: float = 0.0
+    program_time: float = 0.0
+    status_code: int = StatusCode.SUCCESS.tag
+
+    @property
+    def success(self) -> bool:
+        """All changed sectors were programmed successfully."""
+        return self.status_code == StatusCode.SUCCESS
+
+    @property
+    def sectors(self) -> int:
+        """Number of sectors covered by the programmed data."""
+        return self.length // self.sector_size
+
+    @property
+    def time_saved(self) -> Optional[float]:
+        """Estimated time saved by skipping the unchanged sectors.
+
+        Estimated from the time spent on the programmed sectors, None if no sector was programmed.
+        """
+        if not self.programmed:
+            return None
+        sector_time = self.program_time / len(self.programmed)
+        return len(self.skipped) * sector_time - self.compare_time
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export the report into dictionary."""
+        return {
+            "address": f"{self.address:#010x}",
+            "length": self.length,
+            "sector_size": self.sector_size,
+            "sectors": self.sectors,
+            "skipped": [f"{address:#010x}" for address in self.skipped],
+            "programmed": [f"{address:#010x}" for address in self.programmed],
+            "compare_time": round(self.compare_time, 6),
+            "program_time": round(self.program_time, 6),
+            "time_saved": None if self.time_saved is None else round(self.time_saved, 6),
+        }
+
+    def __str__(self) -> str:
+        msg = (
+            f"Sectors: {self.sectors} x {self.sector_size} B, skipped {len(self.skipped)}, "
+            f"programmed {len(self.programmed)}\n"
+            f"Compare time: {self.compare_time:.3f}s, program time: {self.program_time:.3f}s"
+        )
+        if self.time_saved is not None:
+            msg += f", estimated time saved: {self.time_saved:.3f}s"
+        return msg
+
+
+def _changed_runs(
+    current: bytes, expected: bytes, start: int, sector_size: int
+) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """Find the sectors which differ, merge neighboring sectors into runs.
+
+    :return: List of changed runs (offset, length) and list of unchanged sector offsets
+    """
+    runs: List[Tuple[int, int]] = []
+    skipped: List[int] = []
+    for offset in range(0, len(expected), sector_size):
+        end = offset + sector_size
+        if current[offset:end] == expected[offset:end]:
+            skipped.append(start + offset)
+        elif runs and sum(runs[-1]) == offset:
+            runs[-1] = (runs[-1][0], runs[-1][1] + sector_size)
+        else:
+            runs.append((offset, sector_size))
+    return runs, skipped
+
+
+def write_memory_differential(
+    mboot: McuBoot,
+    address: int,
+    data: bytes,
+    mem_id: int = 0,
+    sector_size: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    pipeline_window: int = 1,
+) -> DifferentialReport:
+    """Program data into flash, erase and write only the sectors whose content differs.
+
+    The sectors covered by data are read back and compared with the image. The bootloader
+    has no command to compute a checksum of a memory range, so the comparison is done on
+    the host. Parts of the first and last sector not covered by data keep their content.
+    Changed sectors which are erased in the image are only erased, not written.
+
+    :param mboot: Opened McuBoot session
+    :param address: Start address
+    :param data: Data to program
+    :param mem_id: Memory ID, see ExtMemId; additionally use `0` for internal memory
+    :param sector_size: Size of erasable sector, read from the target by default
+    :param progress_callback: Callback for updating the caller about the progress
+    :param pipeline_window: Number of read commands queued in the target during the compare
+    :return: Report with skipped and programmed sectors
+    :raises McuBootError: Unknown sector size
+    """
+    if not sector_size:
+        sector_size = mboot.get_sector_size(address, mem_id)
+        if not sector_size:
+            raise McuBootError("Unable to get the flash sector size, specify it explicitly")
+    start = address - address % sector_size
+    end = -(-(address + len(data)) // sector_size) * sector_size
+    report = DifferentialReport(address=start, length=end - start, sector_size=sector_size)
+    logger.info(f"Differential write of {len(data)} B at {address:#010x}, {report.sectors} sectors")
+
+    def compare_progress(step: int, total_steps: int) -> None:
+        if progress_callback:
+            progress_callback(step, 2 * report.length)
+
+    compare_start = time.perf_counter()
+    current = mboot.read_memory(
+        start,
+        report.length,
+        mem_id,
+        progress_callback=compare_progress,
+        pipeline_window=pipeline_window,
+    )
+    report.compare_time = time.perf_counter() - compare_start
+    if not current or len(current) != report.length:
+        report.status_code = mboot.status_code or StatusCode.FAIL.tag
+        return report
+    expected = bytearray(current)
+    expected[address - start : address - start + len(data)] = data
+    runs, report.skipped = _changed_runs(current, expected, start, sector_size)
+
+    changed_length = sum(length for _, length in runs)
+    done = 0
+    program_start = time.perf_counter()
+    for offset, length in runs:
+        run = expected[offset : offset + length]
+        if not mboot.flash_erase_region(start + offset, length, mem_id):
+            break
+        if run.count(ERASED_VALUE) != length:
+
+            def write_progress(step: int, total_steps: int, done: int = done) -> None:
+                if progress_callback:
+                    progress_callback(
+                        report.length + report.length * (done + step) // changed_length,
+                        2 * report.length,
+                    )
+
+            if not mboot.write_memory(start + offset, bytes(run), mem_id, write_progress):
+                break
+        done += length
+        report.programmed.extend(range(start + offset, start + offset + length, sector_size))
+    report.program_time = time.perf_counter() - program_start
+    report.status_code = mboot.status_code
+    if progress_callback and report.success:
+        progress_callback(2 * report.length, 2 * report.length)
+    logger.info(str(report))
+    return report
@@ -53,6 +53,10 @@ class MbootUARTInterface(MbootSerialProtocol):
         assert isinstance(device, SerialDevice)
         super().__init__(device=device)
 
+    def _read_available(self) -> int:
+        """Number of bytes already received by the UART, these can be read without waiting."""
+        return self.device.in_waiting
+
     @classmethod
     def scan_from_args(
         cls,
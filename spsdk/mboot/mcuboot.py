@@ -11,10 +11,12 @@
 import logging
 import struct
 import time
+from collections import deque
 from types import TracebackType
-from typing import Callable, Dict, List, Optional, Sequence, Type
+from typing import BinaryIO, Callable, Deque, Dict, List, Optional, Sequence, Type, Union
 
 from spsdk.mboot.protocol.base import MbootProtocolBase
+from spsdk.utils.interfaces.commands import CmdResponseBase
 from spsdk.utils.interfaces.device.usb_device import UsbDevice
 
 from .commands import (
@@ -45,7 +47,7 @@ from .exceptions import (
     SPSDKError,
 )
 from .memories import ExtMemId, ExtMemRegion, FlashRegion, MemoryRegion, RamRegion
-from .properties import PropertyTag, PropertyValueBase, Version, parse_property_value
+from .properties import PropertyCache, PropertyTag, PropertyValueBase, Version, parse_property_value
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +59,18 @@ class McuBoot:  # pylint: disable=too-many-public-methods
     """Class for communication with the bootloader."""
 
     DEFAULT_MAX_PACKET_SIZE = 32
+    # commands which can't change values of the properties, any other command drops the cache
+    PROPERTY_CACHE_SAFE_COMMANDS = [
+        CommandTag.GET_PROPERTY.tag,
+        CommandTag.READ_MEMORY.tag,
+        CommandTag.WRITE_MEMORY.tag,
+        CommandTag.FILL_MEMORY.tag,
+        CommandTag.FLASH_ERASE_REGION.tag,
+        CommandTag.FLASH_ERASE_ALL.tag,
+        CommandTag.FLASH_READ_ONCE.tag,
+        CommandTag.FLASH_READ_RESOURCE.tag,
+        CommandTag.FUSE_READ.tag,
+    ]
 
     @property
     def status_code(self) -> int:
@@ -73,13 +87,20 @@ class McuBoot:  # pylint: disable=too-many-public-methods
         """Return True if the device is open."""
         return self._interface.is_opened
 
-    def __init__(self, interface: MbootProtocolBase, cmd_exception: bool = False) -> None:
+    def __init__(
+        self,
+        interface: MbootProtocolBase,
+        cmd_exception: bool = False,
+        property_cache: Optional[PropertyCache] = None,
+    ) -> None:
         """Initialize the McuBoot object.
 
         :param interface: The instance of communication interface class
         :param cmd_exception: True to throw McuBootCommandError on any error;
                 False to set status code only
                 Note: some operation might raise McuBootCommandError is all cases
+        :param property_cache: Cache for property values, may be shared by several sessions
+            with the same target; None to always read the properties from the target
 
         """
         self._cmd_exception = cmd_exception
@@ -88,6 +109,8 @@ class McuBoot:  # pylint: disable=too-many-public-methods
         self.reopen = False
         self.enable_data_abort = False
         self._pause_point: Optional[int] = None
+        self._max_packet_size: Optional[int] = None
+        self.property_cache = property_cache
 
     def __enter__(self) -> "McuBoot":
         self.reopen = True
@@ -115,6 +138,8 @@ class McuBoot:  # pylint: disable=too-many-public-methods
             raise McuBootConnectionError("Device not opened")
 
         logger.debug(f"TX-PACKET: {str(cmd_packet)}")
+        if cmd_packet.header.tag not in self.PROPERTY_CACHE_SAFE_COMMANDS:
+            self._invalidate_property_cache()
 
         try:
             self._interface.write_command(cmd_packet)
@@ -124,12 +149,24 @@ class McuBoot:  # pylint: disable=too-many-public-methods
             logger.debug("RX-PACKET: No Response, Timeout Error !")
             response = NoResponse(cmd_tag=cmd_packet.header.tag)
 
+        return self._check_cmd_response(cmd_packet.header.tag, response)
+
+    def _check_cmd_response(
+        self, cmd_tag: int, response: Union[CmdResponseBase, bytes]
+    ) -> CmdResponse:
+        """Check response to a command and update the status code.
+
+        :param cmd_tag: Tag of the command the response belongs to
+        :param response: Response received from the device
+        :return: command response derived from the CmdResponse
+        :raises McuBootCommandError: Error during command execution on the target
+        """
         assert isinstance(response, CmdResponse)
         logger.debug(f"RX-PACKET: {str(response)}")
         self._status_code = response.status
 
         if self._cmd_exception and self._status_code != StatusCode.SUCCESS:
-            raise McuBootCommandError(CommandTag.get_label(cmd_packet.header.tag), response.status)
+            raise McuBootCommandError(CommandTag.get_label(cmd_tag), response.status)
         logger.info(f"CMD: Status: {self.status_string}")
         return response
 
@@ -148,7 +185,31 @@ class McuBoot:  # pylint: disable=too-many-public-methods
         :raises McuBootCommandError: Error during command execution on the target
         :return: Data read from the device
         """
-        data = b""
+        buffer = bytearray(length)
+        received = self._read_data_into(cmd_tag, length, memoryview(buffer), progress_callback)
+        return bytes(memoryview(buffer)[:received])
+
+    def _read_data_into(
+        self,
+        cmd_tag: CommandTag,
+        length: int,
+        output: Union[memoryview, BinaryIO],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """Read data from device directly into a buffer or a file.
+
+        Received chunks are stored without building any intermediate bytes objects,
+        data received beyond the requested length are discarded.
+
+        :param cmd_tag: Tag indicating the read command.
+        :param length: Length of data to read
+        :param output: Writable memoryview (at least `length` bytes long) or binary file object
+        :param progress_callback: Callback for updating the caller about the progress
+        :raises McuBootConnectionError: Timeout error or a problem opening the interface
+        :raises McuBootCommandError: Error during command execution on the target
+        :return: Number of bytes stored into the output
+        """
+        total = 0
 
         if not self.is_opened:
             logger.error("RX: Device not opened")
@@ -167,9 +228,11 @@ class McuBoot:  # pylint: disable=too-many-public-methods
                 break
 
             if isinstance(response, bytes):
-                data += response
+                if total < length:
+                    _store_chunk(output, total, memoryview(response)[: length - total])
+                total += len(response)
                 if progress_callback:
-                    progress_callback(len(data), length)
+                    progress_callback(total, length)
 
             elif isinstance(response, GenericResponse):
                 logger.debug(f"RX-PACKET: {str(response)}")
@@ -177,20 +240,20 @@ class McuBoot:  # pylint: disable=too-many-public-methods
                 if response.cmd_tag == cmd_tag:
                     break
 
-        if len(data) < length or self.status_code != StatusCode.SUCCESS:
+        if total < length or self.status_code != StatusCode.SUCCESS:
             status_info = (
                 StatusCode.get_label(self._status_code)
                 if self._status_code in StatusCode.tags()
                 else f"0x{self._status_code:08X}"
             )
-            logger.debug(f"CMD: Received {len(data)} from {length} Bytes, {status_info}")
+            logger.debug(f"CMD: Received {total} from {length} Bytes, {status_info}")
             if self._cmd_exception:
                 assert isinstance(response, CmdResponse)
                 raise McuBootCommandError(cmd_tag.label, response.status)
         else:
-            logger.info(f"CMD: Successfully Received {len(data)} from {length} Bytes")
+            logger.info(f"CMD: Successfully Received {total} from {length} Bytes")
 
-        return data[:length] if len(data) > length else data
+        return min(total, length)
 
     def _send_data(
         self,
@@ -260,19 +323,31 @@ class McuBoot:  # pylint: disable=too-many-public-methods
     def _get_max_packet_size(self) -> int:
         """Get max packet size.
 
+        The value reported by the device is cached for the rest of the session.
+
         :return int: max packet size in B
         """
+        if self._max_packet_size:
+            return self._max_packet_size
         packet_size_property = None
         try:
             packet_size_property = self.get_property(prop_tag=PropertyTag.MAX_PACKET_SIZE)
         except McuBootError:
             pass
         if packet_size_property is None:
-            packet_size_property = [self.DEFAULT_MAX_PACKET_SIZE]
             logger.warning(
                 f"CMD: Unable to get MAX PACKET SIZE, using: {self.DEFAULT_MAX_PACKET_SIZE}"
             )
-        return packet_size_property[0]
+            return self.DEFAULT_MAX_PACKET_SIZE
+        self._max_packet_size = packet_size_property[0]
+        return self._max_packet_size
+
+    def _invalidate_property_cache(self) -> None:
+        """Drop cached property values and max packet size, the command may change them."""
+        self._max_packet_size = None
+        if self.property_cache is not None:
+            logger.debug(f"Invalidating {self.property_cache}")
+            self.property_cache.invalidate()
 
     def _split_data(self, data: bytes) -> List[bytes]:
         """Split data to send if necessary.
@@ -289,6 +364,7 @@ class McuBoot:  # pylint: disable=too-many-public-methods
     def open(self) -> None:
         """Connect to the device."""
         logger.info(f"Connect: {str(self._interface)}")
+        self._max_packet_size = None
         self._interface.open()
 
     def close(self) -> None:
@@ -474,6 +550,22 @@ class McuBoot:  # pylint: disable=too-many-public-methods
 
         return memory_list
 
+    def get_sector_size(self, address: int, mem_id: int = 0) -> Optional[int]:
+        """Get size of the erasable sector of a flash memory.
+
+        :param address: Address within the memory
+        :param mem_id: Memory ID, see ExtMemId; additionally use `0` for internal memory
+        :return: Sector size in bytes, None if the target doesn't report it
+        """
+        if mem_id:
+            values = self.get_property(PropertyTag.EXTERNAL_MEMORY_ATTRIBUTES, mem_id)
+            return ExtMemRegion(mem_id, values).sector_size if values else None
+        regions = self._get_internal_flash()
+        for region in regions:
+            if region.start <= address <= region.end:
+                return region.sector_size
+        return regions[0].sector_size if regions else None
+
     def flash_erase_all(self, mem_id: int = 0) -> bool:
         """Erase complete flash memory without recovering flash security section.
 
@@ -509,6 +601,7 @@ class McuBoot:  # pylint: disable=too-many-public-methods
         mem_id: int = 0,
         progress_callback: Optional[Callable[[int, int], None]] = None,
         fast_mode: bool = False,
+        pipeline_window: int = 1,
     ) -> Optional[bytes]:
         """Read data from MCU memory.
 
@@ -517,46 +610,63 @@ class McuBoot:  # pylint: disable=too-many-public-methods
         :param mem_id: Memory ID
         :param fast_mode: Fast mode for USB-HID data transfer, not reliable !!!
         :param progress_callback: Callback for updating the caller about the progress
+        :param pipeline_window: Count of commands queued in the device in USB-HID reliable mode
         :return: Data read from the memory; None in case of a failure
         """
+        buffer = bytearray(length)
+        received = self.read_memory_into(
+            address, buffer, length, mem_id, progress_callback, fast_mode, pipeline_window
+        )
+        if received is None:
+            return None
+        return bytes(memoryview(buffer)[:received])
+
+    def read_memory_into(
+        self,
+        address: int,
+        output: Union[bytearray, memoryview, BinaryIO],
+        length: Optional[int] = None,
+        mem_id: int = 0,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        fast_mode: bool = False,
+        pipeline_window: int = 1,
+    ) -> Optional[int]:
+        """Read data from MCU memory directly into a buffer or a binary file.
+
+        The data are stored as they arrive from the device, so the memory consumption
+        doesn't depend on the length of the readout when streaming into a file.
+
+        :param address: Start address
+        :param output: Preallocated writable buffer or binary file object opened for writing
+        :param length: Count of bytes; defaults to the size of the buffer (mandatory for files)
+        :param mem_id: Memory ID
+        :param progress_callback: Callback for updating the caller about the progress
+        :param fast_mode: Fast mode for USB-HID data transfer, not reliable !!!
+        :param pipeline_window: Count of commands queued in the device in USB-HID reliable mode,
+            higher values improve throughput, 1 waits for each command to complete
+        :raises McuBootError: Length is not specified or the buffer is too small
+        :return: Count of bytes stored into the output; None in case of a failure
+        """
+        view: Union[memoryview, BinaryIO]
+        if isinstance(output, (bytearray, memoryview)):
+            view = memoryview(output).cast("B")
+            if length is None:
+                length = len(view)
+            if len(view) < length:
+                raise McuBootError(f"Output buffer is too small to hold {length} bytes")
+        else:
+            view = output
+            if length is None:
+                raise McuBootError("Length must be specified when reading into a file")
+
         logger.info(f"CMD: ReadMemory(address=0x{address:08X}, length={length}, mem_id={mem_id})")
         mem_id = _clamp_down_memory_id(memory_id=mem_id)
 
         # workaround for better USB-HID reliability
         if isinstance(self._interface.device, UsbDevice) and not fast_mode:
-            payload_size = self._get_max_packet_size()
-            packets = length // payload_size
-            remainder = length % payload_size
-            if remainder:
-                packets += 1
-
-            data = b""
-
-            for idx in range(packets):
-                if idx == packets - 1 and remainder:
-                    data_len = remainder
-                else:
-                    data_len = payload_size
-
-                cmd_packet = CmdPacket(
-                    CommandTag.READ_MEMORY,
-                    CommandFlag.NONE.tag,
-                    address + idx * payload_size,
-                    data_len,
-                    mem_id,
-                )
-                cmd_response = self._process_cmd(cmd_packet)
-                if cmd_response.status == StatusCode.SUCCESS:
-                    data += self._read_data(CommandTag.READ_MEMORY, data_len)
-                    if progress_callback:
-                        progress_callback(len(data), length)
-                    if self._status_code == StatusCode.NO_RESPONSE:
-                        logger.warning(f"CMD: NO RESPONSE, received {len(data)}/{length} B")
-                        return data
-                else:
-                    return b""
-
-            return data
+            return self._read_memory_packets(
+                address, length, mem_id, view, pipeline_window, progress_callback
+            )
 
         cmd_packet = CmdPacket(
             CommandTag.READ_MEMORY, CommandFlag.NONE.tag, address, length, mem_id
@@ -564,9 +674,109 @@ class McuBoot:  # pylint: disable=too-many-public-methods
         cmd_response = self._process_cmd(cmd_packet)
         if cmd_response.status == StatusCode.SUCCESS:
             assert isinstance(cmd_response, ReadMemoryResponse)
-            return self._read_data(CommandTag.READ_MEMORY, cmd_response.length, progress_callback)
+            return self._read_data_into(
+                CommandTag.READ_MEMORY,
+                min(cmd_response.length, length),
+                view,
+                progress_callback,
+            )
         return None
 
+    def _read_memory_packets(
+        self,
+        address: int,
+        length: int,
+        mem_id: int,
+        output: Union[memoryview, BinaryIO],
+        window: int,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """Read memory using one READ_MEMORY command per max-packet-size chunk.
+
+        Up to `window` commands are kept queued in the device, so the target can start
+        the next command as soon as the data phase of the current one drains.
+
+        :param address: Start address
+        :param length: Count of bytes
+        :param mem_id: Memory ID
+        :param output: Writable memoryview or binary file object
+        :param window: Count of commands queued in the device
+        :param progress_callback: Callback for updating the caller about the progress
+        :raises McuBootError: Invalid window size
+        :raises McuBootConnectionError: Device is not opened
+        :return: Count of bytes stored into the output; 0 if any command failed
+        """
+        if window < 1:
+            raise McuBootError(f"Invalid pipeline window: {window}")
+        if not self.is_opened:
+            logger.info("TX: Device not opened")
+            raise McuBootConnectionError("Device not opened")
+        payload_size = self._get_max_packet_size()
+        offsets = iter(range(0, length, payload_size))
+        pending: Deque[int] = deque()
+        received = 0
+
+        try:
+            while True:
+                while len(pending) < window:
+                    offset = next(offsets, None)
+                    if offset is None:
+                        break
+                    cmd_packet = CmdPacket(
+                        CommandTag.READ_MEMORY,
+                        CommandFlag.NONE.tag,
+                        address + offset,
+                        min(payload_size, length - offset),
+                        mem_id,
+                    )
+                    logger.debug(f"TX-PACKET: {str(cmd_packet)}")
+                    self._interface.write_command(cmd_packet)
+                    pending.append(offset)
+                if not pending:
+                    break
+
+                offset = pending.popleft()
+                data_len = min(payload_size, length - offset)
+                try:
+                    response = self._interface.read()
+                except TimeoutError:
+                    self._status_code = StatusCode.NO_RESPONSE.tag
+                    response = NoResponse(cmd_tag=CommandTag.READ_MEMORY.tag)
+                cmd_response = self._check_cmd_response(CommandTag.READ_MEMORY.tag, response)
+                if cmd_response.status != StatusCode.SUCCESS:
+                    self._drain_responses(len(pending))
+                    return 0
+
+                chunk_output = output
+                if isinstance(output, memoryview):
+                    chunk_output = output[received:]
+                received += self._read_data_into(CommandTag.READ_MEMORY, data_len, chunk_output)
+                if progress_callback:
+                    progress_callback(received, length)
+                if self._status_code == StatusCode.NO_RESPONSE:
+                    logger.warning(f"CMD: NO RESPONSE, received {received}/{length} B")
+                    return received
+        except McuBootCommandError:
+            self._drain_responses(len(pending))
+            raise
+
+        return received
+
+    def _drain_responses(self, count: int) -> None:
+        """Consume responses to the commands queued in the device ahead of a failed one.
+
+        :param count: Count of the queued commands
+        """
+        for _ in range(count):
+            try:
+                response = self._interface.read()
+                if isinstance(response, CmdResponse) and response.status != StatusCode.SUCCESS:
+                    continue
+                while not isinstance(response, GenericResponse):
+                    response = self._interface.read()
+            except (TimeoutError, SPSDKError):
+                return
+
     def write_memory(
         self,
         address: int,
@@ -636,10 +846,18 @@ class McuBoot:  # pylint: disable=too-many-public-methods
         :raises McuBootError: If received invalid get-property response
         """
         logger.info(f"CMD: GetProperty({prop_tag.label}, index={index!r})")
+        if self.property_cache is not None:
+            values = self.property_cache.get(prop_tag.tag, index)
+            if values is not None:
+                logger.info("CMD: Property value taken from the cache")
+                self._status_code = StatusCode.SUCCESS.tag
+                return values
         cmd_packet = CmdPacket(CommandTag.GET_PROPERTY, CommandFlag.NONE.tag, prop_tag.tag, index)
         cmd_response = self._process_cmd(cmd_packet)
         if cmd_response.status == StatusCode.SUCCESS:
             if isinstance(cmd_response, GetPropertyResponse):
+                if self.property_cache is not None:
+                    self.property_cache.store(prop_tag.tag, index, cmd_response.values)
                 return cmd_response.values
             raise McuBootError(f"Received invalid get-property response: {str(cmd_response)}")
         return None
@@ -1676,6 +1894,14 @@ def _tp_sentinel_frame(command: int, args: List[int], tag: int = 0x17, version:
     return data
 
 
+def _store_chunk(output: Union[memoryview, BinaryIO], offset: int, chunk: memoryview) -> None:
+    """Store received chunk at given offset of a buffer, or append it to a file."""
+    if isinstance(output, memoryview):
+        output[offset : offset + len(chunk)] = chunk
+    else:
+        output.write(chunk)
+
+
 def _clamp_down_memory_id(memory_id: int) -> int:
     if memory_id > 255 or memory_id == 0:
         return memory_id
@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Programming of several targets at once."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
+
+from spsdk.exceptions import SPSDKError
+from spsdk.mboot.error_codes import StatusCode, stringify_status_code
+from spsdk.mboot.mcuboot import McuBoot
+from spsdk.mboot.protocol.base import MbootProtocolBase
+
+if TYPE_CHECKING:
+    from spsdk.utils.images import BinaryImage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ERASE_ALIGNMENT = 1024
+
+
+@dataclass
+class FlashSegment:
+    """Continuous block of data programmed into the target memory."""
+
+    address: int
+    data: bytes
+
+    def aligned_start(self, alignment: int) -> int:
+        """Start address rounded down to the alignment."""
+        return self.address - self.address % alignment
+
+    def aligned_length(self, alignment: int) -> int:
+        """Length of the segment extended to cover whole aligned blocks."""
+        end = self.address + len(self.data)
+        aligned_end = -(-end // alignment) * alignment
+        return aligned_end - self.aligned_start(alignment)
+
+
+@dataclass
+class FlashPlan:
+    """Sequence of operations executed on every target.
+
+    Erase (optional), write and verify by read-back (optional) of all segments.
+    """
+
+    segments: List[FlashSegment]
+    erase: bool = False
+    verify: bool = False
+    mem_id: int = 0
+    alignment: Optional[int] = None
+
+    @classmethod
+    def from_binary_image(
+        cls,
+        image: "BinaryImage",
+        erase: bool = False,
+        verify: bool = False,
+        mem_id: int = 0,
+        alignment: Optional[int] = None,
+    ) -> "FlashPlan":
+        """Create the plan from sub-images of the binary image.
+
+        :param image: Image to be programmed
+        :param erase: Erase the regions covered by the sub-images first
+        :param verify: Read the data back and compare them after writing
+        :param mem_id: Memory ID, see ExtMemId; additionally use `0` for internal memory
+        :param alignment: Alignment of the erased regions, sector size of the target by default
+        :return: Flash plan
+        """
+        segments = [
+            FlashSegment(address=sub_image.absolute_address, data=sub_image.export())
+            for sub_image in image.sub_images
+        ]
+        return cls(
+            segments=segments, erase=erase, verify=verify, mem_id=mem_id, alignment=alignment
+        )
+
+    @property
+    def total_bytes(self) -> int:
+        """Number of bytes transferred to/from one target."""
+        data_len = sum(len(segment.data) for segment in self.segments)
+        return data_len * 2 if self.verify else data_len
+
+
+@dataclass
+class FlashStep:
+    """Result of one operation executed on a target."""
+
+    operation: str
+    address: int
+    length: int
+    status_code: int
+    duration: float
+
+    @property
+    def success(self) -> bool:
+        """Operation finished successfully."""
+        return self.status_code == StatusCode.SUCCESS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export the step into dictionary."""
+        return {
+            "operation": self.operation,
+            "address": f"{self.address:#010x}",
+            "length": self.length,
+            "status_code": self.status_code,
+            "status": stringify_status_code(self.status_code),
+            "duration": round(self.duration, 6),
+        }
+
+
+@dataclass
+class DeviceFlashResult:
+    """Result of the flash plan executed on one target."""
+
+    device: str
+    steps: List[FlashStep] = field(default_factory=list)
+    bytes_transferred: int = 0
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def status_code(self) -> int:
+        """Status code of the last executed operation, FAIL in case of an error."""
+        if self.error:
+            return StatusCode.FAIL.tag
+        if not self.steps:
+            return StatusCode.SUCCESS.tag
+        return self.steps[-1].status_code
+
+    @property
+    def success(self) -> bool:
+        """All operations finished successfully."""
+        return self.status_code == StatusCode.SUCCESS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export the result into dictionary."""
+        return {
+            "device": self.device,
+            "success": self.success,
+            "status_code": self.status_code,
+            "status": stringify_status_code(self.status_code),
+            "error": self.error,
+            "bytes_transferred": self.bytes_transferred,
+            "duration": round(self.duration, 6),
+            "steps": [step.to_dict() for step in self.steps],
+        }
+
+
+@dataclass
+class ParallelFlashReport:
+    """Aggregated results of the flash plan executed on all targets."""
+
+    results: List[DeviceFlashResult]
+    duration: float
+
+    @property
+    def success(self) -> bool:
+        """The plan was executed successfully on all targets."""
+        return all(result.success for result in self.results)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export the report into dictionary (e.g. for JSON output)."""
+        return {
+            "success": self.success,
+            "devices": len(self.results),
+            "failed": sum(not result.success for result in self.results),
+            "duration": round(self.duration, 6),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+
+class _ProgressAggregator:
+    """Merges the progress reported from several threads into single callback."""
+
+    def __init__(self, total: int, callback: Optional[Callable[[int, int], None]]) -> None:
+        self.total = total
+        self.done = 0
+        self.callback = callback
+        self._lock = threading.Lock()
+
+    def update(self, increment: int) -> None:
+        """Add transferred bytes and report the overall progress."""
+        with self._lock:
+            self.done += increment
+            if self.callback and self.total:
+                self.callback(self.done, self.total)
+
+
+class _DeviceProgress:
+    """Converts the progress of a single McuBoot operation into increments."""
+
+    def __init__(self, aggregator: _ProgressAggregator, result: DeviceFlashResult) -> None:
+        self.aggregator = aggregator
+        self.result = result
+        self.reported = 0
+
+    def __call__(self, step: int, total_steps: int) -> None:
+        increment = step - self.reported
+        self.reported = step
+        self.result.bytes_transferred += increment
+        self.aggregator.update(increment)
+
+    def finish(self, length: int) -> None:
+        """Complete the successful operation, account the bytes it didn't report itself."""
+        self(length, length)
+        self.reported = 0
+
+
+def _add_step(
+    result: DeviceFlashResult,
+    mboot: McuBoot,
+    operation: str,
+    segment: FlashSegment,
+    start: float,
+    address: Optional[int] = None,
+    length: Optional[int] = None,
+) -> bool:
+    """Record result of an operation, return True if it finished successfully."""
+    step = FlashStep(
+        operation=operation,
+        address=segment.address if address is None else address,
+        length=len(segment.data) if length is None else length,
+        status_code=mboot.status_code,
+        duration=time.perf_counter() - start,
+    )
+    result.steps.append(step)
+    return step.success
+
+
+def flash_device(
+    interface: MbootProtocolBase,
+    plan: FlashPlan,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    cmd_exception: bool = False,
+) -> DeviceFlashResult:
+    """Execute the flash plan on one target.
+
+    Execution stops at the first failed operation, errors are recorded into the result.
+
+    :param interface: Interface of the target
+    :param plan: Operations to be executed
+    :param progress_callback: Callback for updating the caller about the progress
+    :param cmd_exception: True to throw McuBootCommandError on any error
+    :return: Result of the plan
+    """
+    aggregator = _ProgressAggregator(plan.total_bytes, progress_callback)
+    return _flash_device(interface, plan, aggregator, cmd_exception)
+
+
+def _get_erase_alignment(mboot: McuBoot, address: int, mem_id: int) -> int:
+    """Get alignment of the erased region from the sector size reported by the target.
+
+    :param mboot: Opened McuBoot session
+    :param address: Address within the erased memory
+    :param mem_id: Memory ID
+    :return: Sector size, DEFAULT_ERASE_ALIGNMENT if the target doesn't report it
+    """
+    try:
+        sector_size = mboot.get_sector_size(address, mem_id)
+    except SPSDKError as exc:
+        logger.debug(f"Reading of sector size failed: {exc}")
+        sector_size = None
+    if not sector_size:
+        logger.warning(f"Unable to get sector size, using: {DEFAULT_ERASE_ALIGNMENT}")
+        return DEFAULT_ERASE_ALIGNMENT
+    return sector_size
+
+
+def _flash_device(
+    interface: MbootProtocolBase,
+    plan: FlashPlan,
+    aggregator: _ProgressAggregator,
+    cmd_exception: bool,
+) -> DeviceFlashResult:
+    """Execute the flash plan on one target reporting progress to shared aggregator."""
+    result = DeviceFlashResult(device=str(interface))
+    progress = _DeviceProgress(aggregator, result)
+    start = time.perf_counter()
+    try:
+        with McuBoot(interface, cmd_exception=cmd_exception) as mboot:
+            if plan.erase:
+                for segment in plan.segments:
+                    alignment = plan.alignment or _get_erase_alignment(
+                        mboot, segment.address, plan.mem_id
+                    )
+                    address = segment.aligned_start(alignment)
+                    length = segment.aligned_length(alignment)
+                    step_start = time.perf_counter()
+                    mboot.flash_erase_region(address, length, plan.mem_id)
+                    if not _add_step(result, mboot, "erase", segment, step_start, address, length):
+                        return result
+            for segment in plan.segments:
+                step_start = time.perf_counter()
+                mboot.write_memory(segment.address, segment.data, plan.mem_id, progress)
+                if not _add_step(result, mboot, "write", segment, step_start):
+                    return result
+                progress.finish(len(segment.data))
+            if plan.verify:
+                for segment in plan.segments:
+                    step_start = time.perf_counter()
+                    data = mboot.read_memory(
+                        segment.address, len(segment.data), plan.mem_id, progress
+                    )
+                    if not _add_step(result, mboot, "verify", segment, step_start):
+                        return result
+                    progress.finish(len(segment.data))
+                    if data != segment.data:
+                        result.error = f"Verification failed at {segment.address:#010x}"
+                        return result
+    except SPSDKError as exc:
+        result.error = str(exc)
+        logger.error(f"Flashing of {result.device} failed: {exc}")
+    except Exception as exc:  # pylint: disable=broad-except  # must not abort the other targets
+        result.error = f"{type(exc).__name__}: {exc}"
+        logger.error(f"Flashing of {result.device} failed: {result.error}", exc_info=True)
+    finally:
+        result.duration = time.perf_counter() - start
+    return result
+
+
+def flash_devices(
+    interfaces: Sequence[MbootProtocolBase],
+    plan: FlashPlan,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    cmd_exception: bool = False,
+) -> ParallelFlashReport:
+    """Execute the same flash plan on several targets concurrently.
+
+    Each target is driven by its own McuBoot session in a thread pool. Failure of a target
+    doesn't affect the others, it's recorded in the report.
+
+    :param interfaces: Interfaces of the targets
+    :param plan: Operations to be executed on every target
+    :param max_workers: Number of targets programmed at once, all targets by default
+    :param progress_callback: Callback for updating the caller about the overall progress
+    :param cmd_exception: True to throw McuBootCommandError on any error
+    :return: Report with results of all targets in the order of interfaces
+    :raises SPSDKError: When no interface is provided
+    """
+    if not interfaces:
+        raise SPSDKError("No device to flash")
+    aggregator = _ProgressAggregator(plan.total_bytes * len(interfaces), progress_callback)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or len(interfaces)) as executor:
+        futures = [
+            executor.submit(_flash_device, interface, plan, aggregator, cmd_exception)
+            for interface in interfaces
+        ]
+        results = [future.result() for future in futures]
+    report = ParallelFlashReport(results=results, duration=time.perf_counter() - start)
+    logger.info(
+        f"Flashed {len(results)} devices in {report.duration:.3f}s, "
+        f"{sum(not result.success for result in results)} failed"
+    )
+    return report
@@ -848,3 +848,62 @@ def parse_property_value(
         obj.name = property_tag_override.label
         obj.desc = property_tag_override.description
     return obj
+
+
+class PropertyCache:
+    """Cache of the property values read from the target.
+
+    Values are kept per property tag and index. Properties reflecting a runtime state
+    of the target are never cached.
+    """
+
+    VOLATILE_TAGS = [
+        PropertyTag.CRC_CHECK_STATUS.tag,
+        PropertyTag.LAST_ERROR.tag,
+        PropertyTag.FLASH_SECURITY_STATE.tag,
+        PropertyTag.QSPI_INIT_STATUS.tag,
+        PropertyTag.RELIABLE_UPDATE_STATUS.tag,
+        PropertyTag.FUSE_LOCKED_STATUS.tag,
+    ]
+
+    def __init__(self) -> None:
+        """Initialize the empty property cache."""
+        self._values: Dict[Tuple[int, int], List[int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __str__(self) -> str:
+        return f"PropertyCache(hits={self.hits}, misses={self.misses}, size={len(self)})"
+
+    def get(self, tag: int, index: int = 0) -> Optional[List[int]]:
+        """Get cached property values.
+
+        :param tag: Property tag
+        :param index: External memory ID or internal memory region index
+        :return: Copy of the cached values; None if the property is not cached
+        """
+        if tag in self.VOLATILE_TAGS:
+            return None
+        values = self._values.get((tag, index))
+        if values is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(values)
+
+    def store(self, tag: int, index: int, values: List[int]) -> None:
+        """Store property values read from the target.
+
+        :param tag: Property tag
+        :param index: External memory ID or internal memory region index
+        :param values: Property values
+        """
+        if tag not in self.VOLATILE_TAGS:
+            self._values[(tag, index)] = list(values)
+
+    def invalidate(self) -> None:
+        """Drop all cached values, hit/miss counters are preserved."""
+        self._values.clear()
@@ -21,11 +21,17 @@ from spsdk.mboot.commands import CmdResponse, parse_cmd_response
 from spsdk.mboot.exceptions import McuBootConnectionError, McuBootDataAbortError
 from spsdk.mboot.protocol.base import MbootProtocolBase
 from spsdk.utils.interfaces.commands import CmdPacketBase
+from spsdk.utils.interfaces.device.base import DeviceBase
 from spsdk.utils.misc import Endianness, Timeout
 from spsdk.utils.spsdk_enum import SpsdkEnum
 
 logger = logging.getLogger(__name__)
 
+# the CRC function and the frame header layouts are shared by all frames
+_CRC16_XMODEM = mkPredefinedCrcFun("xmodem")
+_FRAME_HEADER = struct.Struct("<BBH")
+_FRAME_CRC = struct.Struct("<H")
+
 
 class PingResponse(NamedTuple):
     """Special type of response for Ping Command."""
@@ -81,9 +87,19 @@ class MbootSerialProtocol(MbootProtocolBase):
     PING_TIMEOUT_MS = 500
     MAX_PING_RESPONSE_DUMMY_BYTES = 50
     MAX_UART_OPEN_ATTEMPTS = 3
+    PING_RESPONSE_SIZE = 10
     protocol_version: int = 0
     options: int = 0
 
+    def __init__(self, device: DeviceBase) -> None:
+        """Initialize the MbootSerialProtocol object.
+
+        :param device: The device instance
+        """
+        super().__init__(device=device)
+        # bytes already received from the device, but not consumed by the frame parser yet
+        self._rx_buffer = bytearray()
+
     def open(self) -> None:
         """Open the interface.
 
@@ -91,6 +107,7 @@ class MbootSerialProtocol(MbootProtocolBase):
         """
         for i in range(self.MAX_UART_OPEN_ATTEMPTS):
             try:
+                self._rx_buffer.clear()
                 self.device.open()
                 self._ping()
                 logger.debug(f"Interface opened after {i + 1} attempts.")
@@ -111,6 +128,7 @@ class MbootSerialProtocol(MbootProtocolBase):
 
     def close(self) -> None:
         """Close the interface."""
+        self._rx_buffer.clear()
         self.device.close()
 
     @property
@@ -146,12 +164,12 @@ class MbootSerialProtocol(MbootProtocolBase):
         :raises McuBootConnectionError: When received invalid CRC
         """
         _, frame_type = self._read_frame_header()
-        _length = to_int(self._read(2))
-        crc = to_int(self._read(2))
+        length_crc = self._read_buffered(4)
+        _length, crc = to_int(length_crc[:2]), to_int(length_crc[2:])
         if not _length:
             self._send_ack()
             raise McuBootDataAbortError()
-        data = self._read(_length)
+        data = self._read_buffered(_length)
         self._send_ack()
         calculated_crc = self._calc_frame_crc(data, frame_type)
         if crc != calculated_crc:
@@ -164,6 +182,33 @@ class MbootSerialProtocol(MbootProtocolBase):
         """Internal read, done mainly due BUSPAL, where this is overriden."""
         return self.device.read(length, timeout)
 
+    def _read_available(self) -> int:
+        """Number of bytes the device can provide immediately without waiting.
+
+        Devices which are not able to tell it return 0, only the bytes guaranteed
+        by the frame structure are read from them.
+        """
+        return 0
+
+    def _read_buffered(self, length: int, expected: int = 0) -> bytes:
+        """Read data from the device through the receive buffer.
+
+        The device is accessed only if the buffer doesn't hold enough data. In that case
+        the missing bytes are read in a single transfer together with the rest of
+        the `expected` bytes and anything the device has already available.
+
+        :param length: Number of bytes to consume
+        :param expected: Number of bytes the frame structure guarantees to follow
+        :return: Consumed data, shorter than requested if the device didn't provide enough data
+        """
+        buffered = len(self._rx_buffer)
+        if buffered < length:
+            size = max(length, expected, buffered + self._read_available()) - buffered
+            self._rx_buffer += self._read(size)
+        data = bytes(self._rx_buffer[:length])
+        del self._rx_buffer[:length]
+        return data
+
     def _send_ack(self) -> None:
         """Send ACK command."""
         ack_frame = struct.pack("<BB", self.FRAME_START_BYTE, FPType.ACK.tag)
@@ -174,44 +219,41 @@ class MbootSerialProtocol(MbootProtocolBase):
 
         :param data: Data to be send
         """
+        if wait_for_ack:
+            # a new packet starts a new exchange, the bytes read ahead are stale like the ones
+            # dropped by the device on write; ACK keeps them as the target may not wait for it
+            self._rx_buffer.clear()
         self.device.write(frame)
         if wait_for_ack:
             self._read_frame_header(FPType.ACK)
 
     def _create_frame(self, data: bytes, frame_type: FPType) -> bytes:
         """Encapsulate data into frame."""
-        crc = self._calc_frame_crc(data, frame_type.tag)
-        frame = struct.pack(
-            f"<BBHH{len(data)}B",
-            self.FRAME_START_BYTE,
-            frame_type.tag,
-            len(data),
-            crc,
-            *data,
-        )
-        return frame
+        header = _FRAME_HEADER.pack(self.FRAME_START_BYTE, frame_type.tag, len(data))
+        crc = self._calc_crc(data, self._calc_crc(header))
+        return b"".join((header, _FRAME_CRC.pack(crc), data))
 
     def _calc_frame_crc(self, data: bytes, frame_type: int) -> int:
         """Calculate the CRC of a frame.
 
+        The CRC is computed over the header and continues over the data without joining them.
+
         :param data: frame data
         :param frame_type: frame type
         :return: calculated CRC
         """
-        crc_data = struct.pack(
-            f"<BBH{len(data)}B", self.FRAME_START_BYTE, frame_type, len(data), *data
-        )
-        return self._calc_crc(crc_data)
+        header = _FRAME_HEADER.pack(self.FRAME_START_BYTE, frame_type, len(data))
+        return self._calc_crc(data, self._calc_crc(header))
 
     @staticmethod
-    def _calc_crc(data: bytes) -> int:
+    def _calc_crc(data: bytes, crc: int = 0) -> int:
         """Calculate CRC from the data.
 
         :param data: data to calculate CRC from
+        :param crc: CRC of the preceding data, allows to calculate CRC incrementally
         :return: calculated CRC
         """
-        crc_function = mkPredefinedCrcFun("xmodem")
-        return crc_function(data)
+        return _CRC16_XMODEM(data, crc)
 
     def _read_frame_header(self, expected_frame_type: Optional[FPType] = None) -> Tuple[int, int]:
         """Read frame header and frame type. Return them as tuple of integers.
@@ -225,7 +267,8 @@ class MbootSerialProtocol(MbootProtocolBase):
         assert isinstance(self.device.timeout, int)
         timeout = Timeout(self.device.timeout, "ms")
         while not timeout.overflow():
-            header = to_int(self._read(1))
+            # start byte and frame type are always sent together, read them in one transfer
+            header = to_int(self._read_buffered(1, expected=2))
             if header not in self.FRAME_START_NOT_READY_LIST:
                 break
         # This is workaround addressing SPI ISP issue on RT5/6xx when sometimes
@@ -238,7 +281,7 @@ class MbootSerialProtocol(MbootProtocolBase):
         if header == FPType.ACK:
             frame_type: int = header
         else:
-            frame_type = to_int(self._read(1))
+            frame_type = to_int(self._read_buffered(1))
         if frame_type == FPType.ABORT:
             raise McuBootDataAbortError()
         if expected_frame_type:
@@ -269,7 +312,7 @@ class MbootSerialProtocol(MbootProtocolBase):
             # we read data from UART until the FRAME_START_BYTE byte
             start_byte = b""
             for i in range(self.MAX_PING_RESPONSE_DUMMY_BYTES):
-                start_byte = self._read(1)
+                start_byte = self._read_buffered(1, expected=self.PING_RESPONSE_SIZE)
                 if start_byte is None:
                     raise McuBootConnectionError("Failed to receive initial byte")
 
@@ -284,11 +327,11 @@ class MbootSerialProtocol(MbootProtocolBase):
             header = to_int(start_byte)
             if header != self.FRAME_START_BYTE:
                 raise McuBootConnectionError("Header is invalid")
-            frame_type = to_int(self._read(1))
+            frame_type = to_int(self._read_buffered(1))
             if FPType.from_tag(frame_type) != FPType.PINGR:
                 raise McuBootConnectionError("Frame type is invalid")
 
-            response_data = self._read(8)
+            response_data = self._read_buffered(self.PING_RESPONSE_SIZE - 2)
             if response_data is None:
                 raise McuBootConnectionError("Failed to receive ping response")
             response = PingResponse.parse(response_data)
@@ -296,10 +339,7 @@ class MbootSerialProtocol(MbootProtocolBase):
             # ping response has different crc computation than the other responses
             # that's why we can't use calc_frame_crc method
             # crc data for ping excludes the last 2B of response data, which holds the CRC from device
-            crc_data = struct.pack(
-                f"<BB{len(response_data) -2}B", header, frame_type, *response_data[:-2]
-            )
-            crc = self._calc_crc(crc_data)
+            crc = self._calc_crc(response_data[:-2], self._calc_crc(bytes([header, frame_type])))
             if crc != response.crc:
                 raise McuBootConnectionError("Received CRC doesn't match")
 
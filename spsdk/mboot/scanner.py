@@ -6,7 +6,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 """Helper module used for scanning the existing devices."""
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
 from spsdk.exceptions import SPSDKError
 from spsdk.mboot.protocol.base import MbootProtocolBase
@@ -95,3 +95,45 @@ def get_mboot_interface(
             f"Multiple '{interface_params[0].identifier}' devices found: {len(devices)}"
         )
     return devices[0]
+
+
+INTERFACE_SPEC_TYPES = ["port", "usb", "sdio", "lpcusbsio", "plugin"]
+
+
+def parse_interface_spec(spec: str) -> Dict[str, str]:
+    """Parse interface specification into keyword arguments of `get_mboot_interface`.
+
+    The specification has format '<type>:<params>', where type is one of 'port', 'usb', 'sdio',
+    'lpcusbsio' or 'plugin' and params are same as for the corresponding blhost option.
+    example: "usb:0x1fc9:0x0021", "port:COM3,115200", "lpcusbsio:spi0"
+
+    :param spec: Interface specification
+    :return: Dictionary with single interface type and its parameters
+    :raises SPSDKError: Invalid specification
+    """
+    interface_type, _, params = spec.partition(":")
+    interface_type = interface_type.strip().lower()
+    if interface_type not in INTERFACE_SPEC_TYPES or not params:
+        raise SPSDKError(
+            f"Invalid interface specification '{spec}', expected '<type>:<params>' "
+            f"where type is one of {INTERFACE_SPEC_TYPES}"
+        )
+    return {interface_type: params}
+
+
+def get_mboot_interfaces(specs: Sequence[str], timeout: int = 5000) -> List[MbootProtocolBase]:
+    """Get interfaces of several devices.
+
+    :param specs: Interface specifications, see `parse_interface_spec`
+    :param timeout: timeout in milliseconds
+    :return: List of interfaces in the order of specifications
+    :raises SPSDKError: When any of the devices is not found or specified more than once
+    """
+    interfaces = [
+        get_mboot_interface(**parse_interface_spec(spec), timeout=timeout) for spec in specs
+    ]
+    names = [str(interface) for interface in interfaces]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise SPSDKError(f"Devices specified more than once: {', '.join(sorted(duplicates))}")
+    return interfaces
@@ -9,7 +9,9 @@
 
 import abc
 import os
-from typing import Any, Dict, List, Optional
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 
 from typing_extensions import Self
 
@@ -46,11 +48,13 @@ class DevHsm(BaseClass):
         :param family: chip family
         :workspace: optional path to workspace
         """
-        self.database = DatabaseManager().db.devices.get(family).revisions.get("latest")
+        self.database = DatabaseManager().db.get_device(family).revisions.get("latest")
 
         self.workspace = workspace
         self.family = family
         self.devbuff_base = self.database.get_int(self.F_BUFFER, "address")
+        self.devbuff_size = self.database.get_int(self.F_BUFFER, "size", 4 * self.DEVBUFF_SIZE)
+        self.timing: Dict[str, float] = {}
 
         if self.workspace and not os.path.isdir(self.workspace):
             os.mkdir(self.workspace)
@@ -109,6 +113,28 @@ class DevHsm(BaseClass):
         filename = os.path.join(self.workspace, group or "", file_name)
         write_file(data, filename, mode="wb")
 
+    @contextmanager
+    def measure(self, step: str) -> Iterator[None]:
+        """Measure the duration of a step, durations of repeated steps are summed up.
+
+        :param step: Name of the step
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timing[step] = self.timing.get(step, 0.0) + time.perf_counter() - start
+
+    def get_timing_info(self) -> str:
+        """Get breakdown of the time spent in the measured steps.
+
+        :return: Text information about the duration of steps.
+        """
+        info = "Duration of steps:\n"
+        for step, duration in self.timing.items():
+            info += f"  {step}: {duration:.3f}s\n"
+        return info
+
     def get_devbuff_base_address(self, index: int) -> int:
         """Get devbuff base address."""
         assert index < 4 and index >= 0
@@ -10,8 +10,8 @@
 from struct import unpack_from
 from typing import Iterator, List, Optional
 
-from spsdk.crypto.hmac import hmac
-from spsdk.crypto.symmetric import Counter, aes_ctr_decrypt, aes_ctr_encrypt
+from spsdk.crypto.hmac import Hmac, hmac
+from spsdk.crypto.symmetric import Counter, CounterKeystream, aes_ctr_decrypt, aes_ctr_encrypt
 from spsdk.exceptions import SPSDKError
 from spsdk.sbfile.misc import SecBootBlckSize
 from spsdk.utils.abstract import BaseClass
@@ -28,6 +28,8 @@ class BootSectionV2(BaseClass):
     """Boot Section V2."""
 
     HMAC_SIZE = 32
+    # Size of commands data encrypted and authenticated at once
+    EXPORT_CHUNK_SIZE = 0x10000
 
     @property
     def uid(self) -> int:
@@ -142,39 +144,40 @@ class BootSectionV2(BaseClass):
         if not self._commands:
             raise SPSDKError("SB2 must contain commands")
         # Export commands
-        commands_data = b""
-        for cmd in self._commands:
-            cmd_data = cmd.export()
-            commands_data += cmd_data
+        commands_data = b"".join([cmd.export() for cmd in self._commands])
         if len(commands_data) % 16:
             commands_data += b"\x00" * (16 - (len(commands_data) % 16))
+        hmac_count = self.hmac_count
+        commands_offset = CmdHeader.SIZE + (hmac_count + 1) * self.HMAC_SIZE
+        result = bytearray(commands_offset + len(commands_data))
         # Encrypt header
-        self._header.data = self.hmac_count
+        self._header.data = hmac_count
         self._header.count = len(commands_data) // 16
-        encrypted_header = aes_ctr_encrypt(dek, self._header.export(), counter.value)
-        hmac_data = hmac(mac, encrypted_header)
-        counter.increment(1 + (self.hmac_count + 1) * 2)
-
-        # Encrypt commands
-        encrypted_commands = b""
-        for index in range(0, len(commands_data), 16):
-            encrypted_block = aes_ctr_encrypt(dek, commands_data[index : index + 16], counter.value)
-            encrypted_commands += encrypted_block
-            counter.increment()
-        # Calculate HMAC of commands
-        index = 0
-        hmac_count = self._header.data
+        keystream = CounterKeystream(dek, counter)
+        result[: CmdHeader.SIZE] = keystream.encrypt(self._header.export())
+        result[CmdHeader.SIZE : CmdHeader.SIZE + self.HMAC_SIZE] = hmac(
+            mac, result[: CmdHeader.SIZE]
+        )
+        counter.increment((hmac_count + 1) * 2)
+
+        # Encrypt commands and calculate HMAC of each part of commands in the same pass
+        commands_view = memoryview(commands_data)
         block_size = (self._header.count // hmac_count) * 16
-        while hmac_count > 0:
-            enc_block = (
-                encrypted_commands[index:]
-                if hmac_count == 1
-                else encrypted_commands[index : index + block_size]
-            )
-            hmac_data += hmac(mac, enc_block)
-            hmac_count -= 1
-            index += len(enc_block)
-        return encrypted_header + hmac_data + encrypted_commands
+        hmac_offset = CmdHeader.SIZE + self.HMAC_SIZE
+        offset = 0
+        for hmac_index in range(hmac_count):
+            end = len(commands_data) if hmac_index == hmac_count - 1 else offset + block_size
+            part_hmac = Hmac(mac)
+            for index in range(offset, end, self.EXPORT_CHUNK_SIZE):
+                chunk = commands_view[index : min(index + self.EXPORT_CHUNK_SIZE, end)]
+                encrypted_chunk = keystream.encrypt(chunk)
+                position = commands_offset + index
+                result[position : position + len(chunk)] = encrypted_chunk
+                part_hmac.update(encrypted_chunk)
+            result[hmac_offset : hmac_offset + self.HMAC_SIZE] = part_hmac.finalize()
+            hmac_offset += self.HMAC_SIZE
+            offset = end
+        return bytes(result)
 
     # pylint: disable=too-many-locals
     @classmethod
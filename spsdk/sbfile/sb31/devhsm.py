@@ -9,6 +9,7 @@
 
 import logging
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from spsdk.apps.utils.utils import format_raw_data
@@ -155,6 +156,7 @@ class DevHsmSB31(DevHsm):
 
     def create_sb(self) -> None:
         """Do device hsm process to create SB_KEK provisioning SB file."""
+        self.timing.clear()
         # 1: Initial target reset to ensure OEM_MASTER_SHARE works properly (not tainted by previous run)
         if self.initial_reset:
             self.info_print(" 1: Resetting the target device")
@@ -164,23 +166,27 @@ class DevHsmSB31(DevHsm):
 
         # 2: Call GEN_OEM_MASTER_SHARE to generate encOemShare.bin (ENC_OEM_SHARE will be later put in place of ISK)
         self.info_print(" 2: Generating OEM master share.")
-        oem_enc_share, _, _ = self.oem_generate_master_share(self.oem_share_input)
+        with self.measure("Generate OEM master share"):
+            oem_enc_share, _, _ = self.oem_generate_master_share(self.oem_share_input)
 
         # 3: Call hsm_gen_key to generate 48 bytes FW signing key
         self.info_print(" 3: Generating 48 bytes FW signing keys.")
-        cust_fw_auth_prk, cust_fw_auth_puk = self.generate_key(
-            TrustProvOemKeyType.MFWISK, "CUST_FW_AUTH"
-        )
+        with self.measure("Generate FW signing keys"):
+            cust_fw_auth_prk, cust_fw_auth_puk = self.generate_key(
+                TrustProvOemKeyType.MFWISK, "CUST_FW_AUTH"
+            )
 
         # 4: Call hsm_gen_key to generate 48 bytes FW encryption key
         self.info_print(" 4: Generating 48 bytes FW encryption keys.")
-        cust_fw_enc_prk, _ = self.generate_key(TrustProvOemKeyType.MFWENCK, "CUST_FW_ENC_SK")
+        with self.measure("Generate FW encryption keys"):
+            cust_fw_enc_prk, _ = self.generate_key(TrustProvOemKeyType.MFWENCK, "CUST_FW_ENC_SK")
 
         # 5: Call hsm_store_key to generate user defined CUST_MK_SK.
         # Will be stored into PFR using loadKeyBlob SB3 command.
         # Use NXP_CUST_KEK_EXT_SK in SB json
         self.info_print(" 5: Wrapping CUST_MK_SK key.")
-        self.wrapped_cust_mk_sk = self.wrap_key(self.cust_mk_sk)
+        with self.measure("Wrap CUST_MK_SK key"):
+            self.wrapped_cust_mk_sk = self.wrap_key(self.cust_mk_sk)
 
         # 6: Generate template sb3 fw, sb3ImageType=6
         self.info_print(" 6: Creating template un-encrypted SB3 header and data blobs.")
@@ -232,12 +238,22 @@ class DevHsmSB31(DevHsm):
 
         # 7: Call hsm_enc_blk to encrypt all the data chunks from step 6. Use FW encryption key from step 3.
         self.info_print(" 7: Encrypting SB3 data on device")
-        sb3_enc_data = self.encrypt_data_blocks(
-            cust_fw_enc_prk, sb3_header_exported, data_cmd_blocks
-        )
-        # 7.1: Add to encrypted data parts SHA256 hashes
-        self.info_print(" 7.1: Enriching encrypted SB3 data by mandatory hashes.")
-        enc_final_data = sb3_data.process_cmd_blocks_to_export(sb3_enc_data)
+        # 7.1: Add to encrypted data parts SHA256 hashes, while the device encrypts preceding blocks
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            processed_parts: List[Future] = []
+
+            def process_blocks(first_block_number: int, blocks: List[bytes]) -> None:
+                processed_parts.append(
+                    executor.submit(
+                        self._process_encrypted_blocks, sb3_data, first_block_number, blocks
+                    )
+                )
+
+            self.encrypt_data_blocks(
+                cust_fw_enc_prk, sb3_header_exported, data_cmd_blocks, process_blocks
+            )
+            self.info_print(" 7.1: Enriching encrypted SB3 data by mandatory hashes.")
+            enc_final_data = b"".join(part.result() for part in reversed(processed_parts))
         self.store_temp_res("Final_data.bin", enc_final_data, "to_merge")
 
         # 7.2: Create dummy certification part of SB3 manifest
@@ -274,7 +290,8 @@ class DevHsmSB31(DevHsm):
 
         # 8: Get sign of SB3 file manifest
         self.info_print(" 8: Creating SB3 manifest signature on device.")
-        manifest_signature = self.sign_data_blob(manifest_to_sign, cust_fw_auth_prk)
+        with self.measure("Sign SB3 manifest"):
+            manifest_signature = self.sign_data_blob(manifest_to_sign, cust_fw_auth_prk)
         logger.debug(
             f" 8: The SB3 manifest signature data:\n{format_raw_data(manifest_signature, use_hexdump=True)}."
         )
@@ -296,6 +313,20 @@ class DevHsmSB31(DevHsm):
             self.mboot.reset(timeout=self.RESET_TIMEOUT, reopen=False)
         else:
             self.info_print("10: Final target reset disabled")
+        logger.info(self.get_timing_info())
+
+    def _process_encrypted_blocks(
+        self, sb3_data: SecureBinary31Commands, first_block_number: int, blocks: List[bytes]
+    ) -> bytes:
+        """Add hashes to encrypted blocks, the blocks must be processed from the last ones.
+
+        :param sb3_data: SB3 commands, the hash chain is kept in there.
+        :param first_block_number: Number of the first block.
+        :param blocks: Encrypted blocks.
+        :return: Processed blocks.
+        """
+        with self.measure("Hash chain of SB3 data blocks"):
+            return sb3_data.process_cmd_blocks_backwards(blocks, first_block_number)
 
     def export(self) -> bytes:
         """Get the Final SB file.
@@ -528,65 +559,117 @@ class DevHsmSB31(DevHsm):
 
         return cfg_commands
 
+    def get_data_blocks_batch_size(self) -> int:
+        """Get number of data blocks which fit into the device buffer behind the key and header.
+
+        :return: Number of data blocks encrypted in one batch.
+        """
+        data_size = self.devbuff_size - 2 * self.DEVBUFF_SIZE
+        return max(1, data_size // self.DEVBUFF_DATA_BLOCK_SIZE)
+
     def encrypt_data_blocks(
-        self, cust_fw_enc_key: bytes, sb3_header: bytes, data_cmd_blocks: List[bytes]
+        self,
+        cust_fw_enc_key: bytes,
+        sb3_header: bytes,
+        data_cmd_blocks: List[bytes],
+        encrypted_callback: Optional[Callable[[int, List[bytes]], None]] = None,
     ) -> List[bytes]:
         """Encrypt all data blocks on device.
 
+        The blocks are written into the device buffer and read back in batches, as many blocks
+        as fit into the buffer. The batches are encrypted from the last one, so the hash chain
+        of the encrypted blocks can be computed while the device encrypts the preceding batch.
+
         :param cust_fw_enc_key: Firmware encryption key.
         :param sb3_header: Un Encrypted SB3 file header.
         :param data_cmd_blocks: List of un-encrypted SB3 file command blocks.
+        :param encrypted_callback: Called with number of the first block and encrypted blocks
+            of each batch, defaults to None
         :raises SPSDKError: In case of any vulnerability.
         :return: List of encrypted command blocks on device.
         """
-        if not self.mboot.write_memory(self.devbuff_base, cust_fw_enc_key):
-            raise SPSDKError(
-                f"Cannot write customer fw encryption key into device. Error: {self.mboot.status_string}"
-            )
-        self.store_temp_res("SB3_header.bin", sb3_header, "to_encrypt")
-        if not self.mboot.write_memory(self.get_devbuff_base_address(1), sb3_header):
-            raise SPSDKError(
-                f"Cannot write SB3 header into device. Error: {self.mboot.status_string}"
-            )
-
-        encrypted_blocks = []
-        for data_cmd_block_ix, data_cmd_block in enumerate(data_cmd_blocks, start=1):
-            self.store_temp_res(f"SB3_block_{data_cmd_block_ix}.bin", data_cmd_block, "to_encrypt")
-            if not self.mboot.write_memory(self.get_devbuff_base_address(2), data_cmd_block):
+        with self.measure("Write encryption key and SB3 header"):
+            if not self.mboot.write_memory(self.devbuff_base, cust_fw_enc_key):
                 raise SPSDKError(
-                    f"Cannot write SB3 data block{data_cmd_block_ix} into device. "
+                    "Cannot write customer fw encryption key into device. "
                     f"Error: {self.mboot.status_string}"
                 )
-            key_id = CmdLoadKeyBlob.get_key_id(
-                self.family, CmdLoadKeyBlob.KeyTypes.NXP_CUST_KEK_INT_SK
-            )
-            if not self.mboot.tp_hsm_enc_blk(
-                self.devbuff_base,
-                len(cust_fw_enc_key),
-                key_id,
-                self.get_devbuff_base_address(1),
-                len(sb3_header),
-                data_cmd_block_ix,
-                self.get_devbuff_base_address(2),
-                self.DEVBUFF_DATA_BLOCK_SIZE,
-            ):
+            self.store_temp_res("SB3_header.bin", sb3_header, "to_encrypt")
+            if not self.mboot.write_memory(self.get_devbuff_base_address(1), sb3_header):
                 raise SPSDKError(
-                    f"Cannot run SB3 data block_{data_cmd_block_ix} HSM Encryption in device. "
-                    f"Error: {self.mboot.status_string}"
+                    f"Cannot write SB3 header into device. Error: {self.mboot.status_string}"
                 )
 
-            encrypted_block = self.mboot.read_memory(
-                self.get_devbuff_base_address(2),
-                self.DEVBUFF_DATA_BLOCK_SIZE,
+        batch_size = self.get_data_blocks_batch_size()
+        encrypted_blocks = [bytes()] * len(data_cmd_blocks)
+        for first in reversed(range(0, len(data_cmd_blocks), batch_size)):
+            batch = self._encrypt_data_batch(
+                cust_fw_enc_key, sb3_header, first + 1, data_cmd_blocks[first : first + batch_size]
             )
-            if not encrypted_block:
+            encrypted_blocks[first : first + len(batch)] = batch
+            if encrypted_callback:
+                encrypted_callback(first + 1, batch)
+
+        return encrypted_blocks
+
+    def _encrypt_data_batch(
+        self,
+        cust_fw_enc_key: bytes,
+        sb3_header: bytes,
+        first_block_number: int,
+        data_cmd_blocks: List[bytes],
+    ) -> List[bytes]:
+        """Encrypt batch of data blocks on device, the blocks are written and read at once.
+
+        :param cust_fw_enc_key: Firmware encryption key.
+        :param sb3_header: Un Encrypted SB3 file header.
+        :param first_block_number: Number of the first block in batch.
+        :param data_cmd_blocks: List of un-encrypted SB3 file command blocks.
+        :raises SPSDKError: In case of any vulnerability.
+        :return: List of encrypted command blocks.
+        """
+        block_size = self.DEVBUFF_DATA_BLOCK_SIZE
+        data_address = self.get_devbuff_base_address(2)
+        last_block_number = first_block_number + len(data_cmd_blocks) - 1
+        for data_cmd_block_ix, data_cmd_block in enumerate(data_cmd_blocks, first_block_number):
+            self.store_temp_res(f"SB3_block_{data_cmd_block_ix}.bin", data_cmd_block, "to_encrypt")
+        with self.measure("Write SB3 data blocks"):
+            if not self.mboot.write_memory(data_address, b"".join(data_cmd_blocks)):
                 raise SPSDKError(
-                    f"Cannot read SB3 data block_{data_cmd_block_ix} from device. "
-                    f"Error: {self.mboot.status_string}"
+                    f"Cannot write SB3 data blocks {first_block_number}-{last_block_number} "
+                    f"into device. Error: {self.mboot.status_string}"
                 )
 
-            self.store_temp_res(f"SB3_block_{data_cmd_block_ix}.bin", encrypted_block, "encrypted")
+        key_id = CmdLoadKeyBlob.get_key_id(self.family, CmdLoadKeyBlob.KeyTypes.NXP_CUST_KEK_INT_SK)
+        with self.measure("Encrypt SB3 data blocks on device"):
+            for index in range(len(data_cmd_blocks)):
+                if not self.mboot.tp_hsm_enc_blk(
+                    self.devbuff_base,
+                    len(cust_fw_enc_key),
+                    key_id,
+                    self.get_devbuff_base_address(1),
+                    len(sb3_header),
+                    first_block_number + index,
+                    data_address + index * block_size,
+                    block_size,
+                ):
+                    raise SPSDKError(
+                        f"Cannot run SB3 data block_{first_block_number + index} HSM Encryption "
+                        f"in device. Error: {self.mboot.status_string}"
+                    )
 
-            encrypted_blocks.append(encrypted_block)
+        with self.measure("Read SB3 data blocks"):
+            encrypted_data = self.mboot.read_memory(data_address, len(data_cmd_blocks) * block_size)
+            if not encrypted_data or len(encrypted_data) != len(data_cmd_blocks) * block_size:
+                raise SPSDKError(
+                    f"Cannot read SB3 data blocks {first_block_number}-{last_block_number} "
+                    f"from device. Error: {self.mboot.status_string}"
+                )
 
+        encrypted_blocks = [
+            encrypted_data[offset : offset + block_size]
+            for offset in range(0, len(encrypted_data), block_size)
+        ]
+        for encrypted_block_ix, encrypted_block in enumerate(encrypted_blocks, first_block_number):
+            self.store_temp_res(f"SB3_block_{encrypted_block_ix}.bin", encrypted_block, "encrypted")
         return encrypted_blocks
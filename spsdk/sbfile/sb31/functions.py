@@ -6,6 +6,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """File including helping functions."""
 import functools
+from typing import Dict
 
 from spsdk.crypto.cmac import cmac
 from spsdk.exceptions import SPSDKError
@@ -36,14 +37,22 @@ class KeyDerivator:
         self.kdk_access_rights = kdk_access_rights
         self.timestamp = timestamp
         self.kdk = self._derive_kdk()
+        # block keys derived from this KDK, released together with the derivator
+        self._block_keys: Dict[int, bytes] = {}
 
     def _derive_kdk(self) -> bytes:
         """Derive the KeyDerivationKey from PCK and timestamp."""
         return derive_kdk(self.pck, self.timestamp, self.key_length, self.kdk_access_rights)
 
     def get_block_key(self, block_number: int) -> bytes:
-        """Derive key for particular block."""
-        return derive_block_key(self.kdk, block_number, self.key_length, self.kdk_access_rights)
+        """Derive key for particular block, the keys are memoized per block number."""
+        block_key = self._block_keys.get(block_number)
+        if block_key is None:
+            block_key = derive_block_key(
+                self.kdk, block_number, self.key_length, self.kdk_access_rights
+            )
+            self._block_keys[block_number] = block_key
+        return block_key
 
 
 def derive_block_key(
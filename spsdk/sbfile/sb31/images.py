@@ -6,9 +6,12 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Module used for generation SecureBinary V3.1."""
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from struct import calcsize, pack, unpack_from
-from typing import Any, Dict, List, Optional
+from io import BytesIO
+from struct import calcsize, pack, pack_into, unpack_from
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
 
 from typing_extensions import Self
 
@@ -225,6 +228,10 @@ class SecureBinary31Commands(BaseClass):
     """Blob containing SB3.1 commands."""
 
     DATA_CHUNK_LENGTH = 256
+    # Number of blocks encrypted by one task of the worker pool
+    ENCRYPTION_BATCH_SIZE = 256
+    # Number of blocks kept in memory by the streaming export
+    STREAM_BUFFER_BLOCKS = 0x1000
 
     def __init__(
         self,
@@ -305,53 +312,235 @@ class SecureBinary31Commands(BaseClass):
 
     def get_cmd_blocks_to_export(self) -> List[bytes]:
         """Export commands as bytes."""
-        commands_bytes = b"".join([command.export() for command in self.commands])
-        section_header = CmdSectionHeader(length=len(commands_bytes))
-        total = section_header.export() + commands_bytes
+        data_blocks = list(self._iter_cmd_blocks())
+        return [bytes(block) for block in data_blocks]
 
-        data_blocks = [
-            total[i : i + self.DATA_CHUNK_LENGTH]
-            for i in range(0, len(total), self.DATA_CHUNK_LENGTH)
-        ]
-        data_blocks[-1] = align_block(data_blocks[-1], alignment=self.DATA_CHUNK_LENGTH)
+    def _iter_cmd_blocks(self) -> Iterator[bytes]:
+        """Slice the exported commands into data blocks.
 
-        return data_blocks
+        The commands are exported one by one and sliced without joining them. The first
+        block starts with the section header, which is known when all commands are exported.
+        The first block is yielded as a bytearray, its section header is filled in place when
+        the generator is exhausted.
 
-    def process_cmd_blocks_to_export(self, data_blocks: List[bytes]) -> bytes:
-        """Process given data blocks for export."""
+        :return: Iterator over data blocks
+        """
+        first_block = bytearray()
+        pending = bytearray(CmdSectionHeader.SIZE)
+        commands_length = 0
+        for command in self.commands:
+            command_data = memoryview(command.export())
+            commands_length += len(command_data)
+            offset = min(len(command_data), self.DATA_CHUNK_LENGTH - len(pending))
+            pending += command_data[:offset]
+            if len(pending) == self.DATA_CHUNK_LENGTH:
+                if first_block:
+                    yield bytes(pending)
+                else:
+                    first_block += pending
+                    yield first_block
+                pending.clear()
+                while len(command_data) - offset >= self.DATA_CHUNK_LENGTH:
+                    yield bytes(command_data[offset : offset + self.DATA_CHUNK_LENGTH])
+                    offset += self.DATA_CHUNK_LENGTH
+                pending += command_data[offset:]
+        if pending:
+            last_block = align_block(bytes(pending), alignment=self.DATA_CHUNK_LENGTH)
+            if first_block:
+                yield last_block
+            else:
+                first_block += last_block
+                yield first_block
+        first_block[: CmdSectionHeader.SIZE] = CmdSectionHeader(length=commands_length).export()
+
+    def process_cmd_blocks_to_export(
+        self, data_blocks: List[bytes], max_workers: Optional[int] = None
+    ) -> bytes:
+        """Process given data blocks for export.
+
+        The blocks are encrypted independently of each other, so they are encrypted in parallel.
+        Then the hash chain is computed from the last block backwards, each block carries
+        the hash of the following block.
+
+        :param data_blocks: Blocks of commands data
+        :param max_workers: Number of threads, 1 to encrypt sequentially, by default CPU count based
+        :return: Processed blocks
+        """
         self.block_count = len(data_blocks)
-
-        processed_blocks = [
-            self._process_block(block_number, block_data)
-            for block_number, block_data in reversed(list(enumerate(data_blocks, start=1)))
-        ]
-        final_data = b"".join(reversed(processed_blocks))
-        return final_data
+        self.final_hash = bytes(get_hash_length(self.hash_type))
+        encrypted_blocks = self._encrypt_blocks(data_blocks, max_workers)
+        return self._chain_blocks(encrypted_blocks)
 
     def export(self) -> bytes:
         """Export commands as bytes."""
         data_blocks = self.get_cmd_blocks_to_export()
         return self.process_cmd_blocks_to_export(data_blocks)
 
-    def _process_block(self, block_number: int, block_data: bytes) -> bytes:
-        """Process single block."""
-        if self.is_encrypted:
-            if not self.key_derivator:
-                raise SPSDKError("No key derivator")
-            block_key = self.key_derivator.get_block_key(block_number)
-            encrypted_block = aes_cbc_encrypt(block_key, block_data)
+    def process_cmd_blocks_backwards(self, blocks: List[bytes], first_block_number: int) -> bytes:
+        """Process part of the encrypted blocks for export.
+
+        The parts are processed from the last one, the hash chain continues from the final
+        hash of the previously processed part. It allows to process the blocks as soon as
+        they are encrypted, e.g. on the device.
+
+        :param blocks: Consecutive encrypted blocks
+        :param first_block_number: Number of the first block, the blocks are numbered from 1
+        :return: Processed blocks
+        """
+        self.block_count = max(self.block_count, first_block_number + len(blocks) - 1)
+        records = self._join_blocks(blocks)
+        self._chain_records(records, first_block_number)
+        return bytes(records)
+
+    def export_to_stream(self, stream: BinaryIO, max_workers: Optional[int] = None) -> int:
+        """Export commands into a stream block by block, without keeping all blocks in memory.
+
+        The commands are exported one by one and the encrypted blocks are written forward
+        with empty headers. Then the hash chain is computed backwards over the blocks read
+        from the stream and the headers are filled in.
+
+        :param stream: Seekable and readable binary stream, written from its current position
+        :param max_workers: Number of threads, 1 to encrypt sequentially, by default CPU count based
+        :return: Number of written bytes
+        :raises SPSDKError: The blocks can't be read back from the stream
+        """
+        start = stream.tell()
+        record_length = self._block_header_length + self.DATA_CHUNK_LENGTH
+        self.block_count = 0
+        self.final_hash = bytes(get_hash_length(self.hash_type))
+        first_block = b""
+        blocks: List[bytes] = []
+
+        def flush() -> None:
+            nonlocal first_block
+            first_number = self.block_count + 1
+            if first_number == 1:
+                first_block = blocks.pop(0)
+                first_number = 2
+            encrypted = self._encrypt_blocks(blocks, max_workers, first_block_number=first_number)
+            stream.seek(start + (first_number - 1) * record_length)
+            for block in encrypted:
+                stream.write(bytes(self._block_header_length))
+                stream.write(block)
+            self.block_count = first_number - 1 + len(blocks)
+            blocks.clear()
+
+        for block in self._iter_cmd_blocks():
+            blocks.append(block)
+            if len(blocks) >= self.STREAM_BUFFER_BLOCKS:
+                flush()
+        flush()
+
+        # the section header of the first block is filled in when all blocks are sliced
+        stream.seek(start + self._block_header_length)
+        stream.write(self._encrypt_blocks([bytes(first_block)], max_workers=1)[0])
+
+        end = start + self.block_count * record_length
+        position = end
+        window = max(1, self.STREAM_BUFFER_BLOCKS)
+        while position > start:
+            length = min(window * record_length, position - start)
+            position -= length
+            stream.seek(position)
+            records = bytearray(stream.read(length))
+            if len(records) != length:
+                raise SPSDKError("Unable to read back the exported blocks from the stream")
+            self._chain_records(records, (position - start) // record_length + 1)
+            stream.seek(position)
+            stream.write(records)
+        stream.seek(end)
+        return end - start
+
+    @property
+    def _block_header_format(self) -> str:
+        """Format of the block header, the block number and hash of the following block."""
+        return f"<L{get_hash_length(self.hash_type)}s"
+
+    @property
+    def _block_header_length(self) -> int:
+        """Length of the block header."""
+        return calcsize(self._block_header_format)
+
+    def _encrypt_blocks(
+        self, data_blocks: List[bytes], max_workers: Optional[int], first_block_number: int = 1
+    ) -> List[bytes]:
+        """Encrypt data blocks, each block with its own derived key.
+
+        :param data_blocks: Blocks of commands data
+        :param max_workers: Number of threads, 1 to encrypt sequentially
+        :param first_block_number: Number of the first block, the blocks are numbered from 1
+        :return: Encrypted blocks
+        :raises SPSDKError: No key derivator
+        """
+        if not self.is_encrypted:
+            return data_blocks
+        key_derivator = self.key_derivator
+        if not key_derivator:
+            raise SPSDKError("No key derivator")
+
+        def encrypt(first: int) -> List[bytes]:
+            return [
+                aes_cbc_encrypt(key_derivator.get_block_key(block_number), block_data)
+                for block_number, block_data in enumerate(
+                    data_blocks[first : first + self.ENCRYPTION_BATCH_SIZE],
+                    start=first_block_number + first,
+                )
+            ]
+
+        batches = range(0, len(data_blocks), self.ENCRYPTION_BATCH_SIZE)
+        if max_workers == 1 or len(batches) < 2:
+            encrypted = [encrypt(first) for first in batches]
         else:
-            encrypted_block = block_data
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                encrypted = list(executor.map(encrypt, batches))
+        return [block for batch in encrypted for block in batch]
 
-        full_block = pack(
-            f"<L{len(self.final_hash)}s{len(encrypted_block)}s",
-            block_number,
-            self.final_hash,
-            encrypted_block,
-        )
-        block_hash = get_hash(full_block, self.hash_type)
-        self.final_hash = block_hash
-        return full_block
+    def _chain_blocks(self, blocks: List[bytes]) -> bytes:
+        """Join the blocks, prepend block number and hash of the following block to each block.
+
+        :param blocks: Encrypted blocks
+        :return: Processed blocks
+        """
+        records = self._join_blocks(blocks)
+        self._chain_records(records, 1)
+        return bytes(records)
+
+    def _join_blocks(self, blocks: List[bytes]) -> bytearray:
+        """Join the blocks, leave space for the header before each block.
+
+        :param blocks: Encrypted blocks
+        :return: Blocks with empty headers
+        :raises SPSDKError: Invalid length of blocks
+        """
+        if any(len(block) != self.DATA_CHUNK_LENGTH for block in blocks):
+            raise SPSDKError(f"Invalid length of command blocks, must be {self.DATA_CHUNK_LENGTH}")
+        header = bytes(self._block_header_length)
+        records = bytearray()
+        for block in blocks:
+            records += header
+            records += block
+        return records
+
+    def _chain_records(self, records: bytearray, first_block_number: int) -> None:
+        """Fill in the headers of consecutive blocks, starting with the last one.
+
+        The hash chain continues from the current final hash, which is updated.
+
+        :param records: Blocks with space for the headers, all blocks have the same length
+        :param first_block_number: Number of the first block in records
+        """
+        record_length = self._block_header_length + self.DATA_CHUNK_LENGTH
+        view = memoryview(records)
+        for index in range(len(records) // record_length - 1, -1, -1):
+            offset = index * record_length
+            pack_into(
+                self._block_header_format,
+                records,
+                offset,
+                first_block_number + index,
+                self.final_hash,
+            )
+            self.final_hash = get_hash(view[offset : offset + record_length], self.hash_type)
 
     def __repr__(self) -> str:
         return f"SB3.1 Commands[#{len(self.commands)}]"
@@ -607,32 +796,97 @@ class SecureBinary31(BaseClass):
     def export(self, cert_block: Optional[bytes] = None) -> bytes:
         """Generate binary output of SB3.1 file.
 
+        :param cert_block: Exported certification block, by default exported from the cert_block
         :return: Content of SB3.1 file in bytes.
         """
-        self.validate()
+        stream = BytesIO()
+        self.export_to_stream(stream, cert_block=cert_block)
+        return stream.getvalue()
 
-        if cert_block:
-            cert_block_data = cert_block
-        else:
-            cert_block_data = self.cert_block.export()
-        sb3_commands_data = self.sb_commands.export()
+    def export_to_stream(
+        self,
+        stream: BinaryIO,
+        cert_block: Optional[bytes] = None,
+        max_workers: Optional[int] = None,
+    ) -> int:
+        """Write SB3.1 file into a stream, the commands blocks are processed block by block.
+
+        The commands blocks are written first, the header and signature are written when
+        the hash of the first block is known. Streams which are not seekable or readable
+        (e.g. pipes) are spilled into a temporary file first.
+
+        :param stream: Binary stream, written from its current position
+        :param cert_block: Exported certification block, by default exported from the cert_block
+        :param max_workers: Number of threads encrypting the blocks, 1 to encrypt sequentially
+        :return: Number of written bytes
+        """
+        if not (stream.seekable() and stream.readable()):
+            with tempfile.TemporaryFile() as spill:
+                length = self.export_to_stream(
+                    spill, cert_block=cert_block, max_workers=max_workers
+                )
+                spill.seek(0)
+                for chunk in iter(lambda: spill.read(0x100000), b""):
+                    stream.write(chunk)
+            return length
+
+        self.validate()
+        cert_block_data = cert_block or self.cert_block.export()
+        start = stream.tell()
+        signature_length = self.signature_provider.signature_length
+        commands_offset = (
+            SecureBinary31Header.HEADER_SIZE
+            + get_hash_length(self.sb_header.hash_type)
+            + len(cert_block_data)
+            + signature_length
+        )
+        stream.seek(start + commands_offset)
+        commands_length = self.sb_commands.export_to_stream(stream, max_workers=max_workers)
 
-        final_data = bytes()
         # HEADER OF SB 3.1 FILE
         self.sb_header.update(self.sb_commands, self.cert_block)
-        final_data += self.sb_header.export()
-
+        data_to_sign = self.sb_header.export()
         # HASH OF PREVIOUS BLOCK
-        final_data += self.sb_commands.final_hash
-        final_data += cert_block_data
-
+        data_to_sign += self.sb_commands.final_hash
+        data_to_sign += cert_block_data
         # SIGNATURE
-        final_data += self.signature_provider.get_signature(final_data)
+        signature = self.signature_provider.get_signature(data_to_sign)
+        if len(signature) != signature_length:
+            # the signature provider warns about the length, the commands must follow the signature
+            shift = len(signature) - signature_length
+            logger.debug(f"Moving the commands blocks by {shift} bytes")
+            self._move_stream_data(
+                stream, start + commands_offset, start + commands_offset + shift, commands_length
+            )
+            commands_offset += shift
+            if shift < 0:
+                stream.truncate(start + commands_offset + commands_length)
+        stream.seek(start)
+        stream.write(data_to_sign)
+        stream.write(signature)
+        # COMMANDS BLOBS DATA are already written
+        stream.seek(start + commands_offset + commands_length)
+        return commands_offset + commands_length
 
-        # COMMANDS BLOBS DATA
-        final_data += sb3_commands_data
+    @staticmethod
+    def _move_stream_data(
+        stream: BinaryIO, source: int, destination: int, length: int, chunk_size: int = 0x100000
+    ) -> None:
+        """Move data within the stream, the source and destination regions may overlap.
 
-        return final_data
+        :param stream: Seekable and readable binary stream
+        :param source: Offset of the data
+        :param destination: New offset of the data
+        :param length: Length of the data
+        :param chunk_size: Size of the chunks read at once
+        """
+        offsets = range(0, length, chunk_size)
+        # moving forward, the chunks are copied from the end to not overwrite the unread data
+        for offset in reversed(offsets) if destination > source else offsets:
+            stream.seek(source + offset)
+            chunk = stream.read(min(chunk_size, length - offset))
+            stream.seek(destination + offset)
+            stream.write(chunk)
 
     def __repr__(self) -> str:
         return f"SB3.1, TimeStamp: {self.timestamp}"
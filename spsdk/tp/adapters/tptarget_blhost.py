@@ -13,6 +13,7 @@ from spsdk.mboot.exceptions import McuBootError, StatusCode
 from spsdk.mboot.interfaces.uart import MbootUARTInterface
 from spsdk.mboot.interfaces.usb import MbootUSBInterface
 from spsdk.mboot.mcuboot import McuBoot
+from spsdk.mboot.properties import PropertyCache
 from spsdk.mboot.protocol.base import MbootProtocolBase
 from spsdk.tp.exceptions import SPSDKTpTargetError
 from spsdk.tp.tp_intf import TpIntfDescription, TpTargetInterface
@@ -161,7 +162,7 @@ class TpTargetBlHost(TpTargetInterface):
         super().__init__(descriptor=descriptor)
         if not descriptor.interface:
             raise SPSDKTpTargetError("Device is not defined.")
-        self.mboot = McuBoot(descriptor.interface)
+        self.mboot = McuBoot(descriptor.interface, property_cache=PropertyCache())
 
         self.buffer_address = (
             value_to_int(self.descriptor.settings.get("buffer_address", 0))
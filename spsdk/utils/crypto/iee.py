@@ -8,25 +8,28 @@
 """The module provides support for IEE for RTxxxx devices."""
 
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from struct import pack
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from crcmod.predefined import mkPredefinedCrcFun
 
 from spsdk import version as spsdk_version
 from spsdk.apps.utils.utils import filepath_from_config
 from spsdk.crypto.rng import random_bytes
-from spsdk.crypto.symmetric import Counter, aes_ctr_encrypt, aes_xts_encrypt
+from spsdk.crypto.symmetric import Counter, CounterKeystream, aes_xts_encrypt
 from spsdk.exceptions import SPSDKError, SPSDKValueError
 from spsdk.utils.database import DatabaseManager, get_db, get_families, get_schema_file
 from spsdk.utils.images import BinaryImage
 from spsdk.utils.misc import (
     Endianness,
+    align,
     align_block,
+    find_first,
     load_hex_string,
     reverse_bytes_in_longs,
-    split_data,
     value_to_bytes,
     value_to_int,
 )
@@ -177,6 +180,9 @@ class IeeKeyBlob:
 
     _ENCRYPTION_BLOCK_SIZE = 0x10
 
+    # Size of data encrypted by one thread, multiple of XTS sector size
+    _ENCRYPTION_CHUNK_SIZE = 0x100000
+
     _START_ADDR_MASK = 0x400 - 1
     # Region addresses are modulo 1024
 
@@ -274,63 +280,96 @@ class IeeKeyBlob:
         """
         return self.contains_addr(image_start) and self.contains_addr(image_end)
 
-    def encrypt_image_xts(self, base_address: int, data: bytes) -> bytes:
+    def _encrypt_chunks(
+        self,
+        encrypt_chunk: Callable[[int, memoryview], bytes],
+        base_address: int,
+        data: bytes,
+        max_workers: Optional[int],
+    ) -> bytes:
+        """Encrypt independent chunks of data, in parallel if there are more chunks.
+
+        :param encrypt_chunk: Function encrypting chunk of data at specified address
+        :param base_address: of the data in target memory
+        :param data: to be encrypted
+        :param max_workers: Number of threads, 1 to encrypt sequentially
+        :return: encrypted data
+        """
+        result = bytearray(len(data))
+        view = memoryview(data)
+
+        def encrypt(offset: int) -> None:
+            chunk = view[offset : offset + self._ENCRYPTION_CHUNK_SIZE]
+            result[offset : offset + len(chunk)] = encrypt_chunk(base_address + offset, chunk)
+
+        offsets = range(0, len(data), self._ENCRYPTION_CHUNK_SIZE)
+        if max_workers == 1 or len(offsets) < 2:
+            for offset in offsets:
+                encrypt(offset)
+        else:
+            # the chunks are written into separate parts of the preallocated result
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(encrypt, offsets))
+        return bytes(result)
+
+    def encrypt_image_xts(
+        self, base_address: int, data: bytes, max_workers: Optional[int] = None
+    ) -> bytes:
         """Encrypt specified data using AES-XTS.
 
+        Each sector is encrypted with its own tweak, so the sectors are encrypted in parallel.
+
         :param base_address: of the data in target memory; must be >= self.start_addr
         :param data: to be encrypted (e.g. plain image); base_address + len(data) must be <= self.end_addr
+        :param max_workers: Number of threads, 1 to encrypt sequentially, by default CPU count based
         :return: encrypted data
         """
-        encrypted_data = bytes()
-        current_start = base_address
-        key1 = reverse_bytes_in_longs(self.key1)
-        key2 = reverse_bytes_in_longs(self.key2)
-
-        for block in split_data(bytearray(data), self._IEE_ENCR_BLOCK_SIZE_XTS):
-            tweak = self.calculate_tweak(current_start)
-
-            encrypted_block = aes_xts_encrypt(
-                key1 + key2,
-                block,
-                tweak,
+        key = reverse_bytes_in_longs(self.key1) + reverse_bytes_in_longs(self.key2)
+
+        def encrypt_chunk(address: int, chunk: memoryview) -> bytes:
+            sector_size = self._IEE_ENCR_BLOCK_SIZE_XTS
+            return b"".join(
+                aes_xts_encrypt(
+                    key,
+                    chunk[offset : offset + sector_size],
+                    self.calculate_tweak(address + offset),
+                )
+                for offset in range(0, len(chunk), sector_size)
             )
-            encrypted_data += encrypted_block
-            current_start += len(block)
 
-        return encrypted_data
+        return self._encrypt_chunks(encrypt_chunk, base_address, data, max_workers)
 
-    def encrypt_image_ctr(self, base_address: int, data: bytes) -> bytes:
+    def encrypt_image_ctr(
+        self, base_address: int, data: bytes, max_workers: Optional[int] = None
+    ) -> bytes:
         """Encrypt specified data using AES-CTR.
 
+        The counter is derived from address of each block, so the chunks are encrypted in parallel.
+
         :param base_address: of the data in target memory; must be >= self.start_addr
         :param data: to be encrypted (e.g. plain image); base_address + len(data) must be <= self.end_addr
+        :param max_workers: Number of threads, 1 to encrypt sequentially, by default CPU count based
         :return: encrypted data
         """
-        encrypted_data = bytes()
         key = reverse_bytes_in_longs(self.key1)
         nonce = reverse_bytes_in_longs(self.key2)
 
-        counter = Counter(nonce, ctr_value=base_address >> 4, ctr_byteorder_encoding=Endianness.BIG)
-
-        for block in split_data(bytearray(data), self._ENCRYPTION_BLOCK_SIZE):
-            encrypted_block = aes_ctr_encrypt(
-                key,
-                block,
-                counter.value,
-            )
-            encrypted_data += encrypted_block
-            counter.increment(self._ENCRYPTION_BLOCK_SIZE >> 4)
+        def encrypt_chunk(address: int, chunk: memoryview) -> bytes:
+            counter = Counter(nonce, ctr_value=address >> 4, ctr_byteorder_encoding=Endianness.BIG)
+            return CounterKeystream(key, counter).encrypt(chunk)
 
-        return encrypted_data
+        return self._encrypt_chunks(encrypt_chunk, base_address, data, max_workers)
 
-    def encrypt_image(self, base_address: int, data: bytes) -> bytes:
+    def encrypt_image(
+        self, base_address: int, data: bytes, max_workers: Optional[int] = None
+    ) -> bytes:
         """Encrypt specified data.
 
         :param base_address: of the data in target memory; must be >= self.start_addr
         :param data: to be encrypted (e.g. plain image); base_address + len(data) must be <= self.end_addr
+        :param max_workers: Number of threads, 1 to encrypt sequentially, by default CPU count based
         :return: encrypted data
         :raises SPSDKError: If start address is not valid
-        :raises NotImplementedError: AES-CTR is not implemented yet
         """
         if base_address % 16 != 0:
             raise SPSDKError("Invalid start address")  # Start address has to be 16 byte aligned
@@ -344,8 +383,48 @@ class IeeKeyBlob:
             )
 
         if self.attributes.ctr_mode:
-            return self.encrypt_image_ctr(base_address, data)
-        return self.encrypt_image_xts(base_address, data)
+            return self.encrypt_image_ctr(base_address, data, max_workers)
+        return self.encrypt_image_xts(base_address, data, max_workers)
+
+    def encrypt_file(
+        self,
+        base_address: int,
+        input_path: str,
+        output_path: str,
+        max_workers: Optional[int] = None,
+    ) -> int:
+        """Encrypt data from input file into output file without loading the whole file.
+
+        The file is processed in windows, the chunks of each window are encrypted in parallel.
+
+        :param base_address: of the data in target memory; must be >= self.start_addr
+        :param input_path: Path to file with data to be encrypted
+        :param output_path: Path to output file with encrypted data
+        :param max_workers: Number of threads, 1 to encrypt sequentially, by default CPU count based
+        :return: Number of bytes written into output file
+        :raises SPSDKError: If start address is not valid
+        """
+        if base_address % 16 != 0:
+            raise SPSDKError("Invalid start address")  # Start address has to be 16 byte aligned
+        data_len = align(os.path.getsize(input_path), self._ENCRYPTION_BLOCK_SIZE)
+        if not self.matches_range(base_address, base_address + data_len - 1):
+            logger.warning(
+                f"Image address range is not within key blob: {hex(self.start_addr)}-{hex(self.end_addr)}."
+            )
+        window_size = self._ENCRYPTION_CHUNK_SIZE * (max_workers or os.cpu_count() or 1)
+        address = base_address
+        with open(input_path, "rb") as input_file, open(output_path, "wb") as output_file:
+            while True:
+                window = input_file.read(window_size)
+                if not window:
+                    break
+                window = align_block(window, self._ENCRYPTION_BLOCK_SIZE)
+                if self.attributes.ctr_mode:
+                    output_file.write(self.encrypt_image_ctr(address, window, max_workers))
+                else:
+                    output_file.write(self.encrypt_image_xts(address, window, max_workers))
+                address += len(window)
+        return address - base_address
 
     @staticmethod
     def calculate_tweak(address: int) -> bytes:
@@ -386,26 +465,41 @@ class Iee:
         """
         self._key_blobs.append(key_blob)
 
-    def encrypt_image(self, image: bytes, base_addr: int) -> bytes:
+    def encrypt_image(
+        self, image: bytes, base_addr: int, max_workers: Optional[int] = None
+    ) -> bytes:
         """Encrypt image with all available keyblobs.
 
         :param image: plain image to be encrypted
         :param base_addr: where the image will be located in target processor
+        :param max_workers: Number of threads, 1 to encrypt sequentially, by default CPU count based
         :return: encrypted image
         """
         encrypted_data = bytearray(image)
-        addr = base_addr
-        for block in split_data(image, self.IEE_DATA_UNIT):
-            for key_blob in self._key_blobs:
-                if key_blob.matches_range(addr, addr + len(block)):
-                    logger.debug(
-                        f"Encrypting {hex(addr)}:{hex(len(block) + addr)}"
-                        f" with keyblob: \n {str(key_blob)}"
-                    )
-                    encrypted_data[
-                        addr - base_addr : len(block) + addr - base_addr
-                    ] = key_blob.encrypt_image(addr, block)
-            addr += len(block)
+        # find the key blob of each data unit, the last matching key blob is used
+        runs: List[Tuple[int, int, IeeKeyBlob]] = []
+        for offset in range(0, len(image), self.IEE_DATA_UNIT):
+            addr = base_addr + offset
+            unit_len = min(self.IEE_DATA_UNIT, len(image) - offset)
+            key_blob = find_first(
+                reversed(self._key_blobs), lambda kb: kb.matches_range(addr, addr + unit_len)
+            )
+            if not key_blob:
+                continue
+            # tweak and counter are derived from the address, so neighboring units form single run
+            if runs and runs[-1][2] is key_blob and sum(runs[-1][:2]) == offset:
+                runs[-1] = (runs[-1][0], runs[-1][1] + unit_len, key_blob)
+            else:
+                runs.append((offset, unit_len, key_blob))
+
+        for offset, length, key_blob in runs:
+            addr = base_addr + offset
+            logger.debug(
+                f"Encrypting {hex(addr)}:{hex(length + addr)} with keyblob: \n {str(key_blob)}"
+            )
+            encrypted_data[offset : offset + length] = key_blob.encrypt_image(
+                addr, image[offset : offset + length], max_workers
+            )
 
         return bytes(encrypted_data)
 
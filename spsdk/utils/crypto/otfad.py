@@ -9,16 +9,17 @@
 
 import logging
 import os
+from array import array
 from copy import deepcopy
 from struct import pack
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from crcmod.predefined import mkPredefinedCrcFun
 
 from spsdk import version as spsdk_version
 from spsdk.apps.utils.utils import filepath_from_config
 from spsdk.crypto.rng import random_bytes
-from spsdk.crypto.symmetric import Counter, aes_ctr_encrypt, aes_key_wrap
+from spsdk.crypto.symmetric import Counter, CounterKeystream, aes_key_wrap, xor_bytes
 from spsdk.exceptions import SPSDKError, SPSDKValueError
 from spsdk.utils.database import DatabaseManager, get_db, get_families, get_schema_file
 from spsdk.utils.exceptions import SPSDKRegsErrorBitfieldNotFound
@@ -26,10 +27,10 @@ from spsdk.utils.images import BinaryImage
 from spsdk.utils.misc import (
     Endianness,
     align_block,
+    find_first,
     load_binary,
     load_hex_string,
     reverse_bits_in_bytes,
-    split_data,
     value_to_bytes,
     value_to_int,
 )
@@ -92,6 +93,8 @@ class KeyBlob:
     _IMAGE_ALIGNMENT = 512
     # Encryption block size
     _ENCRYPTION_BLOCK_SIZE = 16
+    # Size of data encrypted at once, it limits the size of temporary buffers
+    _ENCRYPTION_CHUNK_SIZE = 0x100000
 
     def __init__(
         self,
@@ -304,37 +307,26 @@ class KeyBlob:
                 f"{hex(self.start_addr)}-{hex(self.end_addr)}."
                 " Ignore this if flash remap feature is used"
             )
-        result = bytes()
-
         if not counter_value:
             counter_value = self.start_addr
 
         counter = Counter(
             self._get_ctr_nonce(), ctr_value=counter_value, ctr_byteorder_encoding=Endianness.BIG
         )
-
-        for index in range(0, data_len, 16):
-            # prepare data in byte order
+        # the counter of each 16 bytes block is incremented by its address offset
+        keystream = CounterKeystream(self.key, counter, increment=16)
+        result = bytearray(data_len)
+        for offset in range(0, data_len, self._ENCRYPTION_CHUNK_SIZE):
+            chunk = data[offset : offset + self._ENCRYPTION_CHUNK_SIZE]
+            chunk_keystream = keystream.read(len(chunk))
             if byte_swap:
-                # swap 8 bytes + swap 8 bytes
-                data_2_encr = (
-                    data[-data_len + index + 7 : -data_len + index - 1 : -1]
-                    + data[-data_len + index + 15 : -data_len + index + 7 : -1]
-                )
-            else:
-                data_2_encr = data[index : index + 16]
-            # encrypt
-            encr_data = aes_ctr_encrypt(self.key, data_2_encr, counter.value)
-            # fix byte order in result
-            if byte_swap:
-                result += encr_data[-9:-17:-1] + encr_data[-1:-9:-1]  # swap 8 bytes + swap 8 bytes
-            else:
-                result += encr_data
-            # update counter for encryption
-            counter.increment(16)
+                # data are swapped before and after encryption (swap 8 bytes + swap 8 bytes),
+                # XOR with the keystream keeps the byte positions, so just the keystream is swapped
+                swapped = array("Q", chunk_keystream)
+                swapped.byteswap()
+                chunk_keystream = swapped.tobytes()
+            result[offset : offset + len(chunk)] = xor_bytes(chunk, chunk_keystream)
 
-        if len(result) != data_len:
-            raise SPSDKError("Invalid length of encrypted data")
         return bytes(result)
 
     @property
@@ -385,18 +377,30 @@ class Otfad:
         :return: encrypted image
         """
         encrypted_data = bytearray(image)
-        addr = base_addr
-        for block in split_data(image, self.OTFAD_DATA_UNIT):
-            for key_blob in self._key_blobs:
-                if key_blob.matches_range(addr, addr + len(block)):
-                    logger.debug(
-                        f"Encrypting {hex(addr)}:{hex(len(block) + addr)}"
-                        f" with keyblob: \n {str(key_blob)}"
-                    )
-                    encrypted_data[
-                        addr - base_addr : len(block) + addr - base_addr
-                    ] = key_blob.encrypt_image(addr, block, byte_swap, counter_value=addr)
-            addr += len(block)
+        # find the key blob of each data unit, the last matching key blob is used
+        runs: List[Tuple[int, int, KeyBlob]] = []
+        for offset in range(0, len(image), self.OTFAD_DATA_UNIT):
+            addr = base_addr + offset
+            unit_len = min(self.OTFAD_DATA_UNIT, len(image) - offset)
+            key_blob = find_first(
+                reversed(self._key_blobs), lambda kb: kb.matches_range(addr, addr + unit_len)
+            )
+            if not key_blob:
+                continue
+            # the counter is derived from the address, so neighboring units form single run
+            if runs and runs[-1][2] is key_blob and sum(runs[-1][:2]) == offset:
+                runs[-1] = (runs[-1][0], runs[-1][1] + unit_len, key_blob)
+            else:
+                runs.append((offset, unit_len, key_blob))
+
+        for offset, length, key_blob in runs:
+            addr = base_addr + offset
+            logger.debug(
+                f"Encrypting {hex(addr)}:{hex(length + addr)} with keyblob: \n {str(key_blob)}"
+            )
+            encrypted_data[offset : offset + length] = key_blob.encrypt_image(
+                addr, image[offset : offset + length], byte_swap, counter_value=addr
+            )
 
         return bytes(encrypted_data)
 
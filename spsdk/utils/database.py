@@ -6,19 +6,18 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Module to manage used databases in SPSDK."""
 
-import atexit
 import logging
 import os
 import pickle
 import shutil
 from copy import copy, deepcopy
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import platformdirs
 from typing_extensions import Self
 
 import spsdk
-from spsdk import SPSDK_CACHE_DISABLED, SPSDK_DATA_FOLDER
+from spsdk import SPSDK_CACHE_DEEP_CHECK, SPSDK_CACHE_DISABLED, SPSDK_DATA_FOLDER
 from spsdk.crypto.hash import EnumHashAlgorithm, Hash, get_hash
 from spsdk.exceptions import SPSDKError, SPSDKValueError
 from spsdk.utils.misc import (
@@ -437,7 +436,13 @@ class Device:
 
 
 class Devices(List[Device]):
-    """List of devices."""
+    """List of devices.
+
+    The optional loader is called for devices that are not in the list yet, it allows to load
+    the devices on demand.
+    """
+
+    loader: Optional[Callable[[str], Optional[Device]]] = None
 
     def get(self, name: str) -> Device:
         """Return database device structure.
@@ -447,6 +452,8 @@ class Devices(List[Device]):
         :return: Dictionary device configuration structure or None:
         """
         dev = find_first(self, lambda dev: dev.name == name)
+        if not dev and self.loader:
+            dev = self.loader(name)
         if not dev:
             raise SPSDKErrorMissingDevice(f"The device with name {name} is not in the database.")
         return dev
@@ -515,31 +522,172 @@ class Devices(List[Device]):
         return devices
 
 
-class Database:
-    """Class that helps manage used databases in SPSDK."""
+class DatabaseCache:
+    """Cache of loaded database items, every item is stored in its own shard file.
+
+    Each shard records the stamps (modification time and size) of the source files the item
+    was created from, so change of one source file invalidates only the shards created from it.
+    """
 
     def __init__(self, path: str) -> None:
+        """Database cache constructor.
+
+        :param path: Folder of the cache shards.
+        """
+        self.path = path
+
+    @staticmethod
+    def file_stamp(path: str) -> Tuple[int, int]:
+        """Get stamp of the source file used to validate the cached items.
+
+        :param path: Path to source file.
+        :return: Tuple of modification time and size of the file.
+        """
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def shard_path(self, kind: str, name: str) -> str:
+        """Get path to shard file.
+
+        :param kind: Kind of cached items (devices, configs).
+        :param name: Name of cached item.
+        :return: Path to shard file.
+        """
+        return os.path.join(self.path, kind, f"{name}.cache")
+
+    def load(self, kind: str, name: str) -> Optional[Tuple[Any, List[str]]]:
+        """Load the item from cache.
+
+        :param kind: Kind of cached items (devices, configs).
+        :param name: Name of cached item.
+        :return: Tuple of cached item and its source files, None if the item is not cached
+            or any of its source files has been changed.
+        """
+        path = self.shard_path(kind, name)
+        try:
+            with open(path, mode="rb") as f:
+                stamps, item = pickle.load(f)
+            for source, stamp in stamps.items():
+                if self.file_stamp(source) != stamp:
+                    logger.debug(f"Cached {kind} '{name}' is outdated, {source} has been changed")
+                    return None
+        except FileNotFoundError:
+            return None
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.debug(f"Cannot load {kind} '{name}' from cache: {str(exc)}")
+            return None
+        return item, list(stamps.keys())
+
+    def store(self, kind: str, name: str, item: Any, sources: Iterable[str]) -> None:
+        """Store the item into cache.
+
+        :param kind: Kind of cached items (devices, configs).
+        :param name: Name of cached item.
+        :param item: Item to be cached.
+        :param sources: Source files the item has been created from.
+        """
+        path = self.shard_path(kind, name)
+        try:
+            stamps = {source: self.file_stamp(source) for source in sources}
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write to temporary file first, other processes could read the shard concurrently
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, mode="wb") as f:
+                pickle.dump((stamps, item), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            logger.debug(f"Created cache of {kind} '{name}': {path}")
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.debug(f"Cannot store {kind} '{name}' into cache: {str(exc)}")
+
+
+class Database:
+    """Class that helps manage used databases in SPSDK.
+
+    The devices are loaded on demand, just the device and its aliases are loaded when
+    a device is requested.
+    """
+
+    def __init__(self, path: str, cache: Optional[DatabaseCache] = None) -> None:
         """Register Configuration class constructor.
 
         :param path: The path to configuration JSON file.
+        :param cache: Optional cache of loaded devices and configuration files.
         """
         self._cfg_cache: Dict[str, Dict[str, Any]] = {}
         self.path = path
+        self.cache = cache
         self.common_folder_path = os.path.join(path, "common")
         self.devices_folder_path = os.path.join(path, "devices")
-        self._defaults = load_configuration(
-            os.path.join(self.common_folder_path, "database_defaults.yaml")
-        )
-        self._devices = Devices.load(devices_path=self.devices_folder_path, defaults=self._defaults)
+        self.defaults_path = os.path.join(self.common_folder_path, "database_defaults.yaml")
+        self._defaults = self.load_db_cfg_file(self.defaults_path)
+        self._device_paths = {
+            dev.name: dev.path for dev in os.scandir(self.devices_folder_path) if dev.is_dir()
+        }
+        # source files of loaded devices, aliased device depends also on the sources of alias
+        self._device_sources: Dict[str, List[str]] = {}
+        self._loading: List[str] = []
+        self._all_loaded = False
+        self._devices = Devices()
+        self._devices.loader = self._load_device
+
+    def _load_device(self, name: str) -> Optional[Device]:
+        """Load the device from cache or from its database file.
 
-        # optional Database hash that could be used for identification of consistency
-        self.db_hash = bytes()
+        :param name: The name of device.
+        :raises SPSDKError: Circular alias of devices.
+        :return: The Device object, None if the device is not in the database.
+        """
+        path = self._device_paths.get(name)
+        if not path:
+            return None
+        if name in self._loading:
+            raise SPSDKError(f"Circular alias of device {name} in database.")
+        cached = self.cache.load("devices", name) if self.cache else None
+        if cached:
+            device, sources = cached
+        else:
+            self._loading.append(name)
+            try:
+                device = Device.load(
+                    name=name, path=path, defaults=self._defaults, other_devices=self._devices
+                )
+            finally:
+                self._loading.remove(name)
+            sources = [self.defaults_path, os.path.join(path, "database.yaml")]
+            if device.device_alias:
+                sources.extend(self._device_sources[device.device_alias.name])
+            if self.cache:
+                self.cache.store("devices", name, device, sources)
+        self._device_sources[name] = sources
+        self._devices.append(device)
+        return device
 
     @property
     def devices(self) -> Devices:
-        """Get the list of devices stored in the database."""
+        """Get the list of devices stored in the database.
+
+        All devices in database are loaded at first use.
+        """
+        if not self._all_loaded:
+            for name in sorted(self._device_paths):
+                try:
+                    self._devices.get(name)
+                except SPSDKError as exc:
+                    logger.error(
+                        f"Failed loading device '{name}' into SPSDK database. Details:\n{str(exc)}"
+                    )
+            self._all_loaded = True
         return self._devices
 
+    def get_device(self, name: str) -> Device:
+        """Get the device, only the device and its aliases are loaded.
+
+        :param name: The device name.
+        :raises SPSDKErrorMissingDevice: In case the device with given name does not exist
+        :return: The Device object.
+        """
+        return self._devices.get(name)
+
     def get_feature_list(self, dev_name: Optional[str] = None) -> List[str]:
         """Get features list.
 
@@ -549,7 +697,7 @@ class Database:
         :returns: List of features.
         """
         if dev_name:
-            return self.devices.get(dev_name).features_list
+            return self.get_device(dev_name).features_list
 
         default_features: Dict[str, Dict] = self._defaults["features"]
         return [str(k) for k in default_features.keys()]
@@ -578,7 +726,7 @@ class Database:
         :raises SPSDKValueError: Unsupported feature
         :return: The feature data.
         """
-        dev = self.devices.get(device)
+        dev = self.get_device(device)
         return dev.revisions.get(revision)
 
     def get_schema_file(self, feature: str) -> Dict[str, Any]:
@@ -599,10 +747,17 @@ class Database:
         """
         abs_path = os.path.abspath(filename)
         if abs_path not in self._cfg_cache:
-            try:
-                cfg = load_configuration(abs_path)
-            except SPSDKError as exc:
-                raise SPSDKError(f"Invalid configuration file. {str(exc)}") from exc
+            cache_name = get_hash(abs_path.encode(), algorithm=EnumHashAlgorithm.SHA1).hex()
+            cached = self.cache.load("configs", cache_name) if self.cache else None
+            if cached:
+                cfg = cached[0]
+            else:
+                try:
+                    cfg = load_configuration(abs_path)
+                except SPSDKError as exc:
+                    raise SPSDKError(f"Invalid configuration file. {str(exc)}") from exc
+                if self.cache:
+                    self.cache.store("configs", cache_name, cfg, [abs_path])
             self._cfg_cache[abs_path] = cfg
 
         return deepcopy(self._cfg_cache[abs_path])
@@ -652,20 +807,18 @@ class DatabaseManager:
 
     _instance = None
     _db: Optional[Database] = None
-    _db_hash: int = 0
+    _db_cache_folder_name = ""
     _db_cache_file_name = ""
 
     @staticmethod
     def get_cache_filename() -> Tuple[str, str]:
-        """Get database cache folder and file name.
+        """Get database cache folder and the folder of database cache shards.
 
-        :return: Tuple of cache path and database file name.
+        :return: Tuple of cache path and database cache shards path.
         """
         data_folder = SPSDK_DATA_FOLDER.lower()
         cache_name = (
-            "db_"
-            + get_hash(data_folder.encode(), algorithm=EnumHashAlgorithm.SHA1)[:6].hex()
-            + ".cache"
+            "db_" + get_hash(data_folder.encode(), algorithm=EnumHashAlgorithm.SHA1)[:6].hex()
         )
         cache_path = platformdirs.user_cache_dir(appname="spsdk", version=spsdk.version)
         return (cache_path, os.path.join(cache_path, cache_name))
@@ -680,35 +833,36 @@ class DatabaseManager:
     def _get_database(cls) -> Database:
         """Get database and count with cache."""
         if SPSDK_CACHE_DISABLED:
-            DatabaseManager.clear_cache()
+            if os.path.exists(cls._db_cache_folder_name):
+                DatabaseManager.clear_cache()
             return Database(SPSDK_DATA_FOLDER)
+        if SPSDK_CACHE_DEEP_CHECK:
+            cls._check_cache_manifest()
+        return Database(SPSDK_DATA_FOLDER, cache=DatabaseCache(cls._db_cache_file_name))
 
-        db_hash = DatabaseManager.get_db_hash(SPSDK_DATA_FOLDER)
+    @classmethod
+    def _check_cache_manifest(cls) -> None:
+        """Drop the database cache in case that any file in data folder has been changed.
 
-        if os.path.exists(cls._db_cache_file_name):
-            try:
-                with open(cls._db_cache_file_name, mode="rb") as f:
-                    loaded_db = pickle.load(f)
-                    assert isinstance(loaded_db, Database)
-                    if db_hash == loaded_db.db_hash:
-                        logger.debug(f"Loaded database from cache: {cls._db_cache_file_name}")
-                        return loaded_db
-                    # if the hash is not same clear cache and make a new one
-                    logger.debug(f"Existing cached DB ({cls._db_cache_file_name}) has invalid hash")
-                    DatabaseManager.clear_cache()
-            except Exception as exc:
-                logger.debug(f"Cannot load database cache: {str(exc)}")
-
-        db = Database(SPSDK_DATA_FOLDER)
-        db.db_hash = db_hash
+        The cached items are validated by their own source files, this check detects also
+        changes which keep modification time and size of the files.
+        """
+        db_hash = DatabaseManager.get_db_hash(SPSDK_DATA_FOLDER)
+        manifest_path = os.path.join(cls._db_cache_file_name, "manifest")
         try:
-            os.makedirs(cls._db_cache_folder_name, exist_ok=True)
-            with open(cls._db_cache_file_name, mode="wb") as f:
-                pickle.dump(db, f, pickle.HIGHEST_PROTOCOL)
-                logger.debug(f"Created database cache: {cls._db_cache_file_name}")
-        except Exception as exc:
-            logger.debug(f"Cannot store database cache: {str(exc)}")
-        return db
+            with open(manifest_path, mode="rb") as f:
+                if f.read() == db_hash:
+                    return
+        except OSError:
+            pass
+        logger.debug(f"Data folder has been changed, clearing database cache: {manifest_path}")
+        shutil.rmtree(cls._db_cache_file_name, ignore_errors=True)
+        try:
+            os.makedirs(cls._db_cache_file_name, exist_ok=True)
+            with open(manifest_path, mode="wb") as f:
+                f.write(db_hash)
+        except OSError as exc:
+            logger.debug(f"Cannot store database cache manifest: {str(exc)}")
 
     def __new__(cls) -> Self:
         """Manage SPSDK Database as a singleton class.
@@ -720,19 +874,26 @@ class DatabaseManager:
         cls._instance = super(DatabaseManager, cls).__new__(cls)
         cls._db_cache_folder_name, cls._db_cache_file_name = DatabaseManager.get_cache_filename()
         cls._db = cls._instance._get_database()
-        cls._db_hash = hash(cls._db)
         return cls._instance
 
     @staticmethod
     def get_db_hash(path: str) -> bytes:
-        """Get the real db hash."""
+        """Get the real db hash.
+
+        The hash is computed from stamps of all JSON and YAML files in the folder tree.
+
+        :param path: Path to database folder.
+        :return: Hash of the database folder.
+        """
         hash_obj = Hash(EnumHashAlgorithm.SHA1)
         for root, dirs, files in os.walk(path):
-            for _dir in dirs:
-                hash_obj.update(DatabaseManager.get_db_hash(os.path.join(root, _dir)))
-            for file in files:
+            # walk the tree in stable order, os.walk itself descends into the sub folders
+            dirs.sort()
+            for file in sorted(files):
                 if os.path.splitext(file)[1] in [".json", ".yaml"]:
-                    stat = os.stat(os.path.join(root, file))
+                    file_path = os.path.join(root, file)
+                    stat = os.stat(file_path)
+                    hash_obj.update(os.path.relpath(file_path, path).encode())
                     hash_obj.update_int(stat.st_mtime_ns)
                     hash_obj.update_int(stat.st_ctime_ns)
                     hash_obj.update_int(stat.st_size)
@@ -775,23 +936,6 @@ class DatabaseManager:
     WPC = "wpc"
 
 
-@atexit.register
-def on_delete() -> None:
-    """Delete method of SPSDK database.
-
-    The exit method is used to update cache in case it has been changed.
-    """
-    if SPSDK_CACHE_DISABLED:
-        return
-    if DatabaseManager._db_hash != hash(DatabaseManager._db):
-        try:
-            with open(DatabaseManager._db_cache_file_name, mode="wb") as f:
-                logger.debug(f"Updating cache: {DatabaseManager._db_cache_file_name}")
-                pickle.dump(DatabaseManager().db, f, pickle.HIGHEST_PROTOCOL)
-        except FileNotFoundError:
-            pass
-
-
 def get_db(
     device: str,
     revision: str = "latest",
@@ -811,7 +955,7 @@ def get_device(device: str) -> Device:
     :param device: The device name.
     :return: The device data.
     """
-    return DatabaseManager().db.devices.get(device)
+    return DatabaseManager().db.get_device(device)
 
 
 def get_families(feature: str, sub_keys: Optional[List[str]] = None) -> List[str]:
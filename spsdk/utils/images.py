@@ -11,7 +11,7 @@ import math
 import os
 import re
 import textwrap
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional, Tuple
 
 import colorama
 
@@ -34,6 +34,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# size of chunks used to copy the binaries loaded lazily from files
+COPY_CHUNK_SIZE = 0x100000
+
 
 class ColorPicker:
     """Simple class to get each time when ask different color from list."""
@@ -99,19 +102,31 @@ class BinaryImage:
         :param alignment: Optional alignment of result image
         :param parent: Handle to parent object, defaults to None
         """
+        # computed length of image, it's dropped whenever the image or its sub images change
+        self._length: Optional[int] = None
+        self.parent = parent
         self.name = name
         self.description = description
         self.offset = offset
         self._size = align(size, alignment)
+        self._binary: Optional[bytes] = None
+        # path, size and modification time of file with binary content which is not loaded yet
+        self._binary_file: Optional[Tuple[str, int, int]] = None
         self.binary = binary
         self.pattern = pattern
         self.alignment = alignment
-        self.parent = parent
 
         if parent:
             assert isinstance(parent, BinaryImage)
         self.sub_images: List["BinaryImage"] = []
 
+    def _invalidate(self) -> None:
+        """Drop the computed length of this image and all its parents."""
+        image: Optional[BinaryImage] = self
+        while image is not None:
+            image._length = None
+            image = image.parent
+
     @property
     def size(self) -> int:
         """Size property."""
@@ -121,6 +136,102 @@ class BinaryImage:
     def size(self, value: int) -> None:
         """Size property setter."""
         self._size = align(value, self.alignment)
+        self._invalidate()
+
+    @property
+    def offset(self) -> int:
+        """Image offset in parent image."""
+        return self._offset
+
+    @offset.setter
+    def offset(self, value: int) -> None:
+        """Image offset setter."""
+        self._offset = value
+        if self.parent is not None:
+            self.parent._invalidate()
+
+    @property
+    def binary(self) -> Optional[bytes]:
+        """Binary content of image.
+
+        The binary loaded lazily from file is read into memory on first access.
+        """
+        if self._binary_file:
+            self._binary = self._read_binary_file(0, self._binary_file[1])
+            self._binary_file = None
+        return self._binary
+
+    @binary.setter
+    def binary(self, value: Optional[bytes]) -> None:
+        """Binary content setter."""
+        self._binary = value
+        self._binary_file = None
+        self._invalidate()
+
+    def _get_binary_len(self) -> int:
+        """Get length of binary content without loading it from file.
+
+        :return: Length of binary, 0 if there is no binary.
+        """
+        if self._binary_file:
+            return self._binary_file[1]
+        return len(self._binary) if self._binary else 0
+
+    def _load_binary_file(self, path: str) -> None:
+        """Load into memory all binaries loaded lazily from given file.
+
+        :param path: Path to the file.
+        """
+        if self._binary_file and os.path.samefile(self._binary_file[0], path):
+            self._binary = self._read_binary_file(0, self._binary_file[1])
+            self._binary_file = None
+        for image in self.sub_images:
+            image._load_binary_file(path)
+
+    def _read_binary_file(self, begin: int, end: int) -> bytes:
+        """Read part of the binary loaded lazily from file.
+
+        :param begin: Start of the part in binary.
+        :param end: End of the part in binary.
+        :raises SPSDKError: The file has been changed since the image was loaded.
+        :return: Binary data.
+        """
+        data = bytearray(end - begin)
+        self._read_binary_into(memoryview(data), begin)
+        return bytes(data)
+
+    def _read_binary_into(self, buffer: memoryview, begin: int = 0) -> None:
+        """Copy part of the binary into buffer.
+
+        :param buffer: Buffer for the data, its length determines length of the part.
+        :param begin: Start of the part in binary.
+        :raises SPSDKError: The file has been changed since the image was loaded.
+        """
+        if not self._binary_file:
+            buffer[:] = memoryview(self._binary or b"")[begin : begin + len(buffer)]
+            return
+        path, size, mtime = self._binary_file
+        stat = os.stat(path)
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+            raise SPSDKError(f"The file {path} has been changed since it was loaded.")
+        with open(path, "rb") as f:
+            f.seek(begin)
+            while buffer:
+                count = f.readinto(buffer)
+                if not count:
+                    raise SPSDKError(f"Unexpected end of file {path}.")
+                buffer = buffer[count:]
+
+    @property
+    def alignment(self) -> int:
+        """Alignment of result image."""
+        return self._alignment
+
+    @alignment.setter
+    def alignment(self, value: int) -> None:
+        """Alignment setter."""
+        self._alignment = value
+        self._invalidate()
 
     def add_image(self, image: "BinaryImage") -> None:
         """Add new sub image information.
@@ -128,11 +239,18 @@ class BinaryImage:
         :param image: Image object.
         """
         image.parent = self
+        length = self._length
+        self._invalidate()
+        if length is not None:
+            # appended image can just extend the already computed length
+            self._length = align(max(length, image.offset + len(image)), self.alignment)
+        if not self.sub_images or image.offset >= self.sub_images[-1].offset:
+            self.sub_images.append(image)
+            return
         for i, child in enumerate(self.sub_images):
             if image.offset < child.offset:
                 self.sub_images.insert(i, image)
                 return
-        self.sub_images.append(image)
 
     def join_images(self) -> None:
         """Join all sub images into main binary block."""
@@ -197,6 +315,21 @@ class BinaryImage:
             ret += self.description + "\n"
         return ret
 
+    def _has_overlaps(self) -> bool:
+        """Check if any sub images may overlap each other.
+
+        The sub images are checked in order of their offsets, so just the farthest end of the
+        previous images has to be compared. Empty images could be reported as overlapping.
+
+        :return: True if the sub images may overlap.
+        """
+        max_end = -1
+        for image in sorted(self.sub_images, key=lambda image: image.offset):
+            if image.offset <= max_end:
+                return True
+            max_end = max(max_end, image.offset + len(image) - 1)
+        return False
+
     def validate(self) -> None:
         """Validate if the images doesn't overlaps each other."""
         if self.offset < 0:
@@ -205,6 +338,7 @@ class BinaryImage:
             )
         if len(self) < 0:
             raise SPSDKValueError(f"Image size of {self.image_name} cannot be in negative numbers.")
+        check_siblings = self._has_overlaps()
         for image in self.sub_images:
             image.validate()
             begin = image.offset
@@ -214,6 +348,8 @@ class BinaryImage:
                 raise SPSDKOverlapError(
                     f"The image {image.name} doesn't fit into {self.name} parent image."
                 )
+            if not check_siblings:
+                continue
             # Check if it doesn't overlap any other sibling image
             for sibling in self.sub_images:
                 if sibling != image:
@@ -379,19 +515,24 @@ class BinaryImage:
         """Get length of image.
 
         If internal member size is not set(is zero) the size is computed from sub images.
+        The computed size is kept until the image or any of its sub images is changed.
         :return: Size of image.
         """
         if self._size:
             return self._size
-        max_size = len(self.binary) if self.binary else 0
-        for image in self.sub_images:
-            size = image.offset + len(image)
-            max_size = max(size, max_size)
-        return align(max_size, self.alignment)
+        if self._length is None:
+            max_size = self._get_binary_len()
+            for image in self.sub_images:
+                size = image.offset + len(image)
+                max_size = max(size, max_size)
+            self._length = align(max_size, self.alignment)
+        return self._length
 
     def export(self) -> bytes:
         """Export represented binary image.
 
+        All sub images are written directly into one output buffer.
+
         :return: Byte array of binary image.
         """
         if self.binary and len(self) == len(self.binary) and len(self.sub_images) == 0:
@@ -402,18 +543,114 @@ class BinaryImage:
         else:
             ret = bytearray(len(self))
 
-        if self.binary:
-            binary_view = memoryview(self.binary)
-            ret[: len(self.binary)] = binary_view
+        binary_len = self._get_binary_len()
+        if binary_len > len(ret):
+            # the binary exceeding the image size extends the image
+            ret.extend(bytes(binary_len - len(ret)))
 
-        for image in self.sub_images:
-            image_data = image.export()
-            ret_slice = memoryview(ret)[image.offset : image.offset + len(image_data)]
-            image_data_view = memoryview(image_data)
-            ret_slice[:] = image_data_view
+        with memoryview(ret) as ret_view:
+            if binary_len:
+                self._read_binary_into(ret_view[:binary_len])
+            self._export_sub_images(ret_view)
 
         return align_block(ret, self.alignment, self.pattern)
 
+    def _export_into(self, buffer: memoryview) -> None:
+        """Export the image into buffer of the image size.
+
+        :param buffer: Buffer for the image data.
+        """
+        binary_len = self._get_binary_len()
+        if not (binary_len and binary_len == len(buffer)):
+            buffer[:] = self.pattern.get_block(len(self)) if self.pattern else bytes(len(self))
+        if binary_len:
+            self._read_binary_into(buffer[:binary_len])
+        self._export_sub_images(buffer)
+
+    def _export_sub_images(self, buffer: memoryview) -> None:
+        """Export sub images into buffer of this image.
+
+        :param buffer: Buffer for the image data.
+        """
+        for image in self.sub_images:
+            if image._get_binary_len() > len(image):
+                # the binary exceeding the image size overwrites the following data
+                image_data = image.export()
+                buffer[image.offset : image.offset + len(image_data)] = image_data
+            else:
+                image._export_into(buffer[image.offset : image.offset + len(image)])
+
+    def export_to_stream(self, stream: BinaryIO) -> int:
+        """Export represented binary image into stream.
+
+        The images are written one by one, so the binaries loaded lazily from files are copied
+        into the stream without loading them into memory. Layouts with overlapping images are
+        exported into memory first.
+
+        :param stream: Output binary stream.
+        :return: Number of written bytes.
+        """
+        if not self._is_streamable():
+            return stream.write(self.export())
+        self._export_to_stream(stream)
+        return len(self)
+
+    def _is_streamable(self) -> bool:
+        """Check if the image could be written sequentially.
+
+        :return: True if the sub images are ordered and don't overlap and all binaries fit.
+        """
+        if self._get_binary_len() > len(self):
+            return False
+        position = 0
+        for image in self.sub_images:
+            if image.offset < position or image.offset + len(image) > len(self):
+                return False
+            if not image._is_streamable():
+                return False
+            position = image.offset + len(image)
+        return True
+
+    def _export_to_stream(self, stream: BinaryIO) -> None:
+        """Write the image sequentially into stream.
+
+        :param stream: Output binary stream.
+        """
+        position = 0
+        for image in self.sub_images:
+            self._write_region(stream, position, image.offset)
+            image._export_to_stream(stream)
+            position = image.offset + len(image)
+        self._write_region(stream, position, len(self))
+
+    def _write_region(self, stream: BinaryIO, begin: int, end: int) -> None:
+        """Write region of this image not covered by sub images into stream.
+
+        :param stream: Output binary stream.
+        :param begin: Start of the region.
+        :param end: End of the region.
+        """
+        binary_end = min(end, self._get_binary_len())
+        if self._binary_file:
+            buffer = memoryview(bytearray(min(COPY_CHUNK_SIZE, max(binary_end - begin, 0))))
+            while begin < binary_end:
+                chunk = buffer[: min(len(buffer), binary_end - begin)]
+                self._read_binary_into(chunk, begin)
+                stream.write(chunk)
+                begin += len(chunk)
+        elif begin < binary_end:
+            stream.write(memoryview(self._binary or b"")[begin:binary_end])
+            begin = binary_end
+        if begin >= end:
+            return
+        if self.pattern is None or self.pattern.pattern == "zeros":
+            while begin < end:
+                stream.write(bytes(min(COPY_CHUNK_SIZE, end - begin)))
+                begin += COPY_CHUNK_SIZE
+        else:
+            # the pattern could depend on position in image
+            stream.write(self.pattern.get_block(end)[begin:])
+
     @staticmethod
     def get_validation_schemas() -> List[Dict[str, Any]]:
         """Get validation schemas list to check a supported configuration.
@@ -479,7 +716,14 @@ class BinaryImage:
             raise SPSDKValueError(f"Invalid input file format: {file_format}")
 
         if file_format == "BIN":
-            write_file(self.export(), path, mode="wb")
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            if os.path.exists(path):
+                # the target is truncated on open, load it first if it's also one of sources
+                self._load_binary_file(path)
+            with open(path, "wb") as f:
+                self.export_to_stream(f)
             return
 
         def add_into_binary(bin_image: BinaryImage) -> None:
@@ -536,7 +780,8 @@ class BinaryImage:
         # pylint: disable=missing-param-doc
         r"""Load binary data file.
 
-        Supported formats are ELF, HEX, SREC and plain binary
+        Supported formats are ELF, HEX, SREC and plain binary. The plain binary files are not
+        loaded into memory until their content is needed.
 
         :param path: Path to the file.
         :param name: Name of Image, defaults to file name.
@@ -557,6 +802,30 @@ class BinaryImage:
         except Exception as e:
             raise SPSDKError(f"Error loading file: {str(e)}") from e
 
+        img_name = name or os.path.basename(path)
+        img_size = size or 0
+        img_descr = description or f"The image loaded from: {path} ."
+        bin_image = BinaryImage(
+            name=img_name,
+            size=img_size,
+            offset=offset,
+            description=img_descr,
+            pattern=pattern,
+            alignment=alignment,
+        )
+        if load_bin and data != b"\x7fELF" and BinaryImage._is_plain_binary(path):
+            stat = os.stat(path)
+            file_segment = BinaryImage(
+                name="Segment 0",
+                size=stat.st_size,
+                pattern=pattern,
+                parent=bin_image,
+                alignment=alignment,
+            )
+            file_segment._binary_file = (path, stat.st_size, stat.st_mtime_ns)
+            bin_image.add_image(file_segment)
+            return bin_image
+
         # import bincopy only if needed to save startup time
         import bincopy  # pylint: disable=import-outside-toplevel
 
@@ -575,17 +844,6 @@ class BinaryImage:
         except Exception as e:
             raise SPSDKError(f"Error loading file: {str(e)}") from e
 
-        img_name = name or os.path.basename(path)
-        img_size = size or 0
-        img_descr = description or f"The image loaded from: {path} ."
-        bin_image = BinaryImage(
-            name=img_name,
-            size=img_size,
-            offset=offset,
-            description=img_descr,
-            pattern=pattern,
-            alignment=alignment,
-        )
         if len(bin_file.segments) == 0:
             raise SPSDKError(f"Load of {path} failed, can't be decoded.")
 
@@ -604,3 +862,22 @@ class BinaryImage:
         # Optimize offsets in image
         bin_image.update_offsets()
         return bin_image
+
+    @staticmethod
+    def _is_plain_binary(path: str) -> bool:
+        """Check if the file could be loaded just as plain binary.
+
+        Every file not starting as one of the text formats supported by bincopy, Intel HEX (':'),
+        Motorola SREC ('S0'-'S9'), TI-TXT or Verilog VMEM ('@', '//'), is a plain binary.
+
+        :param path: Path to the file.
+        :return: True if the file is plain binary, False if it may be in any text format.
+        """
+        with open(path, "rb") as f:
+            header = f.read(0x100)
+        if not header:
+            return False
+        header = header.lstrip(b" \t\r\n")
+        if header.startswith((b":", b"@", b"//")):
+            return False
+        return not (header[:1] == b"S" and header[1:2].isdigit())
@@ -65,6 +65,19 @@ class SerialDevice(DeviceBase):
         self._device.timeout = value / 1000
         self._device.write_timeout = value / 1000
 
+    @property
+    def in_waiting(self) -> int:
+        """Number of bytes received by the device and not read yet.
+
+        :return: Number of bytes in the input buffer, 0 if the device is not opened.
+        """
+        if not self.is_opened:
+            return 0
+        try:
+            return self._device.in_waiting
+        except Exception as e:
+            raise SPSDKConnectionError(str(e)) from e
+
     @property
     def is_opened(self) -> bool:
         """Indicates whether device is open.
@@ -6,13 +6,20 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """Module to handle registers descriptions with support for XML files."""
 
+import copy
+import json
 import logging
+import os
 import re
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
 from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
 from xml.dom import minidom
 
+from spsdk import SPSDK_CACHE_DISABLED
+from spsdk.crypto.hash import EnumHashAlgorithm, get_hash
 from spsdk.exceptions import SPSDKError, SPSDKValueError
+from spsdk.utils.database import DatabaseCache, DatabaseManager
 from spsdk.utils.exceptions import (
     SPSDKRegsError,
     SPSDKRegsErrorBitfieldNotFound,
@@ -40,6 +47,8 @@ logger = logging.getLogger(__name__)
 class RegsEnum:
     """Storage for register enumerations."""
 
+    __slots__ = ("name", "value", "description", "max_width")
+
     def __init__(self, name: str, value: Any, description: str, max_width: int = 0) -> None:
         """Constructor of RegsEnum class. Used to store enumeration information of bitfield.
 
@@ -122,6 +131,8 @@ class ConfigProcessor:
 
     NAME = "NOP"
 
+    __slots__ = ("description",)
+
     def __init__(self, description: str = "") -> None:
         """Initialize the processor."""
         self.description = description
@@ -195,6 +206,8 @@ class ShiftRightConfigProcessor(ConfigProcessor):
 
     NAME = "SHIFT_RIGHT"
 
+    __slots__ = ("count",)
+
     def __init__(self, count: int, description: str = "") -> None:
         """Initialize the right-shift config processor.
 
@@ -231,8 +244,29 @@ class ShiftRightConfigProcessor(ConfigProcessor):
         return cls(count=value_to_int(params["count"]), description=description)
 
 
+NOP_CONFIG_PROCESSOR = ConfigProcessor()
+
+
 class RegsBitField:
-    """Storage for register bitfields."""
+    """Storage for register bitfields.
+
+    The value of bitfield is stored in its parent register.
+    """
+
+    __slots__ = (
+        "parent",
+        "name",
+        "offset",
+        "_width",
+        "_mask",
+        "description",
+        "reset_value",
+        "access",
+        "hidden",
+        "_enums",
+        "config_processor",
+        "config_width",
+    )
 
     def __init__(
         self,
@@ -266,10 +300,21 @@ class RegsBitField:
         self.access = access
         self.hidden = hidden
         self._enums: List[RegsEnum] = []
-        self.config_processor = config_processor or ConfigProcessor()
+        self.config_processor = config_processor or NOP_CONFIG_PROCESSOR
         self.config_width = self.config_processor.width_update(width)
         self.set_value(self.reset_value, raw=True)
 
+    @property
+    def width(self) -> int:
+        """Bit width of bitfield."""
+        return self._width
+
+    @width.setter
+    def width(self, value: int) -> None:
+        """Set bit width of bitfield."""
+        self._width = value
+        self._mask = (1 << value) - 1
+
     @classmethod
     def from_xml_element(cls, xml_element: ET.Element, parent: "RegsRegister") -> "RegsBitField":
         """Initialization register by XML ET element.
@@ -296,6 +341,20 @@ class RegsBitField:
 
         return bitfield
 
+    def clone(self, parent: "RegsRegister") -> "RegsBitField":
+        """Create copy of the bitfield for another register.
+
+        The description, enumerations and config processor are shared with this bitfield,
+        the value is stored in the parent register.
+
+        :param parent: Parent register of the new bitfield.
+        :return: Copy of the bitfield.
+        """
+        bitfield = copy.copy(self)
+        bitfield.parent = parent
+        bitfield._enums = list(self._enums)
+        return bitfield
+
     def has_enums(self) -> bool:
         """Returns if the bitfields has enums.
 
@@ -322,12 +381,8 @@ class RegsBitField:
 
         :return: Current value of bitfield.
         """
-        reg_val = self.parent.get_value(raw=False)
-        value = reg_val >> self.offset
-        mask = (1 << self.width) - 1
-        value = value & mask
-        value = self.config_processor.post_process(value)
-        return value
+        value = (self.parent.get_value(raw=False) >> self.offset) & self._mask
+        return self.config_processor.post_process(value)
 
     def get_reset_value(self) -> int:
         """Returns integer reset value of the bitfield.
@@ -345,15 +400,11 @@ class RegsBitField:
         """
         new_val_int = value_to_int(new_val)
         new_val_int = self.config_processor.pre_process(new_val_int)
-        if new_val_int > 1 << self.width:
+        if new_val_int > 1 << self._width:
             raise SPSDKValueError("The input value is out of bitfield range")
-        reg_val = self.parent.get_value(raw=raw)
-
-        mask = ((1 << self.width) - 1) << self.offset
-        reg_val = reg_val & ~mask
-        value = (new_val_int << self.offset) & mask
-        reg_val = reg_val | value
-        self.parent.set_value(reg_val, raw)
+        mask = self._mask << self.offset
+        reg_val = self.parent.get_value(raw=raw) & ~mask
+        self.parent.set_value(reg_val | ((new_val_int << self.offset) & mask), raw)
 
     def set_enum_value(self, new_val: str, raw: bool = False) -> None:
         """Updates the value of the bitfield by its enum value.
@@ -453,6 +504,29 @@ class RegsBitField:
 class RegsRegister:
     """Initialization register by input information."""
 
+    __slots__ = (
+        "name",
+        "offset",
+        "width",
+        "description",
+        "access",
+        "reverse",
+        "_bitfields",
+        "_bitfield_index",
+        "_set_value_hooks",
+        "_value",
+        "_reset_value",
+        "config_as_hexstring",
+        "otp_index",
+        "reverse_subregs_order",
+        "base_endianness",
+        "alt_widths",
+        "_alias_names",
+        "sub_regs",
+        "_sub_regs_width_init",
+        "_sub_regs_width",
+    )
+
     def __init__(
         self,
         name: str,
@@ -479,7 +553,7 @@ class RegsRegister:
         :param otp_index: Index of OTP fuse.
         :param reverse_subregs_order: Reverse order of sub registers.
         :param base_endianness: Base endianness for bytes import/export of value.
-        :param alt_widths: List of alternative widths.
+        :param alt_widths: List of alternative widths, it's sorted at initialization.
         """
         if width % 8 != 0:
             raise SPSDKValueError("SPSDK Register supports only widths in multiply 8 bits.")
@@ -490,6 +564,7 @@ class RegsRegister:
         self.access = access or "RW"
         self.reverse = reverse
         self._bitfields: List[RegsBitField] = []
+        self._bitfield_index: Dict[str, RegsBitField] = {}
         self._set_value_hooks: List = []
         self._value = 0
         self._reset_value = 0
@@ -497,7 +572,7 @@ class RegsRegister:
         self.otp_index = otp_index
         self.reverse_subregs_order = reverse_subregs_order
         self.base_endianness = base_endianness
-        self.alt_widths = alt_widths
+        self.alt_widths = sorted(alt_widths) if alt_widths is not None else None
         self._alias_names: List[str] = []
 
         # Grouped register members
@@ -572,6 +647,35 @@ class RegsRegister:
                     reg.add_bitfield(bitfield)
         return reg
 
+    def clone(self) -> "RegsRegister":
+        """Create independent copy of the register.
+
+        The register metadata are shared, the copy has its own value, bitfields, aliases,
+        sub registers and set value hooks.
+
+        :return: Copy of the register.
+        """
+        reg = copy.copy(self)
+        reg._bitfields = []
+        alias_regs: Dict[int, RegsRegister] = {}
+        for bitfield in self._bitfields:
+            if bitfield.parent is self:
+                reg._bitfields.append(bitfield.clone(reg))
+                continue
+            # bitfields taken over from the register aliased at the same offset keep their parent
+            alias_reg = alias_regs.get(id(bitfield.parent))
+            if alias_reg is None:
+                alias_reg = alias_regs[id(bitfield.parent)] = bitfield.parent.clone()
+            reg._bitfields.append(alias_reg._bitfields[bitfield.parent._bitfields.index(bitfield)])
+        reg._bitfield_index = {}
+        for bitfield in reg._bitfields:
+            reg._bitfield_index.setdefault(bitfield.name, bitfield)
+        reg._set_value_hooks = list(self._set_value_hooks)
+        reg._alias_names = list(self._alias_names)
+        reg.alt_widths = list(self.alt_widths) if self.alt_widths is not None else None
+        reg.sub_regs = [sub_reg.clone() for sub_reg in self.sub_regs]
+        return reg
+
     def add_alias(self, alias: str) -> None:
         """Add alias name to register.
 
@@ -681,7 +785,7 @@ class RegsRegister:
                     )
                     value = value.from_bytes(val_bytes, Endianness.LITTLE.value)
 
-            if self.has_group_registers():
+            if self.sub_regs:
                 # Update also values in sub registers
                 subreg_width = self.sub_regs[0].width
                 sub_regs = self.sub_regs[: alt_width // subreg_width]
@@ -714,7 +818,6 @@ class RegsRegister:
         alt_width = self.width
         if self.alt_widths:
             real_byte_cnt = get_bytes_cnt_of_int(value, align_to_2n=False)
-            self.alt_widths.sort()
             for alt in self.alt_widths:
                 if real_byte_cnt <= alt // 8:
                     alt_width = alt
@@ -726,7 +829,7 @@ class RegsRegister:
 
         :param raw: Do not use any modification hooks.
         """
-        if self.has_group_registers():
+        if self.sub_regs:
             # Update local value, by the sub register values
             subreg_width = self.sub_regs[0].width
             sub_regs_value = 0
@@ -740,13 +843,11 @@ class RegsRegister:
         else:
             value = self._value
 
-        alt_width = self.get_alt_width(value)
-
         if not raw and self.reverse:
             val_bytes = value_to_bytes(
                 value,
                 align_to_2n=False,
-                byte_cnt=alt_width // 8,
+                byte_cnt=self.get_alt_width(value) // 8,
                 endianness=self.base_endianness,
             )
             value = value.from_bytes(
@@ -805,6 +906,7 @@ class RegsRegister:
         :param bitfield: New bitfield value for register.
         """
         self._bitfields.append(bitfield)
+        self._bitfield_index.setdefault(bitfield.name, bitfield)
 
     def get_bitfields(self, exclude: Optional[List[str]] = None) -> List[RegsBitField]:
         """Returns register bitfields.
@@ -837,8 +939,13 @@ class RegsRegister:
         :return: Instance of the bitfield.
         :raises SPSDKRegsErrorBitfieldNotFound: The bitfield doesn't exist.
         """
+        bitfield = self._bitfield_index.get(name)
+        if bitfield:
+            return bitfield
+        # The bitfields list could be modified directly, so check it before giving up
         for bitfield in self._bitfields:
             if name == bitfield.name:
+                self._bitfield_index[name] = bitfield
                 return bitfield
 
         raise SPSDKRegsErrorBitfieldNotFound(f" The {name} is not found in register {self.name}.")
@@ -873,6 +980,106 @@ class RegsRegister:
         return output
 
 
+class RegistersCache:
+    """Cache of registers loaded from XML files with optional persistent storage on disk.
+
+    The registers are keyed by fingerprint of the XML file path, filtered registers, register
+    groups and base endianness. Each cached template is validated by the modification time and
+    size of its XML file. The templates are never handed out, the users get their clones.
+    """
+
+    def __init__(self, max_size: int = 64, cache: Optional[DatabaseCache] = None) -> None:
+        """Initialize the cache.
+
+        :param max_size: Maximal number of templates kept in memory
+        :param cache: Persistent cache of templates, SPSDK cache folder by default
+        """
+        self.max_size = max_size
+        self._cache = cache
+        self._templates: "OrderedDict[str, Tuple[Tuple[int, int], List[RegsRegister]]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __str__(self) -> str:
+        return (
+            f"Registers cache: {len(self)} templates, {self.hits} hits, "
+            f"{self.disk_hits} disk hits, {self.misses} misses"
+        )
+
+    @property
+    def cache(self) -> Optional[DatabaseCache]:
+        """Persistent cache of templates, None if the persistent cache is disabled."""
+        if SPSDK_CACHE_DISABLED:
+            return None
+        if self._cache is None:
+            self._cache = DatabaseCache(DatabaseManager.get_cache_filename()[0])
+        return self._cache
+
+    @staticmethod
+    def fingerprint(
+        xml: str,
+        filter_reg: Optional[List[str]],
+        grouped_regs: Optional[List[dict]],
+        base_endianness: Endianness,
+    ) -> str:
+        """Compute stable fingerprint of the registers template.
+
+        :param xml: Path to XML file.
+        :param filter_reg: List of register names that should be filtered out.
+        :param grouped_regs: List of register prefixes names to be grouped into one.
+        :param base_endianness: Base endianness of the registers.
+        :return: Fingerprint as hex string
+        """
+        items = [os.path.abspath(xml), filter_reg or [], grouped_regs or [], base_endianness.value]
+        data = json.dumps(items, sort_keys=True, default=repr)
+        return get_hash(data.encode(), algorithm=EnumHashAlgorithm.SHA1).hex()
+
+    def get_registers(
+        self, xml: str, key: str, loader: Callable[[], List[RegsRegister]]
+    ) -> List[RegsRegister]:
+        """Get clones of the registers, load them only if the template is not in the cache.
+
+        :param xml: Path to XML file the registers are loaded from.
+        :param key: Fingerprint of the template.
+        :param loader: Function loading the registers from the XML file.
+        :return: List of independent registers.
+        """
+        abs_path = os.path.abspath(xml)
+        stamp = DatabaseCache.file_stamp(abs_path)
+        entry = self._templates.get(key)
+        if entry and entry[0] == stamp:
+            self.hits += 1
+            self._templates.move_to_end(key)
+        else:
+            cached = self.cache.load("registers", key) if self.cache else None
+            if cached:
+                self.disk_hits += 1
+                template = cached[0]
+            else:
+                self.misses += 1
+                template = loader()
+                if self.cache:
+                    self.cache.store("registers", key, template, [abs_path])
+            entry = (stamp, template)
+            self._templates[key] = entry
+            if len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+        return [reg.clone() for reg in entry[1]]
+
+    def clear(self) -> None:
+        """Drop templates from memory, the disk cache is kept."""
+        self._templates.clear()
+
+
+registers_cache = RegistersCache()
+
+
 class Registers:
     """SPSDK Class for registers handling."""
 
@@ -886,6 +1093,13 @@ class Registers:
         self._registers: List[RegsRegister] = []
         self.dev_name = device_name
         self.base_endianness = base_endianness
+        # Indexes into the registers list, the lookups must return the first match in the list
+        self._name_index: Dict[str, int] = {}
+        self._alias_index: Dict[str, int] = {}
+        self._sub_reg_index: Dict[str, Tuple[int, RegsRegister]] = {}
+        self._offset_index: Dict[int, int] = {}
+        # Registers added with zero offset (e.g. groups) could get the offset later
+        self._zero_offset_regs: List[int] = []
 
     def __eq__(self, obj: Any) -> bool:
         """Compare if the objects has same settings."""
@@ -906,19 +1120,83 @@ class Registers:
         :return: Instance of the register.
         :raises SPSDKRegsErrorRegisterNotFound: The register doesn't exist.
         """
-        for reg in self._registers:
-            if name == reg.name:
-                return reg
-            if name in reg._alias_names:
-                return reg
-            if include_group_regs and reg.has_group_registers():
-                for sub_reg in reg.sub_regs:
-                    if name == sub_reg.name:
-                        return sub_reg
-
-        raise SPSDKRegsErrorRegisterNotFound(
-            f"The {name} is not found in loaded registers for {self.dev_name} device."
-        )
+        reg = self._lookup_reg(name, include_group_regs)
+        if reg is None:
+            # Aliases and group members could be added directly to the registers
+            self._rebuild_indexes()
+            reg = self._lookup_reg(name, include_group_regs)
+        if reg is None:
+            raise SPSDKRegsErrorRegisterNotFound(
+                f"The {name} is not found in loaded registers for {self.dev_name} device."
+            )
+        return reg
+
+    def _lookup_reg(self, name: str, include_group_regs: bool) -> Optional[RegsRegister]:
+        """Look up the register in indexes.
+
+        The first register in the list is returned if more registers match, the register name
+        and its aliases take precedence over its group members.
+
+        :param name: The name of the register.
+        :param include_group_regs: The algorithm will check also group registers.
+        :return: Instance of the register, None if not found.
+        """
+        candidates: List[Tuple[int, int, RegsRegister]] = []
+        for index in (self._name_index, self._alias_index):
+            position = index.get(name)
+            if position is not None:
+                reg = self._registers[position]
+                if name == reg.name or name in reg._alias_names:
+                    candidates.append((position, 0, reg))
+        if include_group_regs and name in self._sub_reg_index:
+            position, sub_reg = self._sub_reg_index[name]
+            if sub_reg in self._registers[position].sub_regs:
+                candidates.append((position, 1, sub_reg))
+        if not candidates:
+            return None
+        return min(candidates, key=lambda candidate: candidate[:2])[2]
+
+    def _index_register(self, position: int) -> None:
+        """Add the register at position in the registers list into indexes.
+
+        :param position: Position of the register in the registers list.
+        """
+        reg = self._registers[position]
+        self._name_index.setdefault(reg.name, position)
+        for alias in reg._alias_names:
+            self._alias_index.setdefault(alias, position)
+        for sub_reg in reg.sub_regs:
+            self._sub_reg_index.setdefault(sub_reg.name, (position, sub_reg))
+        if reg.offset:
+            self._offset_index.setdefault(reg.offset, position)
+        elif position not in self._zero_offset_regs:
+            self._zero_offset_regs.append(position)
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild all indexes from the registers list."""
+        self._name_index.clear()
+        self._alias_index.clear()
+        self._sub_reg_index.clear()
+        self._offset_index.clear()
+        self._zero_offset_regs.clear()
+        for position in range(len(self._registers)):
+            self._index_register(position)
+
+    def _find_reg_by_offset(self, offset: int) -> Optional[int]:
+        """Find position of the first register at the offset.
+
+        :param offset: Register offset.
+        :return: Position of the register in the registers list, None if not found.
+        """
+        positions = [
+            position
+            for position in self._zero_offset_regs
+            if self._registers[position].offset == offset
+        ]
+        position = self._offset_index.get(offset)
+        if position is not None and self._registers[position].offset == offset:
+            positions.append(position)
+        return min(positions) if positions else None
 
     def add_register(self, reg: RegsRegister) -> None:
         """Adds register into register list.
@@ -930,26 +1208,31 @@ class Registers:
         if not isinstance(reg, RegsRegister):
             raise SPSDKError("The 'reg' has invalid type.")
 
-        if reg.name in self.get_reg_names():
+        if reg.name in self._name_index:
             raise SPSDKRegsError(f"Cannot add register with same name: {reg.name}.")
 
-        for idx, register in enumerate(self._registers):
-            # TODO solve problem with group register that are always at 0 offset
-            if register.offset == reg.offset != 0:
-                logger.debug(
-                    f"Found register at the same offset {hex(reg.offset)}"
-                    f", adding {reg.name} as an alias to {register.name}"
-                )
-                self._registers[idx].add_alias(reg.name)
-                self._registers[idx]._bitfields.extend(reg._bitfields)
-                return
+        # TODO solve problem with group register that are always at 0 offset
+        idx = self._find_reg_by_offset(reg.offset) if reg.offset != 0 else None
+        if idx is not None:
+            register = self._registers[idx]
+            logger.debug(
+                f"Found register at the same offset {hex(reg.offset)}"
+                f", adding {reg.name} as an alias to {register.name}"
+            )
+            register.add_alias(reg.name)
+            self._alias_index.setdefault(reg.name, idx)
+            for bitfield in reg._bitfields:
+                register.add_bitfield(bitfield)
+            return
         # update base endianness for all registers in group
         reg.base_endianness = self.base_endianness
         self._registers.append(reg)
+        self._index_register(len(self._registers) - 1)
 
     def remove_registers(self) -> None:
         """Remove all registers."""
         self._registers.clear()
+        self._rebuild_indexes()
 
     def get_registers(
         self, exclude: Optional[List[str]] = None, include_group_regs: bool = False
@@ -1044,13 +1327,29 @@ class Registers:
 
         return image
 
+    def _get_size(self) -> int:
+        """Get minimal size of binary containing all registers.
+
+        :return: Size in bytes.
+        """
+        return max((reg.offset + reg.width // 8 for reg in self._registers), default=0)
+
     def export(self, size: int = 0, pattern: BinaryPattern = BinaryPattern("zeros")) -> bytes:
         """Export Registers into binary.
 
+        The register values are packed directly into one buffer, the layout is the same as
+        the layout of image returned by image_info method.
+
         :param size: Result size of Image, 0 means automatic minimal size.
         :param pattern: Pattern of gaps, defaults to "zeros"
         """
-        return self.image_info(size, pattern).export()
+        ret = bytearray(pattern.get_block(size or self._get_size()))
+        ret_view = memoryview(ret)
+        # registers at higher offsets overwrite the overlapping ones
+        for reg in sorted(self._registers, key=lambda reg: reg.offset):
+            data = reg.get_bytes_value(raw=True).ljust(reg.width // 8, b"\x00")
+            ret_view[reg.offset : reg.offset + len(data)] = data
+        return bytes(ret)
 
     def parse(self, binary: bytes) -> None:
         """Parse the binary data values into loaded registers.
@@ -1058,10 +1357,9 @@ class Registers:
         :param binary: Binary data to parse.
         """
         bin_len = len(binary)
-        if bin_len < len(self.image_info()):
-            logger.info(
-                f"Input binary is smaller than registers supports: {bin_len} != {len(self.image_info())}"
-            )
+        size = self._get_size()
+        if bin_len < size:
+            logger.info(f"Input binary is smaller than registers supports: {bin_len} != {size}")
         for reg in self.get_registers():
             if bin_len < reg.offset + reg.width // 8:
                 logger.debug(f"Parsing of binary block ends at {reg.name}")
@@ -1177,7 +1475,6 @@ class Registers:
         """
         return [item for item in items if not item.attrib["name"].startswith(tuple(names))]
 
-    # pylint: disable=dangerous-default-value
     def load_registers_from_xml(
         self,
         xml: str,
@@ -1186,19 +1483,51 @@ class Registers:
     ) -> None:
         """Function loads the registers from the given XML.
 
+        The registers loaded from XML file are cached, so the file is parsed just once.
+
+        :param xml: Input XML data in string format.
+        :param filter_reg: List of register names that should be filtered out.
+        :param grouped_regs: List of register prefixes names to be grouped into one.
+        :raises SPSDKRegsError: XML parse problem occurs.
+        """
+        if self._registers or not os.path.isfile(xml):
+            # registers are merged into the already loaded ones, which is not cached
+            self._load_registers_from_xml(xml, filter_reg, grouped_regs)
+            return
+
+        def loader() -> List[RegsRegister]:
+            regs = Registers(self.dev_name, self.base_endianness)
+            regs._load_registers_from_xml(xml, filter_reg, grouped_regs)
+            return regs._registers
+
+        key = registers_cache.fingerprint(xml, filter_reg, grouped_regs, self.base_endianness)
+        self._registers = registers_cache.get_registers(xml, key, loader)
+        self._rebuild_indexes()
+
+    def _load_registers_from_xml(
+        self,
+        xml: str,
+        filter_reg: Optional[List[str]] = None,
+        grouped_regs: Optional[List[dict]] = None,
+    ) -> None:
+        """Parse the XML and add its registers.
+
         :param xml: Input XML data in string format.
         :param filter_reg: List of register names that should be filtered out.
         :param grouped_regs: List of register prefixes names to be grouped into one.
         :raises SPSDKRegsError: XML parse problem occurs.
         """
+        groups = [
+            # pylint: disable=anomalous-backslash-in-string  # \d is a part of the regex pattern
+            (re.compile(f"{group['name']}" + r"\d+"), group)
+            for group in grouped_regs or []
+        ]
 
         def is_reg_in_group(reg: str) -> Union[dict, None]:
             """Help function to recognize if the register should be part of group."""
-            if grouped_regs:
-                for group in grouped_regs:
-                    # pylint: disable=anomalous-backslash-in-string  # \d is a part of the regex pattern
-                    if re.fullmatch(f"{group['name']}" + r"\d+", reg) is not None:
-                        return group
+            for pattern, group in groups:
+                if pattern.fullmatch(reg) is not None:
+                    return group
             return None
 
         try:
@@ -8,10 +8,11 @@
 
 import copy
 import io
+import json
 import logging
 import os
 from collections import OrderedDict
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import fastjsonschema
 from deepmerge import Merger, always_merger
@@ -22,7 +23,8 @@ from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap as CMap
 from ruamel.yaml.comments import CommentedSeq as CSeq
 
-from spsdk import SPSDK_YML_INDENT
+from spsdk import SPSDK_CACHE_DISABLED, SPSDK_YML_INDENT
+from spsdk.crypto.hash import EnumHashAlgorithm, get_hash
 from spsdk.exceptions import SPSDKError
 from spsdk.utils.misc import (
     find_dir,
@@ -35,6 +37,8 @@ from spsdk.utils.misc import (
 from spsdk.utils.spsdk_enum import SpsdkEnum
 
 ENABLE_DEBUG = False
+# name of the main function in the generated validation code
+VALIDATOR_FUNCTION = "spsdk_validator"
 
 logger = logging.getLogger(__name__)
 
@@ -164,6 +168,242 @@ def _print_validation_fail_reason(
     return message
 
 
+class ValidatorCache:
+    """LRU cache of compiled validators with optional persistent storage on disk.
+
+    Validators are keyed by fingerprint of the validation schemas and names of the formatters.
+    The implementations of callable formatters are not part of the validator, they are passed
+    to each validation, so the validators don't depend on per-call formatters like search paths.
+    Validation code of the compiled validators is stored in the SPSDK cache folder to be reused
+    by other processes. Fingerprints are memoized per schema objects, the schemas must not be
+    modified once they are validated.
+    """
+
+    def __init__(self, max_size: int = 64, cache_dir: Optional[str] = None) -> None:
+        """Initialize the cache.
+
+        :param max_size: Maximal number of validators kept in memory
+        :param cache_dir: Folder for the validation code, SPSDK cache folder by default
+        """
+        self.max_size = max_size
+        self._cache_dir = cache_dir
+        self._validators: "OrderedDict[str, Callable[..., Any]]" = OrderedDict()
+        # the schemas are kept with the fingerprint, so their ids are not reused
+        self._fingerprints: "OrderedDict[Tuple, Tuple[List[Dict[str, Any]], str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._validators)
+
+    def __str__(self) -> str:
+        return (
+            f"Validator cache: {len(self)} validators, {self.hits} hits, "
+            f"{self.disk_hits} disk hits, {self.misses} misses"
+        )
+
+    @property
+    def cache_dir(self) -> Optional[str]:
+        """Folder with the validation code, None if the persistent cache is disabled."""
+        if SPSDK_CACHE_DISABLED:
+            return None
+        if self._cache_dir is None:
+            # pylint: disable=import-outside-toplevel  # the database imports heavy dependencies
+            from spsdk.utils.database import DatabaseManager
+
+            self._cache_dir = os.path.join(DatabaseManager.get_cache_filename()[0], "validators")
+        return self._cache_dir
+
+    @staticmethod
+    def _format_kinds(formats: Dict[str, Any]) -> Dict[str, str]:
+        """Get names and regular expressions of the formatters, callables are not distinguished."""
+        return {
+            name: value if isinstance(value, str) else "callable" for name, value in formats.items()
+        }
+
+    @staticmethod
+    def fingerprint(schemas: List[Dict[str, Any]], formats: Dict[str, Any]) -> str:
+        """Compute stable fingerprint of the validator.
+
+        The merged schema is fully determined by the list of schemas, so the schemas don't
+        have to be merged to get the fingerprint.
+
+        :param schemas: List of validation schemas
+        :param formats: Formatters, only names and regular expressions are used
+        :return: Fingerprint as hex string
+        """
+        format_kinds = ValidatorCache._format_kinds(formats)
+        items = [fastjsonschema.VERSION, schemas, format_kinds]
+        try:
+            data = json.dumps(items, sort_keys=True, default=repr)
+        except TypeError:
+            data = repr(items)
+        return get_hash(data.encode(), algorithm=EnumHashAlgorithm.SHA256).hex()
+
+    def _get_fingerprint(self, schemas: List[Dict[str, Any]], formats: Dict[str, Any]) -> str:
+        """Get fingerprint of the validator, memoized per schema objects.
+
+        :param schemas: List of validation schemas
+        :param formats: Formatters, only names and regular expressions are used
+        :return: Fingerprint as hex string
+        """
+        key = (
+            tuple(id(schema) for schema in schemas),
+            tuple(sorted(self._format_kinds(formats).items())),
+        )
+        memo = self._fingerprints.get(key)
+        if memo:
+            self._fingerprints.move_to_end(key)
+            return memo[1]
+        fingerprint = self.fingerprint(schemas, formats)
+        self._fingerprints[key] = (list(schemas), fingerprint)
+        if len(self._fingerprints) > self.max_size:
+            self._fingerprints.popitem(last=False)
+        return fingerprint
+
+    def get_validator(
+        self, schemas: List[Dict[str, Any]], formats: Dict[str, Any]
+    ) -> Callable[..., Any]:
+        """Get validator of schemas, compile it if it's not in the cache.
+
+        The validator has to be called with the formatters: validator(data, custom_formats=...)
+
+        :param schemas: List of validation schemas
+        :param formats: Formatters used by the schemas
+        :return: Validation function
+        :raises SPSDKError: Invalid validation schema
+        """
+        key = self._get_fingerprint(schemas, formats)
+        validator = self._validators.get(key)
+        if validator:
+            self.hits += 1
+            self._validators.move_to_end(key)
+            return validator
+        validator = self._load(key)
+        if validator:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            code = get_validator_code(merge_schemas(schemas), formats)
+            validator = _exec_validator_code(code)
+            self._store(key, code)
+        self._validators[key] = validator
+        if len(self._validators) > self.max_size:
+            self._validators.popitem(last=False)
+        return validator
+
+    def clear(self) -> None:
+        """Drop validators from memory, the disk cache is kept."""
+        self._validators.clear()
+        self._fingerprints.clear()
+
+    def _load(self, key: str) -> Optional[Callable[..., Any]]:
+        """Load validator from the disk cache."""
+        if not self.cache_dir:
+            return None
+        path = os.path.join(self.cache_dir, f"validator_{key}.py")
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return _exec_validator_code(f.read(), path)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.debug(f"Cannot load cached validator {path}: {str(exc)}")
+            return None
+
+    def _store(self, key: str, code: str) -> None:
+        """Store validation code into the disk cache."""
+        if not self.cache_dir:
+            return
+        path = os.path.join(self.cache_dir, f"validator_{key}.py")
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write under a temporary name first, other processes may read the cache
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(code)
+            os.replace(tmp_path, path)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.debug(f"Cannot store validator into cache {path}: {str(exc)}")
+
+
+def merge_schemas(schemas: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge list of validation schemas into one schema.
+
+    :param schemas: List of validation schemas
+    :return: Merged schema, the input schemas are not modified
+    """
+    schema: Dict[str, Any] = {}
+    for sch in schemas:
+        always_merger.merge(schema, copy.deepcopy(sch))
+    return schema
+
+
+def get_validator_code(schema: Dict[str, Any], formats: Dict[str, Any]) -> str:
+    """Generate python code of validator.
+
+    :param schema: Validation schema
+    :param formats: Formatters used by the schema
+    :return: Source code of the validation function
+    :raises SPSDKError: Invalid validation schema
+    """
+    try:
+        code = fastjsonschema.compile_to_code(schema, formats=formats)
+        # the main function is named after the scope of the schema, alias it by a fixed name
+        main_function = fastjsonschema.RefResolver.from_schema(schema).get_scope_name()
+    except (TypeError, fastjsonschema.JsonSchemaDefinitionException) as exc:
+        raise SPSDKError(f"Invalid validation schema to check config: {str(exc)}") from exc
+    return f"{code}\n{VALIDATOR_FUNCTION} = {main_function}\n"
+
+
+def _exec_validator_code(code: str, file_name: str = "<validator>") -> Callable[..., Any]:
+    """Execute the validation code and return the main validation function."""
+    namespace: Dict[str, Any] = {}
+    exec(compile(code, file_name, "exec"), namespace)  # pylint: disable=exec-used  # nosec
+    validator = namespace.get(VALIDATOR_FUNCTION)
+    if not callable(validator):
+        raise SPSDKError(f"Invalid validation code, function {VALIDATOR_FUNCTION} not found")
+    return validator
+
+
+validator_cache = ValidatorCache()
+
+
+def get_formatters(
+    search_paths: Optional[List[str]] = None,
+    extra_formatters: Optional[Dict[str, Callable[[str], bool]]] = None,
+) -> Dict[str, Any]:
+    """Get custom formatters used to validate the configurations.
+
+    :param search_paths: List of paths where to search for the files, defaults to None
+    :param extra_formatters: Additional custom formatters
+    :return: Dictionary of formatters
+    """
+    custom_formatters: Dict[str, Callable[[str], bool]] = {
+        "dir": lambda x: bool(find_dir(x, search_paths=search_paths, raise_exc=False)),
+        "file": lambda x: bool(find_file(x, search_paths=search_paths, raise_exc=False)),
+        "file_name": lambda x: os.path.basename(x.replace("\\", "/")) not in ("", None),
+        "optional_file": lambda x: not x
+        or bool(find_file(x, search_paths=search_paths, raise_exc=False)),
+        "number": _is_number,
+        "hex_value": _is_hex_number,
+    }
+    return always_merger.merge(custom_formatters, extra_formatters or {})
+
+
+def warm_validator(
+    schemas: List[Dict[str, Any]],
+    extra_formatters: Optional[Dict[str, Callable[[str], bool]]] = None,
+) -> None:
+    """Compile the validator of schemas into the validator cache in advance.
+
+    :param schemas: List of validation schemas
+    :param extra_formatters: Additional custom formatters the schemas are checked with
+    """
+    validator_cache.get_validator(schemas, get_formatters(extra_formatters=extra_formatters))
+
+
 def check_config(
     config: Union[str, Dict[str, Any]],
     schemas: List[Dict[str, Any]],
@@ -178,15 +418,6 @@ def check_config(
     :param search_paths: List of paths where to search for the file, defaults to None
     :raises SPSDKError: Invalid validation schema or configuration
     """
-    custom_formatters: Dict[str, Callable[[str], bool]] = {
-        "dir": lambda x: bool(find_dir(x, search_paths=search_paths, raise_exc=False)),
-        "file": lambda x: bool(find_file(x, search_paths=search_paths, raise_exc=False)),
-        "file_name": lambda x: os.path.basename(x.replace("\\", "/")) not in ("", None),
-        "optional_file": lambda x: not x
-        or bool(find_file(x, search_paths=search_paths, raise_exc=False)),
-        "number": _is_number,
-        "hex_value": _is_hex_number,
-    }
     if isinstance(config, str):
         config_to_check = load_configuration(config)
         config_dir = os.path.dirname(config)
@@ -197,28 +428,12 @@ def check_config(
     else:
         config_to_check = copy.deepcopy(config)
 
-    schema: Dict[str, Any] = {}
-    for sch in schemas:
-        always_merger.merge(schema, copy.deepcopy(sch))
-    validator = None
-    formats = always_merger.merge(custom_formatters, extra_formatters or {})
+    formats = get_formatters(search_paths, extra_formatters)
+    if ENABLE_DEBUG:
+        write_file(get_validator_code(merge_schemas(schemas), formats), "validator_file.py")
+    validator = validator_cache.get_validator(schemas, formats)
     try:
-        if ENABLE_DEBUG:
-            validator_code = fastjsonschema.compile_to_code(schema, formats=formats)
-            write_file(validator_code, "validator_file.py")
-        else:
-            validator = fastjsonschema.compile(schema, formats=formats)
-    except (TypeError, fastjsonschema.JsonSchemaDefinitionException) as exc:
-        raise SPSDKError(f"Invalid validation schema to check config: {str(exc)}") from exc
-    try:
-        if ENABLE_DEBUG:
-            # pylint: disable=import-error,import-outside-toplevel
-            import validator_file
-
-            validator_file.validate(config_to_check, formats)
-        else:
-            assert validator is not None
-            validator(config_to_check)
+        validator(config_to_check, custom_formats=formats)
     except fastjsonschema.JsonSchemaValueException as exc:
         message = _print_validation_fail_reason(exc, formats)
         raise SPSDKError(f"Configuration validation failed: {message}") from exc
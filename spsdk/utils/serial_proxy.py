@@ -74,6 +74,11 @@ class SerialProxy:
         self.buffer = self.responses[data]
         logger.debug(f"setting buffer to: '{self.buffer!r}'")
 
+    @property
+    def in_waiting(self) -> int:
+        """Amount of pre-configured data not read yet."""
+        return len(self.buffer)
+
     def read(self, length: int) -> bytes:
         """Read portion of pre-configured data.
 
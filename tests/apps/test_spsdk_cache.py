@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from unittest.mock import patch
+
+from spsdk.apps import spsdk_cache
+from tests.cli_runner import CliRunner
+
+
+def test_spsdk_cache_warm(cli_runner: CliRunner):
+    warmers = [("Database", spsdk_cache.warm_database), ("Dummy", lambda: 42)]
+    with patch("spsdk.apps.spsdk_cache.CACHE_WARMERS", warmers):
+        result = cli_runner.invoke(spsdk_cache.main, ["warm"])
+    assert "Database:" in result.output
+    assert "Dummy: 42 items cached" in result.output
+
+
+def test_spsdk_cache_warm_disabled(cli_runner: CliRunner):
+    with patch("spsdk.apps.spsdk_cache.SPSDK_CACHE_DISABLED", True):
+        cli_runner.invoke(spsdk_cache.main, ["warm"], expected_code=1)
+
+
+def test_spsdk_cache_clear(cli_runner: CliRunner, tmpdir):
+    with patch(
+        "spsdk.utils.database.DatabaseManager.get_cache_filename",
+        return_value=(str(tmpdir), str(tmpdir.join("db"))),
+    ):
+        result = cli_runner.invoke(spsdk_cache.main, ["clear"])
+        assert not tmpdir.exists()
+        result = cli_runner.invoke(spsdk_cache.main, ["clear"])
+    assert "SPSDK cache has been cleared." in result.output
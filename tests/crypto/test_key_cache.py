@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+"""Tests for the process-wide key cache."""
+import os
+from unittest.mock import patch
+
+import pytest
+
+from spsdk.crypto.key_cache import KeyCache
+from spsdk.crypto.keys import (
+    PrivateKey,
+    PrivateKeyEcc,
+    PrivateKeyRsa,
+    PublicKey,
+    SPSDKWrongKeyPassphrase,
+)
+from spsdk.crypto.signature_provider import PlainFileSP
+from spsdk.crypto.utils import extract_public_key
+
+
+@pytest.fixture
+def key_cache():
+    cache = KeyCache(max_size=4)
+    with patch("spsdk.crypto.keys.key_cache", cache), patch("spsdk.crypto.utils.key_cache", cache):
+        yield cache
+
+
+def test_key_cache_private_key(key_cache: KeyCache, tmpdir):
+    key_path = os.path.join(tmpdir, "key.pem")
+    PrivateKeyEcc.generate_key().save(key_path)
+    key = PrivateKey.load(key_path)
+    assert PrivateKey.load(key_path) is key
+    assert PlainFileSP(key_path).private_key is key
+    assert (key_cache.hits, key_cache.misses) == (2, 1)
+    # the public key is cached separately from the private key
+    public_key = extract_public_key(key_path)
+    assert extract_public_key(key_path) is public_key
+    assert public_key == key.get_public_key()
+    assert (key_cache.hits, key_cache.misses) == (3, 2)
+    assert "2 keys, 3 hits, 2 misses" in str(key_cache)
+
+
+def test_key_cache_changed_file(key_cache: KeyCache, tmpdir):
+    key_path = os.path.join(tmpdir, "key.pem")
+    PrivateKeyEcc.generate_key().save(key_path)
+    key = PrivateKey.load(key_path)
+    # same size, rewritten immediately
+    PrivateKeyEcc.generate_key().save(key_path)
+    new_key = PrivateKey.load(key_path)
+    assert new_key != key
+    assert key_cache.misses == 2
+
+
+def test_key_cache_password(key_cache: KeyCache, tmpdir):
+    key_path = os.path.join(tmpdir, "key.pem")
+    PrivateKeyEcc.generate_key().save(key_path, password="secret")
+    key = PrivateKey.load(key_path, password="secret")
+    assert PrivateKey.load(key_path, password="secret") is key
+    with pytest.raises(SPSDKWrongKeyPassphrase):
+        PrivateKey.load(key_path, password="wrong")
+    assert key_cache.hits == 1
+    assert len(key_cache) == 1
+
+
+def test_key_cache_eviction(key_cache: KeyCache, tmpdir):
+    paths = []
+    for idx in range(6):
+        paths.append(os.path.join(tmpdir, f"key{idx}.pem"))
+        PrivateKeyEcc.generate_key().get_public_key().save(paths[-1])
+        PublicKey.load(paths[-1])
+    assert len(key_cache) == 4
+    assert key_cache.evictions == 2
+    PublicKey.load(paths[0])
+    assert key_cache.misses == 7
+    key_cache.clear()
+    assert len(key_cache) == 0
+
+
+def test_key_cache_disabled(tmpdir):
+    key_path = os.path.join(tmpdir, "key.pem")
+    PrivateKeyEcc.generate_key().save(key_path)
+    cache = KeyCache(enabled=False)
+    with patch("spsdk.crypto.keys.key_cache", cache):
+        assert PrivateKey.load(key_path) is not PrivateKey.load(key_path)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+
+def test_key_cache_rsa_reload(key_cache: KeyCache, data_dir):
+    """Reloading of the RSA key returns the cached key instead of parsing it again."""
+    key_path = os.path.join(data_dir, "selfsign_privatekey_rsa2048.pem")
+    key = PrivateKeyRsa.load(key_path)
+    for _ in range(10):
+        assert PrivateKeyRsa.load(key_path) is key
+    assert (key_cache.hits, key_cache.misses) == (10, 1)
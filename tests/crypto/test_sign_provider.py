@@ -7,6 +7,7 @@
 """Tests for Signature Provider interface."""
 import os
 from os import path
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -18,9 +19,9 @@ from spsdk.crypto.keys import (
     PublicKeySM2,
     get_supported_keys_generators,
 )
-from spsdk.crypto.signature_provider import SignatureProvider, get_signature_provider
+from spsdk.crypto.signature_provider import HttpProxySP, SignatureProvider, get_signature_provider
 from spsdk.crypto.types import SPSDKEncoding
-from spsdk.exceptions import SPSDKKeyError
+from spsdk.exceptions import SPSDKError, SPSDKKeyError
 from spsdk.utils.misc import write_file
 
 
@@ -136,3 +137,55 @@ def test_get_signature_provider(sp_cfg, sp_type, parsed_args, exception):
         sp = get_signature_provider(sp_cfg)
         assert sp.sp_type == sp_type
         assert sp.kwargs == parsed_args
+
+
+def proxy_response(data=None, status_code=200):
+    response = MagicMock(status_code=status_code, ok=status_code == 200, reason="")
+    response.json.return_value = {"data": data}
+    return response
+
+
+def test_proxy_sign_batch():
+    sp = HttpProxySP(key_type="IMG")
+    responses = [proxy_response(["aa" * 64, "bb" * 64]), proxy_response(64)]
+    with patch.object(sp.session, "get", side_effect=responses) as get:
+        signatures = sp.get_signatures([b"first", b"second"])
+        # the signature length is cached
+        assert sp.signature_length == 64
+    assert signatures == [b"\xaa" * 64, b"\xbb" * 64]
+    assert get.call_count == 2
+    assert get.call_args_list[0].kwargs["url"] == "http://localhost:8000/api/sign_batch"
+    assert get.call_args_list[0].kwargs["json"] == {
+        "data": [b"first".hex(), b"second".hex()],
+        "key_type": "IMG",
+    }
+
+
+def test_proxy_sign_batch_unsupported():
+    sp = HttpProxySP()
+    responses = [proxy_response(status_code=404), proxy_response("aa"), proxy_response("bb")]
+    with patch.object(sp.session, "get", side_effect=responses) as get:
+        assert sp.sign_batch([b"first", b"second"]) == [b"\xaa", b"\xbb"]
+    assert [call.kwargs["url"].split("/")[-1] for call in get.call_args_list] == [
+        "sign_batch",
+        "sign",
+        "sign",
+    ]
+    # the batch endpoint is not requested again
+    with patch.object(sp.session, "get", side_effect=[proxy_response("cc")] * 2) as get:
+        assert sp.sign_batch([b"third", b"fourth"]) == [b"\xcc", b"\xcc"]
+    assert get.call_count == 2
+
+
+def test_proxy_sign_batch_invalid_count():
+    sp = HttpProxySP()
+    with patch.object(sp.session, "get", return_value=proxy_response(["aa"])):
+        with pytest.raises(SPSDKError, match="1 signatures instead of 2"):
+            sp.sign_batch([b"first", b"second"])
+
+
+def test_proxy_equality():
+    assert HttpProxySP(key_type="IMG") == HttpProxySP(key_type="IMG")
+    assert len({HttpProxySP(key_type="IMG"), HttpProxySP(key_type="IMG")}) == 1
+    assert HttpProxySP(key_type="IMG") != HttpProxySP(key_type="CSF")
+    assert HttpProxySP(port="8001") != HttpProxySP()
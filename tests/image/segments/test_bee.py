@@ -5,16 +5,18 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-from typing import Optional
+from typing import List, Optional
 
 import pytest
 
 from spsdk.crypto.rng import random_bytes
 from spsdk.exceptions import SPSDKError
 from spsdk.image.bee import (
+    BEE_ENCR_BLOCK_SIZE,
     BeeBaseClass,
     BeeFacRegion,
     BeeKIB,
+    BeeNxp,
     BeeProtectRegionBlock,
     BeeRegionHeader,
 )
@@ -225,3 +227,49 @@ def test_seg_bee_invalid_encrypt_data() -> None:
     seg = SegBEE([])
     with pytest.raises(SPSDKError, match="Invalid start address"):
         seg.encrypt_data(start_addr=0xFFFFFFFFFFFFFFFFFFFF, data=bytes(16))
+
+
+def reference_encrypt(headers: List[BeeRegionHeader], start_addr: int, data: bytes) -> bytes:
+    """Encryption of each block with its own counter and cipher."""
+    result = bytearray()
+    for offset in range(0, len(data), BEE_ENCR_BLOCK_SIZE):
+        block = data[offset : offset + BEE_ENCR_BLOCK_SIZE]
+        for header in headers:
+            block = header.encrypt_block(start_addr + offset, block)
+        result += block
+    return bytes(result)
+
+
+def test_bee_encrypt_data() -> None:
+    hdr = BeeRegionHeader(sw_key=random_bytes(16))
+    hdr.add_fac(BeeFacRegion(0x60002000, 0x3000, 0))
+    hdr.add_fac(BeeFacRegion(0x60008000, 0x1000, 1))
+    # overlapping region, the first FAC region containing the block is used
+    hdr.add_fac(BeeFacRegion(0x60000000, 0x2800, 2))
+    hdr2 = BeeRegionHeader(sw_key=random_bytes(16))
+    hdr2.add_fac(BeeFacRegion(0x6000A000, 0x1000, 0))
+    data = random_bytes(0xB000 + 0x40)
+    image = BeeNxp([hdr, hdr2], data, 0x60000000).export_image()
+    assert image == reference_encrypt([hdr, hdr2], 0x60000000, data)
+    # data out of any FAC region are untouched
+    assert image[0x5000:0x8000] == data[0x5000:0x8000]
+    assert image[0xB000:] == data[0xB000:]
+    assert hdr.encrypt_data(0x70000000, data) == data
+
+
+def test_bee_encrypt_data_invalid_range() -> None:
+    hdr = BeeRegionHeader(sw_key=random_bytes(16))
+    hdr.add_fac(BeeFacRegion(0x60000000, 0x1000, 0))
+    with pytest.raises(SPSDKError, match="Invalid range of region"):
+        hdr.encrypt_data(0x60000200, random_bytes(0x1000))
+
+
+def test_bee_encrypt_single_region() -> None:
+    """Image is encrypted by the only configured region, the data before it are kept."""
+    hdr = BeeRegionHeader(sw_key=random_bytes(16))
+    hdr.add_fac(BeeFacRegion(0x60001000, 0x3000, 0))
+    hdr.add_fac(BeeFacRegion(0x60004000, 0x2000, 1))
+    data = random_bytes(0x6000)
+    image = BeeNxp([hdr, None], data, 0x60000000).export_image()
+    assert image[:0x1000] == data[:0x1000]
+    assert image[0x1000:] == reference_encrypt([hdr], 0x60001000, data[0x1000:])
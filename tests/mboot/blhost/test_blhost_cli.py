@@ -136,9 +136,7 @@ data_responses_buspal_i2c = {
         b"\x01",
         b"\xa4",
         b"\x01",
-        b"\x0c\x00",
-        b"\x01",
-        b"\x65\x1c",
+        b"\x0c\x00\x65\x1c",
         b"\x01",
         b"\xa7\x00\x00\x02\x00\x00\x00\x00\x00\x00\x03\x4b",
     ],
@@ -178,9 +176,7 @@ data_responses_buspal_spi = {
         b"\x01",
         b"\xa4",
         b"\x01",
-        b"\x0c\x00",
-        b"\x01",
-        b"\x65\x1c",
+        b"\x0c\x00\x65\x1c",
         b"\x01",
         b"\xa7\x00\x00\x02\x00\x00\x00\x00\x00\x00\x03\x4b",
     ],
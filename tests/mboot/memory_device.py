@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""In-memory MBoot target speaking the USB-HID bulk framing."""
+
+from collections import Counter, deque
+from struct import pack, unpack_from
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from spsdk.mboot.commands import CmdHeader, CommandFlag, CommandTag, ResponseTag
+from spsdk.mboot.error_codes import StatusCode
+from spsdk.mboot.interfaces.usb import MbootUSBInterface
+from spsdk.mboot.properties import PropertyTag
+from spsdk.mboot.protocol.bulk_protocol import ReportId
+from spsdk.utils.exceptions import SPSDKTimeoutError
+from spsdk.utils.interfaces.device.usb_device import UsbDevice
+
+
+class MemoryUsbDevice(UsbDevice):
+    """USB device emulating a bootloader with a single internal flash in host memory.
+
+    Commands are queued in the same way as in the HID OUT endpoint of a real target.
+    Every command which is not already waiting in the queue when the target finishes
+    the previous one costs one bus turnaround, counted in `turnarounds`.
+    """
+
+    VERSION = 0x4B030000  # K3.0.0
+
+    def __init__(
+        self,
+        start: int = 0,
+        size: int = 0x10000,
+        sector_size: int = 0x1000,
+        max_packet_size: int = 32,
+        name: str = "memory",
+    ) -> None:
+        # pylint: disable=super-init-not-called   # don't create the libusbsio device
+        self._opened = False
+        self._timeout = 1000
+        self.vid = 0x1FC9
+        self.pid = 0x0000
+        self.path = name.encode()
+        self.serial_number = name
+        self.vendor_name = "NXP"
+        self.product_name = name
+        self.interface_number = 0
+        self.start = start
+        self.sector_size = sector_size
+        self.max_packet_size = max_packet_size
+        self.memory = bytearray(b"\xff" * size)
+        self.properties: Dict[int, List[int]] = {
+            PropertyTag.CURRENT_VERSION.tag: [self.VERSION],
+            PropertyTag.FLASH_START_ADDRESS.tag: [start],
+            PropertyTag.FLASH_SIZE.tag: [size],
+            PropertyTag.FLASH_SECTOR_SIZE.tag: [sector_size],
+            PropertyTag.MAX_PACKET_SIZE.tag: [max_packet_size],
+            PropertyTag.RAM_START_ADDRESS.tag: [0x2000_0000],
+            PropertyTag.RAM_SIZE.tag: [0x8000],
+        }
+        self.commands: Counter = Counter()
+        self.turnarounds = 0
+        self._queue: Deque[Tuple[int, List[int], bool]] = deque()
+        self._responses: Deque[bytes] = deque()
+        self._data_phase: Optional[Tuple[int, int, int, bytearray]] = None
+
+    def __str__(self) -> str:
+        return f"MemoryUsbDevice({self.product_name})"
+
+    def open(self) -> None:
+        self._opened = True
+
+    def close(self) -> None:
+        self._opened = False
+
+    def read(self, length: int, timeout: Optional[int] = None) -> bytes:
+        if not self._responses and self._queue:
+            tag, params, queued = self._queue.popleft()
+            if not queued:
+                self.turnarounds += 1
+            self._process(tag, params)
+        if not self._responses:
+            raise SPSDKTimeoutError()
+        return self._responses.popleft()
+
+    def write(self, data: bytes, timeout: Optional[int] = None) -> None:
+        report_id, _, length = unpack_from("<2BH", data)
+        payload = data[4 : 4 + length]
+        if report_id == ReportId.DATA_OUT.tag:
+            self._receive_data(payload)
+            return
+        header = CmdHeader.from_bytes(payload)
+        params = list(unpack_from(f"<{header.params_count}I", payload, CmdHeader.SIZE))
+        if header.flags == CommandFlag.HAS_DATA_PHASE.tag:
+            # data phase follows immediately, the command can't wait in the queue
+            self._process(header.tag, params)
+            return
+        queued = bool(self._queue) or bool(self._responses)
+        self._queue.append((header.tag, params, queued))
+
+    def _respond(self, tag: ResponseTag, *params: int) -> None:
+        data = pack(f"<4B{len(params)}I", tag.tag, 0, 0, len(params), *params)
+        self._responses.append(pack("<2BH", ReportId.CMD_IN.tag, 0, len(data)) + data)
+
+    def _generic(self, status: StatusCode, cmd_tag: int) -> None:
+        self._respond(ResponseTag.GENERIC, status.tag, cmd_tag)
+
+    def _offset(self, address: int, length: int) -> Optional[int]:
+        offset = address - self.start
+        if offset < 0 or offset + length > len(self.memory):
+            return None
+        return offset
+
+    def _process(self, tag: int, params: List[int]) -> None:
+        self.commands[tag] += 1
+        if tag == CommandTag.GET_PROPERTY.tag:
+            values = self.properties.get(params[0])
+            if values is None:
+                self._respond(ResponseTag.GET_PROPERTY, StatusCode.UNKNOWN_PROPERTY.tag)
+            else:
+                self._respond(ResponseTag.GET_PROPERTY, StatusCode.SUCCESS.tag, *values)
+        elif tag == CommandTag.READ_MEMORY.tag:
+            address, length = params[0], params[1]
+            offset = self._offset(address, length)
+            if offset is None:
+                self._respond(ResponseTag.READ_MEMORY, StatusCode.MEMORY_RANGE_INVALID.tag, 0)
+                return
+            self._respond(ResponseTag.READ_MEMORY, StatusCode.SUCCESS.tag, length)
+            for idx in range(offset, offset + length, self.max_packet_size):
+                chunk = self.memory[idx : min(idx + self.max_packet_size, offset + length)]
+                self._responses.append(pack("<2BH", ReportId.DATA_IN.tag, 0, len(chunk)) + chunk)
+            self._generic(StatusCode.SUCCESS, tag)
+        elif tag == CommandTag.WRITE_MEMORY.tag:
+            address, length = params[0], params[1]
+            offset = self._offset(address, length)
+            if offset is None:
+                self._generic(StatusCode.MEMORY_RANGE_INVALID, tag)
+                return
+            self._data_phase = (tag, offset, length, bytearray())
+            self._generic(StatusCode.SUCCESS, tag)
+        elif tag == CommandTag.FLASH_ERASE_REGION.tag:
+            address, length = params[0], params[1]
+            offset = self._offset(address, length)
+            if offset is None:
+                self._generic(StatusCode.FLASH_ADDRESS_ERROR, tag)
+            elif offset % self.sector_size or length % self.sector_size:
+                self._generic(StatusCode.FLASH_ALIGNMENT_ERROR, tag)
+            else:
+                self.memory[offset : offset + length] = b"\xff" * length
+                self._generic(StatusCode.SUCCESS, tag)
+        elif tag == CommandTag.FLASH_ERASE_ALL.tag:
+            self.memory[:] = b"\xff" * len(self.memory)
+            self._generic(StatusCode.SUCCESS, tag)
+        elif tag == CommandTag.RESET.tag:
+            self._generic(StatusCode.SUCCESS, tag)
+        else:
+            self._generic(StatusCode.UNKNOWN_COMMAND, tag)
+
+    def _receive_data(self, data: bytes) -> None:
+        assert self._data_phase
+        tag, offset, length, buffer = self._data_phase
+        buffer.extend(data)
+        if len(buffer) < length:
+            return
+        self._data_phase = None
+        # NOR flash semantic: programming can only clear bits
+        for idx, value in enumerate(buffer):
+            self.memory[offset + idx] &= value
+        self._generic(StatusCode.SUCCESS, tag)
+
+
+def memory_interface(**kwargs: Any) -> MbootUSBInterface:
+    """Create USB MBoot interface connected to in-memory target."""
+    return MbootUSBInterface(MemoryUsbDevice(**kwargs))
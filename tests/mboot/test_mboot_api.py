@@ -5,6 +5,8 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import io
+
 import pytest
 
 from spsdk.exceptions import SPSDKError
@@ -61,6 +63,29 @@ def test_cmd_read_memory_callback(mcuboot: McuBoot, target):
     assert iteration_counter == 1
 
 
+def test_cmd_read_memory_into_buffer(mcuboot: McuBoot, target):
+    mcuboot._interface.device.fail_step = None
+    buffer = bytearray(b"\xff" * 3010)
+    assert mcuboot.read_memory_into(0, memoryview(buffer)[:3000]) == 3000
+    assert mcuboot.status_code == StatusCode.SUCCESS
+    assert buffer == bytes(3000) + b"\xff" * 10
+
+
+def test_cmd_read_memory_into_file(mcuboot: McuBoot, target):
+    mcuboot._interface.device.fail_step = None
+    output = io.BytesIO()
+    assert mcuboot.read_memory_into(0, output, 3000) == 3000
+    assert mcuboot.status_code == StatusCode.SUCCESS
+    assert output.getvalue() == bytes(3000)
+
+
+def test_cmd_read_memory_into_invalid(mcuboot: McuBoot):
+    with pytest.raises(McuBootError):
+        mcuboot.read_memory_into(0, bytearray(10), 20)
+    with pytest.raises(McuBootError):
+        mcuboot.read_memory_into(0, io.BytesIO())
+
+
 def test_cmd_read_memory_data_abort(mcuboot: McuBoot, target):
     mcuboot._interface.device.fail_step = StatusCode.FLASH_OUT_OF_DATE_CFPA_PAGE.tag
     mcuboot.read_memory(0, 1000)
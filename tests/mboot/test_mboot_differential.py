@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from spsdk.apps import blhost
+from spsdk.mboot.commands import CommandTag
+from spsdk.mboot.differential import write_memory_differential
+from spsdk.mboot.exceptions import McuBootError
+from spsdk.mboot.mcuboot import McuBoot
+from spsdk.mboot.properties import PropertyTag
+from tests.cli_runner import CliRunner
+from tests.mboot.memory_device import memory_interface
+
+SECTOR = 0x400
+
+
+@pytest.fixture
+def memory_mboot():
+    interface = memory_interface(size=0x4000, sector_size=SECTOR, max_packet_size=64)
+    interface.device.memory[:] = os.urandom(0x4000)
+    with McuBoot(interface) as mboot:
+        yield mboot
+
+
+def commands(mboot: McuBoot, tag: CommandTag) -> int:
+    return mboot._interface.device.commands[tag.tag]
+
+
+def test_get_sector_size(memory_mboot: McuBoot):
+    assert memory_mboot.get_sector_size(0x100) == SECTOR
+    assert memory_mboot.get_sector_size(0x100, mem_id=9) is None
+
+
+def test_differential_unchanged(memory_mboot: McuBoot):
+    memory = memory_mboot._interface.device.memory
+    report = write_memory_differential(memory_mboot, 0x800, bytes(memory[0x800:0x2000]))
+    assert report.success
+    assert report.sectors == 6
+    assert report.skipped == list(range(0x800, 0x2000, SECTOR))
+    assert not report.programmed
+    assert report.time_saved is None
+    assert commands(memory_mboot, CommandTag.FLASH_ERASE_REGION) == 0
+    assert commands(memory_mboot, CommandTag.WRITE_MEMORY) == 0
+
+
+def test_differential_changed_sectors(memory_mboot: McuBoot):
+    memory = memory_mboot._interface.device.memory
+    original = bytes(memory)
+    data = bytearray(memory[0x100:0x2100])
+    # two neighboring sectors and one separate sector change
+    data[0x300] ^= 0xFF
+    data[0x700:0x800] = os.urandom(0x100)
+    data[0x1F00] ^= 0x01
+    progress = []
+    report = write_memory_differential(
+        memory_mboot, 0x100, bytes(data), progress_callback=lambda x, y: progress.append((x, y))
+    )
+    assert report.success
+    assert report.address == 0 and report.length == 0x2400
+    assert report.programmed == [0x400, 0x800, 0x2000]
+    assert len(report.skipped) == 6
+    assert report.time_saved is not None
+    # neighboring sectors are erased and written at once
+    assert commands(memory_mboot, CommandTag.FLASH_ERASE_REGION) == 2
+    assert commands(memory_mboot, CommandTag.WRITE_MEMORY) == 2
+    assert memory[0x100:0x2100] == data
+    # parts of the sectors outside of data keep their content
+    assert memory[:0x100] == original[:0x100]
+    assert memory[0x2100:] == original[0x2100:]
+    assert progress[-1] == (2 * report.length, 2 * report.length)
+    assert all(done <= total for done, total in progress)
+    assert str(report).startswith("Sectors: 9 x 1024 B, skipped 6, programmed 3")
+    assert report.to_dict()["programmed"] == ["0x00000400", "0x00000800", "0x00002000"]
+
+
+def test_differential_erased_sector(memory_mboot: McuBoot):
+    memory = memory_mboot._interface.device.memory
+    report = write_memory_differential(memory_mboot, 0x400, b"\xff" * SECTOR)
+    assert report.programmed == [0x400]
+    assert commands(memory_mboot, CommandTag.FLASH_ERASE_REGION) == 1
+    assert commands(memory_mboot, CommandTag.WRITE_MEMORY) == 0
+    assert memory[0x400:0x800] == b"\xff" * SECTOR
+
+
+def test_differential_failure(memory_mboot: McuBoot):
+    report = write_memory_differential(memory_mboot, 0x3C00, bytes(0x800))
+    assert not report.success
+    assert not report.programmed
+
+
+def test_differential_unknown_sector_size(memory_mboot: McuBoot):
+    del memory_mboot._interface.device.properties[PropertyTag.FLASH_SECTOR_SIZE.tag]
+    with pytest.raises(McuBootError):
+        write_memory_differential(memory_mboot, 0, bytes(0x10))
+    report = write_memory_differential(memory_mboot, 0, bytes(0x10), sector_size=0x800)
+    assert report.success and report.programmed == [0]
+
+
+def test_blhost_write_memory_diff(cli_runner: CliRunner, tmpdir):
+    interface = memory_interface(size=0x4000, sector_size=SECTOR)
+    data = bytearray(interface.device.memory[:0x1000])
+    data[0x10] = 0
+    data_path = os.path.join(tmpdir, "data.bin")
+    with open(data_path, "wb") as f:
+        f.write(data)
+    cmd = ["-u", "memory", "write-memory", "--diff", "0", data_path]
+    with patch("spsdk.apps.blhost.get_mboot_interface", return_value=interface):
+        result = cli_runner.invoke(blhost.main, cmd)
+    assert "skipped 3, programmed 1" in result.output
+    assert interface.device.memory[:0x1000] == data
+
+
+@pytest.mark.parametrize("options", [[], ["-w", "4"]])
+def test_blhost_write_memory_diff_pipeline_window(cli_runner: CliRunner, tmpdir, options):
+    """The compare is read command by command unless the pipeline window is given."""
+    interface = memory_interface(size=0x4000, sector_size=SECTOR, max_packet_size=64)
+    data_path = os.path.join(tmpdir, "data.bin")
+    with open(data_path, "wb") as f:
+        f.write(interface.device.memory[:0x1000])
+    cmd = ["-u", "memory", "write-memory", "--diff", *options, "0", data_path]
+    with patch("spsdk.apps.blhost.get_mboot_interface", return_value=interface):
+        result = cli_runner.invoke(blhost.main, cmd)
+    assert "skipped 4, programmed 0" in result.output
+    if options:
+        assert interface.device.turnarounds < 0x1000 // 64
+    else:
+        assert interface.device.turnarounds >= 0x1000 // 64
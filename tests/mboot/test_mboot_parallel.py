@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from spsdk.apps import blhost
+from spsdk.exceptions import SPSDKError
+from spsdk.mboot.commands import CommandTag
+from spsdk.mboot.error_codes import StatusCode
+from spsdk.mboot.parallel import FlashPlan, FlashSegment, flash_device, flash_devices
+from spsdk.mboot.scanner import parse_interface_spec
+from tests.cli_runner import CliRunner
+from tests.mboot.memory_device import memory_interface
+
+
+def make_interfaces(count: int, **kwargs):
+    kwargs.setdefault("size", 0x4000)
+    kwargs.setdefault("sector_size", 0x400)
+    return [memory_interface(name=f"board{idx}", **kwargs) for idx in range(count)]
+
+
+@pytest.fixture
+def plan():
+    return FlashPlan(
+        segments=[
+            FlashSegment(address=0x100, data=os.urandom(0x500)),
+            FlashSegment(address=0x2000, data=os.urandom(0x123)),
+        ],
+        erase=True,
+        verify=True,
+    )
+
+
+def test_flash_segment_alignment():
+    segment = FlashSegment(address=0x1100, data=bytes(0x400))
+    assert segment.aligned_start(0x400) == 0x1000
+    assert segment.aligned_length(0x400) == 0x800
+    segment = FlashSegment(address=0x1000, data=bytes(0x400))
+    assert segment.aligned_start(0x400) == 0x1000
+    assert segment.aligned_length(0x400) == 0x400
+
+
+def test_flash_devices(plan: FlashPlan):
+    interfaces = make_interfaces(4)
+    for interface in interfaces:
+        # memory is erased by the plan
+        interface.device.memory[:] = bytes(len(interface.device.memory))
+    progress = []
+    report = flash_devices(interfaces, plan, progress_callback=lambda x, y: progress.append((x, y)))
+    assert report.success
+    for interface, result in zip(interfaces, report.results):
+        memory = interface.device.memory
+        assert "board" in result.device
+        assert result.success
+        assert result.bytes_transferred == plan.total_bytes
+        assert [step.operation for step in result.steps] == ["erase"] * 2 + ["write"] * 2 + [
+            "verify"
+        ] * 2
+        for segment in plan.segments:
+            assert memory[segment.address : segment.address + len(segment.data)] == segment.data
+        assert memory[:0x100] == b"\xff" * 0x100
+        assert memory[0x600:0x800] == b"\xff" * 0x200
+        assert memory[0x800:0x2000] == bytes(0x1800)
+    assert progress[-1] == (4 * plan.total_bytes, 4 * plan.total_bytes)
+    assert all(done <= total for done, total in progress)
+
+
+def test_flash_devices_sector_size(plan: FlashPlan):
+    """Erased regions are aligned to the sector size reported by the target."""
+    interfaces = make_interfaces(2, sector_size=0x1000)
+    report = flash_devices(interfaces, plan)
+    assert report.success
+    for result in report.results:
+        erase_steps = [step for step in result.steps if step.operation == "erase"]
+        assert [(step.address, step.length) for step in erase_steps] == [
+            (0, 0x1000),
+            (0x2000, 0x1000),
+        ]
+
+
+def test_flash_devices_failure(plan: FlashPlan):
+    interfaces = make_interfaces(2) + make_interfaces(1, size=0x1000)
+    report = flash_devices(interfaces, plan, max_workers=2)
+    assert not report.success
+    assert [result.success for result in report.results] == [True, True, False]
+    failed = report.results[2]
+    assert failed.status_code == StatusCode.FLASH_ADDRESS_ERROR
+    assert failed.steps[-1].operation == "erase"
+    assert failed.steps[-1].address == 0x2000
+    assert failed.bytes_transferred == 0
+    report_dict = json.loads(json.dumps(report.to_dict()))
+    assert report_dict["failed"] == 1
+    assert "Address Error" in report_dict["results"][2]["status"]
+    assert report_dict["results"][0]["steps"][0]["address"] == "0x00000000"
+
+
+def test_flash_device_verify_failure():
+    interface = make_interfaces(1)[0]
+    # memory not erased, NOR programming can't set the cleared bits
+    interface.device.memory[:] = bytes(len(interface.device.memory))
+    plan = FlashPlan(segments=[FlashSegment(address=0, data=b"\xaa" * 0x40)], verify=True)
+    result = flash_device(interface, plan)
+    assert not result.success
+    assert result.status_code == StatusCode.FAIL
+    assert "Verification failed" in (result.error or "")
+    assert result.to_dict()["error"] == result.error
+
+
+def test_flash_devices_no_interface(plan: FlashPlan):
+    with pytest.raises(SPSDKError):
+        flash_devices([], plan)
+
+
+def test_flash_devices_session_properties():
+    """Max packet size is read once per session of every target."""
+    plan = FlashPlan(segments=[FlashSegment(address=0, data=os.urandom(0x1000))], verify=True)
+    interfaces = make_interfaces(4, max_packet_size=64)
+    report = flash_devices(interfaces, plan)
+    assert report.success
+    for interface in interfaces:
+        assert interface.device.memory[:0x1000] == plan.segments[0].data
+        assert interface.device.commands[CommandTag.GET_PROPERTY.tag] == 1
+
+
+def test_flash_devices_unexpected_error(plan: FlashPlan):
+    """Unexpected exception of one target is recorded, the others are flashed."""
+    interfaces = make_interfaces(3)
+    with patch.object(interfaces[1].device, "read", side_effect=OSError("device unplugged")):
+        report = flash_devices(interfaces, plan)
+    assert not report.success
+    assert [result.success for result in report.results] == [True, False, True]
+    assert report.results[1].error == "OSError: device unplugged"
+
+
+@pytest.mark.parametrize(
+    "spec,expected",
+    [
+        ("usb:0x1fc9:0x0021", {"usb": "0x1fc9:0x0021"}),
+        ("port:COM3,115200", {"port": "COM3,115200"}),
+        ("USB:my_device", {"usb": "my_device"}),
+        ("lpcusbsio:spi0", {"lpcusbsio": "spi0"}),
+    ],
+)
+def test_parse_interface_spec(spec, expected):
+    assert parse_interface_spec(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["usb", "usb:", "serial:COM3", ""])
+def test_parse_interface_spec_invalid(spec):
+    with pytest.raises(SPSDKError):
+        parse_interface_spec(spec)
+
+
+def test_blhost_flash_image_parallel(cli_runner: CliRunner, tmpdir):
+    image = os.urandom(0x900)
+    image_path = os.path.join(tmpdir, "image.bin")
+    report_path = os.path.join(tmpdir, "report.json")
+    with open(image_path, "wb") as f:
+        f.write(image)
+    interfaces = make_interfaces(3)
+    cmd = ["flash-image-parallel", "-d", "usb:a", "-d", "usb:b", "-d", "usb:c"]
+    cmd += ["--verify", "-r", report_path, image_path, "erase"]
+    with patch("spsdk.apps.blhost.get_mboot_interfaces", return_value=interfaces) as get_ifces:
+        result = cli_runner.invoke(blhost.main, cmd)
+    assert get_ifces.call_args[0][0] == ("usb:a", "usb:b", "usb:c")
+    for interface in interfaces:
+        assert interface.device.memory[: len(image)] == image
+        assert f"{interface}: OK" in result.output
+    with open(report_path) as f:
+        report = json.load(f)
+    assert report["success"] and report["devices"] == 3
+
+
+def test_blhost_flash_image_parallel_failure(cli_runner: CliRunner, tmpdir):
+    image_path = os.path.join(tmpdir, "image.bin")
+    with open(image_path, "wb") as f:
+        f.write(os.urandom(0x900))
+    interfaces = make_interfaces(1) + make_interfaces(1, size=0x400)
+    cmd = ["--json", "flash-image-parallel", "-d", "usb:a", "-d", "usb:b", image_path, "erase"]
+    with patch("spsdk.apps.blhost.get_mboot_interfaces", return_value=interfaces):
+        result = cli_runner.invoke(blhost.main, cmd, expected_code=1)
+    report = json.loads(result.output)
+    assert report["failed"] == 1
+    assert [res["success"] for res in report["results"]] == [True, False]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pytest
+
+from spsdk.mboot.commands import CommandTag
+from spsdk.mboot.error_codes import StatusCode
+from spsdk.mboot.mcuboot import McuBoot
+from spsdk.mboot.properties import PropertyCache, PropertyTag
+from tests.mboot.memory_device import memory_interface
+
+
+@pytest.fixture
+def cached_mboot():
+    with McuBoot(memory_interface(), property_cache=PropertyCache()) as mboot:
+        yield mboot
+
+
+def test_property_cache(cached_mboot: McuBoot):
+    device = cached_mboot._interface.device
+    for _ in range(3):
+        assert cached_mboot.get_property(PropertyTag.FLASH_SECTOR_SIZE) == [0x1000]
+        assert cached_mboot.status_code == StatusCode.SUCCESS
+    assert device.commands[CommandTag.GET_PROPERTY.tag] == 1
+    assert cached_mboot.property_cache.hits == 2
+    assert cached_mboot.property_cache.misses == 1
+
+    # failures are not cached
+    assert cached_mboot.get_property(PropertyTag.VERIFY_WRITES) is None
+    assert cached_mboot.get_property(PropertyTag.VERIFY_WRITES) is None
+    assert cached_mboot.status_code == StatusCode.UNKNOWN_PROPERTY
+    assert device.commands[CommandTag.GET_PROPERTY.tag] == 3
+
+
+def test_property_cache_memory_list(cached_mboot: McuBoot):
+    device = cached_mboot._interface.device
+    memory_list = cached_mboot.get_memory_list()
+    commands = device.commands[CommandTag.GET_PROPERTY.tag]
+    assert cached_mboot.get_memory_list().keys() == memory_list.keys()
+    # only the probe of unsupported external memory attributes is sent again
+    assert device.commands[CommandTag.GET_PROPERTY.tag] == commands + 1
+
+
+def test_property_cache_volatile(cached_mboot: McuBoot):
+    device = cached_mboot._interface.device
+    device.properties[PropertyTag.LAST_ERROR.tag] = [0]
+    cached_mboot.get_property(PropertyTag.LAST_ERROR)
+    cached_mboot.get_property(PropertyTag.LAST_ERROR)
+    assert device.commands[CommandTag.GET_PROPERTY.tag] == 2
+    assert len(cached_mboot.property_cache) == 0
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        lambda mboot: mboot.set_property(PropertyTag.VERIFY_WRITES, 1),
+        lambda mboot: mboot.configure_memory(0x2000_0000, 9),
+        lambda mboot: mboot.reset(reopen=False),
+        lambda mboot: mboot.flash_erase_all_unsecure(),
+        lambda mboot: mboot.flash_program_once(0, bytes(4)),
+        lambda mboot: mboot.fuse_program(0, bytes(4)),
+        lambda mboot: mboot.execute(0x2000_0000, 0, 0x2000_8000),
+        lambda mboot: mboot.call(0x2000_0000, 0),
+        lambda mboot: mboot.reliable_update(0x1000),
+        lambda mboot: mboot.tp_set_wrapped_data(0x2000_0000),
+    ],
+)
+def test_property_cache_invalidation(cached_mboot: McuBoot, command):
+    cached_mboot.get_property(PropertyTag.FLASH_SIZE)
+    assert len(cached_mboot.property_cache) == 1
+    command(cached_mboot)
+    assert len(cached_mboot.property_cache) == 0
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        lambda mboot: mboot.read_memory(0, 0x100),
+        lambda mboot: mboot.write_memory(0, bytes(0x100)),
+        lambda mboot: mboot.flash_erase_region(0, 0x1000),
+        lambda mboot: mboot.flash_read_once(0, 4),
+    ],
+)
+def test_property_cache_kept(cached_mboot: McuBoot, command):
+    cached_mboot.get_property(PropertyTag.FLASH_SIZE)
+    command(cached_mboot)
+    hits = cached_mboot.property_cache.hits
+    cached_mboot.get_property(PropertyTag.FLASH_SIZE)
+    assert cached_mboot.property_cache.hits == hits + 1
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+
+import pytest
+
+from spsdk.mboot.commands import CommandTag
+from spsdk.mboot.error_codes import StatusCode
+from spsdk.mboot.exceptions import McuBootCommandError, McuBootError
+from spsdk.mboot.mcuboot import McuBoot
+from spsdk.mboot.properties import PropertyTag
+from tests.mboot.memory_device import memory_interface
+
+
+@pytest.fixture
+def memory_mboot():
+    interface = memory_interface(size=0x4000, max_packet_size=64)
+    interface.device.memory[:] = os.urandom(0x4000)
+    with McuBoot(interface) as mboot:
+        yield mboot
+
+
+@pytest.mark.parametrize("window", [1, 2, 4, 100])
+@pytest.mark.parametrize("address,length", [(0, 0x4000), (0x123, 1000), (0x40, 64), (0, 1)])
+def test_read_memory_pipelined(memory_mboot: McuBoot, window, address, length):
+    memory = memory_mboot._interface.device.memory
+    data = memory_mboot.read_memory(address, length, pipeline_window=window)
+    assert memory_mboot.status_code == StatusCode.SUCCESS
+    assert data == memory[address : address + length]
+
+
+def test_read_memory_max_packet_size_cached(memory_mboot: McuBoot):
+    device = memory_mboot._interface.device
+    memory_mboot.read_memory(0, 1000)
+    memory_mboot.read_memory(0, 1000, pipeline_window=4)
+    assert device.commands[CommandTag.GET_PROPERTY.tag] == 1
+    assert device.commands[CommandTag.READ_MEMORY.tag] == 2 * 16
+
+
+def test_read_memory_max_packet_size_invalidated(memory_mboot: McuBoot):
+    device = memory_mboot._interface.device
+    memory_mboot.read_memory(0, 1000)
+    memory_mboot.set_property(PropertyTag.VERIFY_WRITES, 1)
+    device.properties[PropertyTag.MAX_PACKET_SIZE.tag] = [32]
+    assert memory_mboot.read_memory(0, 1000, pipeline_window=4) == device.memory[:1000]
+    assert device.commands[CommandTag.GET_PROPERTY.tag] == 2
+    assert device.commands[CommandTag.READ_MEMORY.tag] == 16 + 32
+
+
+def test_read_memory_pipelined_failure(memory_mboot: McuBoot):
+    # the range crosses end of the memory, queued commands must be drained
+    assert memory_mboot.read_memory(0x3F00, 0x200, pipeline_window=4) == b""
+    assert memory_mboot.status_code == StatusCode.MEMORY_RANGE_INVALID
+    data = memory_mboot.read_memory(0, 0x100, pipeline_window=4)
+    assert data == memory_mboot._interface.device.memory[:0x100]
+
+    memory_mboot._cmd_exception = True
+    with pytest.raises(McuBootCommandError):
+        memory_mboot.read_memory(0x3F00, 0x200, pipeline_window=4)
+    memory_mboot._cmd_exception = False
+    assert memory_mboot.read_memory(0, 0x10) == memory_mboot._interface.device.memory[:0x10]
+
+
+def test_read_memory_pipelined_invalid_window(memory_mboot: McuBoot):
+    with pytest.raises(McuBootError):
+        memory_mboot.read_memory(0, 0x100, pipeline_window=0)
+
+
+def test_read_memory_pipelined_turnarounds(memory_mboot: McuBoot):
+    """Pipelined commands wait in the target queue instead of costing a bus turnaround each."""
+    device = memory_mboot._interface.device
+    turnarounds = {}
+    for window in [1, 4]:
+        device.turnarounds = 0
+        data = memory_mboot.read_memory(0, len(device.memory), pipeline_window=window)
+        assert data == device.memory
+        turnarounds[window] = device.turnarounds
+    # command by command, every read costs a turnaround; pipelined, only the first one
+    assert turnarounds[1] >= len(device.memory) // device.max_packet_size
+    assert turnarounds[4] == 1
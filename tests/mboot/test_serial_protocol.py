@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2024 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+import struct
+from typing import List, Optional
+from unittest.mock import patch
+
+import pytest
+from crcmod.predefined import mkPredefinedCrcFun
+
+from spsdk.mboot.commands import CmdPacket, CommandFlag, CommandTag, GetPropertyResponse
+from spsdk.mboot.interfaces.uart import MbootUARTInterface
+from spsdk.mboot.properties import PropertyTag
+from spsdk.mboot.protocol.serial_protocol import FPType, MbootSerialProtocol
+from spsdk.utils.interfaces.device.base import DeviceBase
+from spsdk.utils.interfaces.device.serial_device import SerialDevice
+from spsdk.utils.serial_proxy import SerialProxy
+
+
+def reference_frame(data: bytes, frame_type: int) -> bytes:
+    """Frame built byte by byte as described in the MCU bootloader reference manual."""
+    crc_data = struct.pack(f"<BBH{len(data)}B", 0x5A, frame_type, len(data), *data)
+    crc = mkPredefinedCrcFun("xmodem")(crc_data)
+    return struct.pack(f"<BBHH{len(data)}B", 0x5A, frame_type, len(data), crc, *data)
+
+
+@pytest.fixture
+def uart():
+    return MbootUARTInterface(SerialDevice())
+
+
+@pytest.mark.parametrize("size", [0, 1, 31, 512, 4096])
+@pytest.mark.parametrize("frame_type", [FPType.CMD, FPType.DATA])
+def test_create_frame(uart: MbootUARTInterface, size, frame_type):
+    data = os.urandom(size)
+    frame = uart._create_frame(data, frame_type)
+    assert frame == reference_frame(data, frame_type.tag)
+    assert uart._calc_frame_crc(data, frame_type.tag) == struct.unpack_from("<H", frame, 4)[0]
+
+
+class SpiStreamDevice(DeviceBase):
+    """SPI target model, the bus clocks out idle bytes when the target has nothing to send."""
+
+    def __init__(self, stream: bytes = b"", idle: int = 0x00) -> None:
+        super().__init__()
+        self.stream = bytearray(stream)
+        self.idle = idle
+        self.reads: List[int] = []
+        self.written: List[bytes] = []
+        self._timeout = 1000
+        self._opened = False
+
+    @property
+    def timeout(self) -> int:
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: int) -> None:
+        self._timeout = value
+
+    @property
+    def is_opened(self) -> bool:
+        return self._opened
+
+    def open(self) -> None:
+        self._opened = True
+
+    def close(self) -> None:
+        self._opened = False
+
+    def read(self, length: int, timeout: Optional[int] = None) -> bytes:
+        self.reads.append(length)
+        data = bytes(self.stream[:length])
+        del self.stream[:length]
+        return data + bytes([self.idle]) * (length - len(data))
+
+    def write(self, data: bytes, timeout: Optional[int] = None) -> None:
+        self.written.append(data)
+
+    def __str__(self) -> str:
+        return "SpiStreamDevice"
+
+
+class StreamInterface(MbootSerialProtocol):
+    """Serial protocol on top of the SPI model."""
+
+    FRAME_START_NOT_READY_LIST = [0x00, 0xFF]
+
+    @classmethod
+    def scan_from_args(cls, params: str, timeout: int, extra_params: Optional[str] = None) -> list:
+        return []
+
+
+ACK = bytes([0x5A, FPType.ACK.tag])
+PROPERTY_RESPONSE = struct.pack("<4B2I", 0xA7, 0, 0, 2, 0, 0x4B030000)
+PING_RESPONSE = bytes.fromhex("5aa7000301500000fb40")
+
+
+def get_property_packet() -> CmdPacket:
+    return CmdPacket(
+        CommandTag.GET_PROPERTY, CommandFlag.NONE.tag, PropertyTag.CURRENT_VERSION.tag, 0
+    )
+
+
+@pytest.mark.parametrize(
+    "stream_prefix,ack",
+    [
+        (b"", ACK),
+        (b"\x00\x00\x00", ACK),
+        (b"\xff\x00", ACK),
+        # ACK and START BYTE swapped (SPSDK-1824)
+        (b"", ACK[::-1]),
+        (b"\x00", ACK[::-1]),
+    ],
+)
+def test_read_frame_buffered(uart: MbootUARTInterface, stream_prefix, ack):
+    frame = uart._create_frame(PROPERTY_RESPONSE, FPType.CMD)
+    if ack[0] == FPType.ACK.tag:
+        # the swapped ACK already contains the start byte of the response frame
+        frame = frame[1:]
+    device = SpiStreamDevice(stream_prefix + ack + frame)
+    interface = StreamInterface(device)
+    interface.write_command(get_property_packet())
+    response = interface.read()
+    assert isinstance(response, GetPropertyResponse)
+    assert response.values == [0x4B030000]
+    assert not device.stream
+    assert not interface._rx_buffer
+    assert device.written[-1] == ACK
+    # one transfer for the whole ACK or the frame header, length+crc and data, not a byte at time
+    assert len(device.reads) <= 4 + len(stream_prefix)
+    assert sum(device.reads) == len(stream_prefix + ack + frame)
+
+
+def test_read_frame_stale_data_dropped(uart: MbootUARTInterface):
+    """Bytes read ahead before a new command don't desynchronize its response."""
+    frame = uart._create_frame(PROPERTY_RESPONSE, FPType.CMD)
+    device = SpiStreamDevice(ACK + frame)
+    interface = StreamInterface(device)
+    # leftover of a response abandoned after timeout
+    interface._rx_buffer += ACK + frame[:7]
+    interface.write_command(get_property_packet())
+    response = interface.read()
+    assert isinstance(response, GetPropertyResponse)
+    assert response.values == [0x4B030000]
+    assert not interface._rx_buffer
+
+
+def test_read_frame_idle_bytes_skipped(uart: MbootUARTInterface):
+    """Idle bytes read ahead after the ACK are skipped by the following frame header."""
+    frame = uart._create_frame(PROPERTY_RESPONSE, FPType.CMD)
+    device = SpiStreamDevice(ACK)
+    interface = StreamInterface(device)
+    interface.write_command(get_property_packet())
+    device.stream += b"\x00" * 5 + frame
+    response = interface.read()
+    assert isinstance(response, GetPropertyResponse)
+    assert response.values == [0x4B030000]
+
+
+def test_ping_buffered():
+    device = SpiStreamDevice(b"\x00\x00" + PING_RESPONSE)
+    interface = StreamInterface(device)
+    interface.open()
+    assert interface.protocol_version == 0x50010300
+    assert device.reads == [10, 2]
+    assert not interface._rx_buffer
+
+
+def test_uart_read_available():
+    responses = {
+        bytes.fromhex("5aa6"): PING_RESPONSE,
+        ACK: b"",
+    }
+    frame = MbootUARTInterface(SerialDevice())._create_frame(PROPERTY_RESPONSE, FPType.CMD)
+    cmd_frame = MbootUARTInterface(SerialDevice())._create_frame(
+        get_property_packet().to_bytes(padding=False), FPType.CMD
+    )
+    responses[cmd_frame] = ACK + frame
+    with patch(
+        "spsdk.utils.interfaces.device.serial_device.Serial", SerialProxy.init_proxy(responses)
+    ):
+        interface = MbootUARTInterface(SerialDevice(port="COM1"))
+        interface.open()
+        with patch.object(
+            interface.device._device, "read", wraps=interface.device._device.read
+        ) as read:
+            interface.write_command(get_property_packet())
+            response = interface.read()
+        assert isinstance(response, GetPropertyResponse)
+        assert response.values == [0x4B030000]
+        # whole ACK and response frame were already received, read at once
+        assert read.call_count == 1
+        interface.close()
@@ -11,7 +11,7 @@ import os
 import pytest
 
 from spsdk.apps import nxpdevhsm
-from spsdk.crypto.hash import EnumHashAlgorithm
+from spsdk.crypto.hash import EnumHashAlgorithm, get_hash
 from spsdk.exceptions import SPSDKError
 from spsdk.sbfile.devhsm.utils import get_devhsm_class
 from spsdk.sbfile.sb31.commands import CmdLoadKeyBlob
@@ -101,6 +101,82 @@ def test_devhsm_factory(family, expected_cls):
     assert devhsm_cls == expected_cls
 
 
+class DevHsmMboot:
+    """Device buffer emulation with SB3 block encryption, counts the round trips."""
+
+    status_string = "Success"
+
+    def __init__(self, base: int, size: int) -> None:
+        self.base = base
+        self.memory = bytearray(size)
+        self.round_trips = 0
+
+    @staticmethod
+    def encrypt_block(block: bytes, block_num: int) -> bytes:
+        mask = get_hash(block_num.to_bytes(4, "little")) * (len(block) // 32)
+        return bytes(a ^ b for a, b in zip(block, mask))
+
+    def write_memory(self, address: int, data: bytes) -> bool:
+        self.round_trips += 1
+        self.memory[address - self.base : address - self.base + len(data)] = data
+        return True
+
+    def read_memory(self, address: int, length: int) -> bytes:
+        self.round_trips += 1
+        return bytes(self.memory[address - self.base : address - self.base + length])
+
+    def tp_hsm_enc_blk(self, *args) -> bool:
+        self.round_trips += 1
+        block_num, address, size = args[5:8]
+        block = self.memory[address - self.base : address - self.base + size]
+        self.memory[address - self.base : address - self.base + size] = self.encrypt_block(
+            block, block_num
+        )
+        return True
+
+
+@pytest.mark.parametrize("block_count", [1, 13, 14, 15, 100])
+def test_sb31_devhsm_encrypt_data_blocks(data_dir, block_count):
+    with use_working_directory(data_dir):
+        devhsm = DevHsmSB31(
+            mboot=None,
+            cust_mk_sk=b"abcd",
+            oem_share_input=b"abcd",
+            info_print=None,
+            family="lpc55s3x",
+        )
+    devhsm.mboot = DevHsmMboot(devhsm.devbuff_base, devhsm.devbuff_size)
+    assert devhsm.get_data_blocks_batch_size() == 14
+    blocks = [os.urandom(256) for _ in range(block_count)]
+    sb3_data = SecureBinary31Commands(
+        family="lpc55s3x", hash_type=EnumHashAlgorithm.SHA256, is_encrypted=False
+    )
+    processed_parts = []
+    encrypted = devhsm.encrypt_data_blocks(
+        bytes(48),
+        bytes(60),
+        blocks,
+        lambda first, batch: processed_parts.insert(
+            0, sb3_data.process_cmd_blocks_backwards(batch, first)
+        ),
+    )
+    assert encrypted == [
+        DevHsmMboot.encrypt_block(block, idx) for idx, block in enumerate(blocks, start=1)
+    ]
+    batches = -(-block_count // 14)
+    # one write and one read per batch instead of per block
+    assert devhsm.mboot.round_trips == 2 + block_count + 2 * batches
+    assert len(processed_parts) == batches
+    reference = SecureBinary31Commands(
+        family="lpc55s3x", hash_type=EnumHashAlgorithm.SHA256, is_encrypted=False
+    )
+    assert b"".join(processed_parts) == reference.process_cmd_blocks_to_export(encrypted)
+    assert sb3_data.final_hash == reference.final_hash
+    assert sb3_data.block_count == block_count
+    timing = devhsm.get_timing_info()
+    assert "Write SB3 data blocks" in timing and "Encrypt SB3 data blocks on device" in timing
+
+
 def test_sbx_devhsm(data_dir):
     with use_working_directory(data_dir):
         devhsm = DevHsmSBx(
@@ -7,17 +7,20 @@
 
 """Test AHAB part of nxpimage app."""
 import filecmp
+import io
 import os
 import shutil
+from unittest.mock import patch
 
 import pytest
 
 from spsdk.apps import nxpimage
+from spsdk.crypto.hash import get_hash
 from spsdk.crypto.keys import IS_OSCCA_SUPPORTED
 from spsdk.exceptions import SPSDKValueError
 from spsdk.image.ahab.ahab_container import AHABImage
 from spsdk.image.ahab.signed_msg import MessageCommands, SignedMessage
-from spsdk.utils.misc import load_binary, use_working_directory
+from spsdk.utils.misc import load_binary, load_configuration, use_working_directory
 from tests.cli_runner import CliRunner
 from tests.nxpimage.test_nxpimage_cert_block import process_config_file
 
@@ -169,6 +172,55 @@ def test_nxpimage_ahab_parse(data_dir, binary, family, target_memory):
         assert ahab.target_memory == target_memory
 
 
+def test_nxpimage_ahab_sign_containers(data_dir):
+    with use_working_directory(data_dir):
+        config = load_configuration(f"{data_dir}/ahab/ctcm_cm33_signed_sb.yaml")
+        ahab = AHABImage.load_from_config(config, search_paths=[data_dir])
+        signature_provider = ahab.ahab_containers[-1].signature_block.signature.signature_provider
+        with patch.object(
+            signature_provider, "sign_batch", wraps=signature_provider.sign_batch
+        ) as sign_batch:
+            ahab.update_fields()
+        # the serial downloader containers are updated twice, but signed just once
+        assert sign_batch.call_count == 1
+        ahab.validate()
+
+
+def test_nxpimage_ahab_incremental_update(data_dir):
+    with use_working_directory(data_dir):
+        config = load_configuration(f"{data_dir}/ahab/ctcm_cm33_signed_sb.yaml")
+        ahab = AHABImage.load_from_config(config, search_paths=[data_dir])
+        ahab.update_fields()
+        container = ahab.ahab_containers[-1]
+        signature = container.signature_block.signature.signature_data
+        signature_provider = container.signature_block.signature.signature_provider
+        with patch("spsdk.image.ahab.ahab_container.get_hash", wraps=get_hash) as hash_mock:
+            with patch.object(
+                signature_provider, "sign_batch", wraps=signature_provider.sign_batch
+            ) as sign_batch:
+                ahab.update_fields()
+                # nothing changed, images are not hashed and the container is not signed again
+                assert hash_mock.call_count == 0
+                assert sign_batch.call_count == 0
+                assert container.signature_block.signature.signature_data == signature
+                image_entry = container.image_array[0]
+                image_entry.image = bytes(len(image_entry.image))
+                ahab.update_fields()
+                assert hash_mock.call_count == 1
+                assert sign_batch.call_count == 1
+        ahab.validate()
+
+
+def test_nxpimage_ahab_export_to_stream(data_dir):
+    with use_working_directory(data_dir):
+        config = load_configuration(f"{data_dir}/ahab/ctcm_cm33_signed_img.yaml")
+        ahab = AHABImage.load_from_config(config, search_paths=[data_dir])
+        stream = io.BytesIO()
+        length = ahab.export_to_stream(stream)
+        assert length == len(stream.getvalue())
+        assert stream.getvalue() == ahab.image_info().export()
+
+
 @pytest.mark.parametrize(
     "binary,family,target_memory",
     [
@@ -8,6 +8,7 @@
 """Test SecureBinary part of nxpimage app."""
 import json
 import os
+from io import BytesIO
 
 import pytest
 
@@ -155,6 +156,52 @@ def test_nxpimage_sb31_notime(cli_runner: CliRunner, nxpimage_data_dir, tmpdir):
         assert ref_data[0x1C:0x3C] == new_data[0x1C:0x3C]
 
 
+@pytest.mark.parametrize("device", ["lpc55s3x", "mcxn9xx"])
+def test_nxpimage_sb31_stream(cli_runner: CliRunner, nxpimage_data_dir, tmpdir, device):
+    with use_working_directory(nxpimage_data_dir):
+        config_file = (
+            f"{nxpimage_data_dir}/workspace/cfgs/{device}/sb3_384_256_fixed_timestamp.yaml"
+        )
+        ref_binary, new_binary, new_config = process_config_file(config_file, tmpdir)
+        cli_runner.invoke(nxpimage.main, ["sb31", "export", "-c", new_config])
+        ref_data = load_binary(new_binary)
+        os.remove(new_binary)
+        cli_runner.invoke(nxpimage.main, ["sb31", "export", "-c", new_config, "--stream"])
+        new_data = load_binary(new_binary)
+
+        sb31 = SecureBinary31.load_from_config(
+            config=load_configuration(config_file),
+            search_paths=[f"{nxpimage_data_dir}/workspace/cfgs/{device}", str(tmpdir)],
+        )
+        signature_offset = (
+            SecureBinary31Header.HEADER_SIZE
+            + len(sb31.sb_commands.final_hash)
+            + sb31.cert_block.expected_size
+        )
+        data_blocks_offset = signature_offset + sb31.signature_provider.signature_length
+        # certificate block contains random ISK signature
+        header_part_size = SecureBinary31Header.HEADER_SIZE + len(sb31.sb_commands.final_hash)
+        assert len(ref_data) == len(new_data)
+        assert ref_data[:header_part_size] == new_data[:header_part_size]
+        assert ref_data[data_blocks_offset:] == new_data[data_blocks_offset:]
+        assert (
+            get_signing_key(config_file)
+            .get_public_key()
+            .verify_signature(
+                new_data[signature_offset:data_blocks_offset], new_data[:signature_offset]
+            )
+        )
+
+        # not seekable stream is spilled into temporary file
+        class PipeStream(BytesIO):
+            def seekable(self) -> bool:
+                return False
+
+        pipe = PipeStream()
+        assert sb31.export_to_stream(pipe) == len(ref_data)
+        assert pipe.getvalue()[data_blocks_offset:] == ref_data[data_blocks_offset:]
+
+
 def test_nxpimage_sb31_kaypair_not_matching(nxpimage_data_dir):
     config_file = f"{nxpimage_data_dir}/workspace/cfgs/lpc55s3x/sb3_256_256_keys_dont_match.yaml"
     sb31 = SecureBinary31.load_from_config(
@@ -7,6 +7,8 @@
 """Test of commands."""
 
 import os
+from io import BytesIO
+from unittest.mock import patch
 
 import pytest
 
@@ -94,6 +96,21 @@ def test_key_derivator():
     assert derivator.get_block_key(6) == bytearray.fromhex("4c28803b5de193c21f31e6fa10c76b03")
 
 
+def test_block_key_memoized():
+    derivator = KeyDerivator(pck=bytes(32), timestamp=0x1234, kdk_access_rights=3, key_length=256)
+    with patch(
+        "spsdk.sbfile.sb31.functions.derive_block_key", wraps=derive_block_key
+    ) as derive_mock:
+        key = derivator.get_block_key(1)
+        assert derivator.get_block_key(1) == key
+        assert derive_mock.call_count == 1
+        assert derivator.get_block_key(2) != key
+        # the keys are not shared with other derivators
+        assert KeyDerivator(bytes(32), 0x1234, 256, 3).get_block_key(1) == key
+        assert derive_mock.call_count == 3
+    assert derive_block_key(bytearray(derivator.kdk), 1, 256, 3) == key
+
+
 def test_key_derivator_invalid():
     with pytest.raises(SPSDKError, match="Invalid kdk access rights"):
         derive_block_key(kdk=bytes(50), block_number=1, key_length=5, kdk_access_rights=6)
@@ -235,6 +252,41 @@ def test_secure_binary3_info(data_dir):
     assert "SB3.1" in info
 
 
+@pytest.mark.parametrize("shift", [-8, 8])
+def test_secure_binary3_unexpected_signature_length(data_dir, shift):
+    """The commands blocks follow the signature of unexpected length."""
+    rot = [load_binary(os.path.join(data_dir, "ecc_secp256r1_priv_key.pem")) for x in range(4)]
+    cert_blk = CertBlockV21(root_certs=rot, ca_flag=1)
+    cert_blk.calculate()
+    signature_provider = get_signature_provider(
+        sp_cfg=None, local_file_key="ecc_secp256r1_priv_key.pem", search_paths=[data_dir]
+    )
+    sb3 = SecureBinary31(
+        family="lpc55s3x",
+        cert_block=cert_blk,
+        firmware_version=1,
+        signature_provider=signature_provider,
+        is_encrypted=False,
+    )
+    for address in range(0, 0x1000, 0x100):
+        sb3.sb_commands.add_command(CmdErase(address=address, length=0x100))
+    signature = bytes(range(signature_provider.signature_length + shift))
+    with patch.object(signature_provider, "get_signature", return_value=signature):
+        data = sb3.export()
+    commands_data = sb3.sb_commands.export()
+    signature_offset = len(data) - len(commands_data) - len(signature)
+    assert signature_offset == SecureBinary31Header.HEADER_SIZE + 32 + len(cert_blk.export())
+    assert data[signature_offset:] == signature + commands_data
+
+
+def test_secure_binary3_move_stream_data():
+    stream = BytesIO(bytes(range(20)))
+    SecureBinary31._move_stream_data(stream, 2, 5, 10, chunk_size=3)
+    assert stream.getvalue()[5:15] == bytes(range(2, 12))
+    SecureBinary31._move_stream_data(stream, 5, 1, 10, chunk_size=3)
+    assert stream.getvalue()[1:11] == bytes(range(2, 12))
+
+
 def test_cert_block_validate(data_dir):
     """Test of validation function for Secure Binary class."""
 
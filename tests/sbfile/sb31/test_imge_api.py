@@ -4,11 +4,18 @@
 # Copyright 2021-2024 NXP
 #
 # SPDX-License-Identifier: BSD-3-Clause
+import os
+from io import BytesIO
+from struct import pack
+from unittest.mock import patch
+
 import pytest
 
-from spsdk.crypto.hash import EnumHashAlgorithm
+from spsdk.crypto.hash import EnumHashAlgorithm, get_hash, get_hash_length
+from spsdk.crypto.symmetric import aes_cbc_encrypt
 from spsdk.exceptions import SPSDKError
 from spsdk.sbfile.sb31 import commands
+from spsdk.sbfile.sb31.functions import derive_block_key
 from spsdk.sbfile.sb31.images import SecureBinary31Commands, SecureBinary31Header
 from spsdk.utils.misc import load_binary
 from spsdk.utils.spsdk_enum import SpsdkEnum
@@ -97,6 +104,87 @@ def test_sb31_commands_no_key_derivator():
         sc.export()
 
 
+def reference_process_blocks(sc: SecureBinary31Commands, data_blocks):
+    """Process the blocks one by one, interleaving encryption with the hash chain."""
+    final_hash = bytes(get_hash_length(sc.hash_type))
+    processed = []
+    for block_number, block_data in reversed(list(enumerate(data_blocks, start=1))):
+        if sc.is_encrypted:
+            block_key = sc.key_derivator.get_block_key(block_number)
+            block_data = aes_cbc_encrypt(block_key, block_data)
+        full_block = pack(f"<L{len(final_hash)}s", block_number, final_hash) + block_data
+        final_hash = get_hash(full_block, sc.hash_type)
+        processed.append(full_block)
+    return b"".join(reversed(processed)), final_hash
+
+
+def sb31_commands(hash_type: EnumHashAlgorithm, is_encrypted: bool, data_length: int):
+    sc = SecureBinary31Commands(
+        family="lpc55s3x",
+        hash_type=hash_type,
+        is_encrypted=is_encrypted,
+        pck=bytes(range(32)),
+        timestamp=0x1234,
+        kdk_access_rights=3,
+    )
+    sc.add_command(commands.CmdErase(address=0, length=data_length))
+    sc.add_command(commands.CmdLoad(address=0, data=os.urandom(data_length)))
+    return sc
+
+
+@pytest.mark.parametrize("hash_type", [EnumHashAlgorithm.SHA256, EnumHashAlgorithm.SHA384])
+@pytest.mark.parametrize("is_encrypted", [True, False])
+@pytest.mark.parametrize("max_workers", [None, 1, 4])
+def test_sb31_commands_process_blocks(hash_type, is_encrypted, max_workers):
+    sc = sb31_commands(hash_type, is_encrypted, data_length=0x20000)
+    data_blocks = sc.get_cmd_blocks_to_export()
+    assert len(data_blocks) > 2 * sc.ENCRYPTION_BATCH_SIZE
+    expected, final_hash = reference_process_blocks(sc, data_blocks)
+    assert sc.process_cmd_blocks_to_export(data_blocks, max_workers=max_workers) == expected
+    assert sc.final_hash == final_hash
+    assert sc.block_count == len(data_blocks)
+    # export is repeatable
+    assert sc.export() == expected
+    assert sc.final_hash == final_hash
+
+
+@pytest.mark.parametrize("is_encrypted", [True, False])
+@pytest.mark.parametrize("buffer_blocks", [1, 7, 0x1000])
+@pytest.mark.parametrize("data_length", [0x100, 0x1F0, 0x10000])
+def test_sb31_commands_export_to_stream(monkeypatch, is_encrypted, buffer_blocks, data_length):
+    monkeypatch.setattr(SecureBinary31Commands, "STREAM_BUFFER_BLOCKS", buffer_blocks)
+    sc = sb31_commands(EnumHashAlgorithm.SHA384, is_encrypted, data_length=data_length)
+    expected = sc.export()
+    final_hash = sc.final_hash
+    stream = BytesIO(b"prefix")
+    stream.seek(0, os.SEEK_END)
+    assert sc.export_to_stream(stream, max_workers=2) == len(expected)
+    assert stream.tell() == len(stream.getvalue())
+    assert stream.getvalue() == b"prefix" + expected
+    assert sc.final_hash == final_hash
+    assert sc.block_count == len(expected) // (4 + 48 + sc.DATA_CHUNK_LENGTH)
+
+
+def test_sb31_commands_invalid_block_length():
+    sc = sb31_commands(EnumHashAlgorithm.SHA256, is_encrypted=False, data_length=0x10)
+    with pytest.raises(SPSDKError, match="Invalid length of command blocks"):
+        sc.process_cmd_blocks_to_export([bytes(0x100), bytes(0x10)])
+
+
+def test_sb31_commands_re_export():
+    """Re-export gives the same blocks, the block keys are memoized."""
+    sc = sb31_commands(EnumHashAlgorithm.SHA256, is_encrypted=True, data_length=0x4000)
+    data_blocks = sc.get_cmd_blocks_to_export()
+    expected, _ = reference_process_blocks(sc, data_blocks)
+    with patch(
+        "spsdk.sbfile.sb31.functions.derive_block_key", wraps=derive_block_key
+    ) as derive_mock:
+        assert sc.process_cmd_blocks_to_export(data_blocks) == expected
+        assert sc.process_cmd_blocks_to_export(data_blocks) == expected
+    # the keys were derived by the reference export on the same derivator
+    assert derive_mock.call_count == 0
+
+
 def test_sb31_parse(data_dir):
     data = load_binary(f"{data_dir}/sb3_384_384.sb3")
     header = SecureBinary31Header.parse(data)
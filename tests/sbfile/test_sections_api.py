@@ -10,10 +10,11 @@ import os
 import pytest
 
 from spsdk.crypto.certificate import Certificate
+from spsdk.crypto.hmac import hmac
 from spsdk.crypto.rng import random_bytes
-from spsdk.crypto.symmetric import Counter
+from spsdk.crypto.symmetric import Counter, aes_ctr_encrypt
 from spsdk.exceptions import SPSDKError
-from spsdk.sbfile.sb2.commands import CmdErase, CmdLoad, CmdReset
+from spsdk.sbfile.sb2.commands import CmdErase, CmdHeader, CmdLoad, CmdReset
 from spsdk.sbfile.sb2.sections import BootSectionV2, CertSectionV2
 from spsdk.utils.crypto.cert_blocks import CertBlockV1
 
@@ -52,6 +53,64 @@ def test_boot_section_v2():
         assert BootSectionV2.parse(data, 0, False, dek, random_bytes(32), Counter(nonce))
 
 
+def reference_export(boot_section: BootSectionV2, dek: bytes, mac: bytes, counter: Counter):
+    """Export boot section encrypting the commands block by block."""
+    commands_data = b"".join(cmd.export() for cmd in boot_section)
+    commands_data += bytes(-len(commands_data) % 16)
+    hmac_count = boot_section.hmac_count
+    header = CmdHeader(boot_section._header.tag, boot_section._header.flags)
+    header.address = boot_section.uid
+    header.data = hmac_count
+    header.count = len(commands_data) // 16
+    encrypted_header = aes_ctr_encrypt(dek, header.export(), counter.value)
+    hmac_data = hmac(mac, encrypted_header)
+    counter.increment(1 + (hmac_count + 1) * 2)
+    encrypted_blocks = []
+    for index in range(0, len(commands_data), 16):
+        encrypted_blocks.append(
+            aes_ctr_encrypt(dek, commands_data[index : index + 16], counter.value)
+        )
+        counter.increment()
+    encrypted_commands = b"".join(encrypted_blocks)
+    block_size = (header.count // hmac_count) * 16
+    for hmac_index in range(hmac_count):
+        start = hmac_index * block_size
+        end = len(encrypted_commands) if hmac_index == hmac_count - 1 else start + block_size
+        hmac_data += hmac(mac, encrypted_commands[start:end])
+    return encrypted_header + hmac_data + encrypted_commands
+
+
+@pytest.mark.parametrize("hmac_count", [1, 3, 10, 100])
+@pytest.mark.parametrize("data_length", [0x10, 0x1230, 0x30000])
+def test_boot_section_v2_export(hmac_count, data_length):
+    boot_section = BootSectionV2(
+        0xA5,
+        CmdErase(address=0, length=data_length),
+        CmdLoad(address=0, data=os.urandom(data_length)),
+        CmdReset(),
+        hmac_count=hmac_count,
+    )
+    dek = random_bytes(32)
+    mac = random_bytes(32)
+    nonce = random_bytes(16)
+    counter = Counter(nonce)
+    ref_counter = Counter(nonce)
+    data = boot_section.export(dek, mac, counter)
+    assert data == reference_export(boot_section, dek, mac, ref_counter)
+    assert counter.value == ref_counter.value
+    assert len(data) == boot_section.raw_size
+    parsed = BootSectionV2.parse(data, 0, False, dek, mac, Counter(nonce))
+    assert parsed[1].data == boot_section[1].data
+
+
+def test_boot_section_v2_export_load_only():
+    """Boot section with a single load command is encrypted as block by block."""
+    boot_section = BootSectionV2(0, CmdLoad(address=0, data=os.urandom(0x4000)), hmac_count=8)
+    dek, mac, nonce = random_bytes(32), random_bytes(32), random_bytes(16)
+    expected = reference_export(boot_section, dek, mac, Counter(nonce))
+    assert boot_section.export(dek, mac, Counter(nonce)) == expected
+
+
 def test_boot_section_v2_invalid_export():
     boot_section = BootSectionV2(
         0, CmdErase(address=0, length=100000), CmdLoad(address=0, data=b"0123456789"), CmdReset()
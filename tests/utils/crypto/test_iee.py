@@ -9,6 +9,7 @@ import os
 
 import pytest
 
+from spsdk.crypto.symmetric import Counter, aes_ctr_encrypt, aes_xts_encrypt
 from spsdk.exceptions import SPSDKError
 from spsdk.utils.crypto.iee import (
     Iee,
@@ -18,7 +19,7 @@ from spsdk.utils.crypto.iee import (
     IeeKeyBlobLockAttributes,
     IeeKeyBlobModeAttributes,
 )
-from spsdk.utils.misc import align_block, load_binary
+from spsdk.utils.misc import Endianness, align_block, load_binary, reverse_bytes_in_longs
 
 
 def test_iee_keyblob(data_dir):
@@ -109,3 +110,70 @@ def test_keyblob_invalid():
 
     with pytest.raises(SPSDKError, match="Invalid start/end address"):
         IeeKeyBlob(attribute, start_addr=0x08001000, end_addr=0x08000000)
+
+
+def reference_encrypt(keyblob: IeeKeyBlob, base_address: int, data: bytes) -> bytes:
+    """Encryption of each sector (XTS) or block (CTR) with its own cipher context."""
+    result = bytearray()
+    if keyblob.attributes.ctr_mode:
+        key = reverse_bytes_in_longs(keyblob.key1)
+        counter = Counter(reverse_bytes_in_longs(keyblob.key2), base_address >> 4, Endianness.BIG)
+        for offset in range(0, len(data), 16):
+            result += aes_ctr_encrypt(key, data[offset : offset + 16], counter.value)
+            counter.increment()
+    else:
+        key = reverse_bytes_in_longs(keyblob.key1) + reverse_bytes_in_longs(keyblob.key2)
+        for offset in range(0, len(data), 0x1000):
+            tweak = IeeKeyBlob.calculate_tweak(base_address + offset)
+            result += aes_xts_encrypt(key, data[offset : offset + 0x1000], tweak)
+    return bytes(result)
+
+
+@pytest.fixture(params=["xts", "ctr"])
+def mode_keyblob(request):
+    if request.param == "xts":
+        attribute = IeeKeyBlobAttribute(
+            IeeKeyBlobLockAttributes.UNLOCK,
+            IeeKeyBlobKeyAttributes.CTR256XTS512,
+            IeeKeyBlobModeAttributes.AesXTS,
+        )
+    else:
+        attribute = IeeKeyBlobAttribute(
+            IeeKeyBlobLockAttributes.UNLOCK,
+            IeeKeyBlobKeyAttributes.CTR128XTS256,
+            IeeKeyBlobModeAttributes.AesCTRWAddress,
+        )
+    return IeeKeyBlob(attribute, 0x30000000, 0x3FFFFFFF)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_iee_encrypt_parallel(mode_keyblob: IeeKeyBlob, max_workers, monkeypatch):
+    monkeypatch.setattr(IeeKeyBlob, "_ENCRYPTION_CHUNK_SIZE", 0x2000)
+    data = os.urandom(0x9000 + 0x30)
+    encrypted = mode_keyblob.encrypt_image(0x30003000, data, max_workers=max_workers)
+    assert encrypted == reference_encrypt(mode_keyblob, 0x30003000, data)
+
+
+def test_iee_encrypt_file(mode_keyblob: IeeKeyBlob, tmpdir, monkeypatch):
+    monkeypatch.setattr(IeeKeyBlob, "_ENCRYPTION_CHUNK_SIZE", 0x1000)
+    data = os.urandom(0x7000 + 0x28)
+    input_path = os.path.join(tmpdir, "plain.bin")
+    output_path = os.path.join(tmpdir, "encrypted.bin")
+    with open(input_path, "wb") as f:
+        f.write(data)
+    written = mode_keyblob.encrypt_file(0x30001000, input_path, output_path, max_workers=2)
+    assert written == 0x7030
+    assert load_binary(output_path) == mode_keyblob.encrypt_image(0x30001000, data)
+
+
+def test_iee_encrypt_image_keyblobs(mode_keyblob: IeeKeyBlob):
+    """Data units are encrypted by the last matching key blob, the rest is kept."""
+    second = IeeKeyBlob(mode_keyblob.attributes, 0x30002000, 0x30003FFF)
+    iee = Iee()
+    iee.add_key_blob(mode_keyblob)
+    iee.add_key_blob(second)
+    image = os.urandom(0x5000)
+    encrypted = iee.encrypt_image(image, 0x30000000)
+    assert encrypted[:0x2000] == reference_encrypt(mode_keyblob, 0x30000000, image[:0x2000])
+    assert encrypted[0x2000:0x3000] == reference_encrypt(second, 0x30002000, image[0x2000:0x3000])
+    assert encrypted[0x3000:] == reference_encrypt(mode_keyblob, 0x30003000, image[0x3000:])
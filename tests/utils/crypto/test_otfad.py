@@ -9,9 +9,10 @@ import os
 
 import pytest
 
+from spsdk.crypto.symmetric import Counter, aes_ctr_encrypt
 from spsdk.exceptions import SPSDKError
 from spsdk.utils.crypto.otfad import KeyBlob, Otfad
-from spsdk.utils.misc import align_block
+from spsdk.utils.misc import Endianness, align_block
 
 
 def test_otfad_keyblob(data_dir):
@@ -140,3 +141,50 @@ def test_keyblob_invalid():
     key_blob.ctr_init_vector = bytes(99)
     with pytest.raises(SPSDKError, match="Invalid length of counter init"):
         key_blob._get_ctr_nonce()
+
+
+def reference_encrypt(key_blob: KeyBlob, counter_value: int, data: bytes, byte_swap: bool) -> bytes:
+    """Encryption of each 16 bytes block with its own AES-CTR context."""
+    counter = Counter(key_blob._get_ctr_nonce(), counter_value, Endianness.BIG)
+    result = bytearray()
+    for index in range(0, len(data), 16):
+        block = data[index : index + 16]
+        if byte_swap:
+            block = block[7::-1] + block[15:7:-1]
+        encrypted = aes_ctr_encrypt(key_blob.key, block, counter.value)
+        if byte_swap:
+            encrypted = encrypted[7::-1] + encrypted[15:7:-1]
+        result += encrypted
+        counter.increment(16)
+    return bytes(result)
+
+
+@pytest.mark.parametrize("byte_swap", [True, False])
+def test_otfad_keyblob_encrypt_reference(byte_swap):
+    key_blob = KeyBlob(start_addr=0x30001000, end_addr=0x3010FFFF)
+    data = os.urandom(0x10000)
+    # counter starts at start address of key blob by default
+    encrypted = key_blob.encrypt_image(0x30002000, data, byte_swap)
+    assert encrypted == reference_encrypt(key_blob, 0x30001000, data, byte_swap)
+    encrypted = key_blob.encrypt_image(0x30002000, data, byte_swap, counter_value=0x30002000)
+    assert encrypted == reference_encrypt(key_blob, 0x30002000, data, byte_swap)
+
+
+def test_otfad_encrypt_image_keyblobs():
+    """Data units are encrypted by the last matching key blob, the rest is kept."""
+    otfad = Otfad()
+    blobs = [
+        KeyBlob(start_addr=0x30000000, end_addr=0x30001FFF),
+        KeyBlob(start_addr=0x30001000, end_addr=0x300023FF),
+        KeyBlob(start_addr=0x30004000, end_addr=0x30007FFF),
+    ]
+    for blob in blobs:
+        otfad.add_key_blob(blob)
+    image = os.urandom(0x5000)
+    encrypted = otfad.encrypt_image(image, 0x30000000, True)
+    assert encrypted[:0x1000] == reference_encrypt(blobs[0], 0x30000000, image[:0x1000], True)
+    assert encrypted[0x1000:0x2000] == reference_encrypt(
+        blobs[1], 0x30001000, image[0x1000:0x2000], True
+    )
+    assert encrypted[0x2000:0x4000] == image[0x2000:0x4000]
+    assert encrypted[0x4000:] == reference_encrypt(blobs[2], 0x30004000, image[0x4000:], True)
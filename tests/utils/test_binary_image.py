@@ -5,12 +5,15 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import io
 import os
+import shutil
 
 import pytest
 
-from spsdk.exceptions import SPSDKError, SPSDKValueError
+from spsdk.exceptions import SPSDKError, SPSDKOverlapError, SPSDKValueError
 from spsdk.utils.images import BinaryImage, BinaryPattern
+from spsdk.utils.misc import align
 
 
 def test_binary_image_sort_sub_images():
@@ -143,3 +146,163 @@ def test_binary_image_load_elf(data_dir):
     assert binary.offset == 0x8000_2000
     binary.add_image(BinaryImage.load_binary_image(os.path.join(data_dir, "images/image.s19")))
     assert binary.size == 582818
+
+
+def test_binary_image_size_invalidation():
+    """The computed size follows changes of sub images."""
+    image = BinaryImage(name="main")
+    child = BinaryImage(name="child", offset=0x10)
+    grandchild = BinaryImage(name="grandchild", binary=b"\x01" * 4)
+    image.add_image(child)
+    child.add_image(grandchild)
+    assert len(image) == 0x14
+    grandchild.binary = b"\x02" * 8
+    assert len(image) == 0x18
+    grandchild.offset = 0x8
+    assert len(image) == 0x20
+    child.alignment = 0x40
+    assert len(image) == 0x50
+    child.alignment = 1
+    child.size = 0x20
+    assert len(image) == 0x30
+    image.add_image(BinaryImage(name="tail", size=4, offset=0x40))
+    assert len(image) == 0x44
+    assert image.export() == bytes(0x18) + b"\x02" * 8 + bytes(0x24)
+
+
+def test_binary_image_export_nested():
+    """Nested images are exported with patterns of the images and overflowing binaries."""
+    image = BinaryImage(name="main", pattern=BinaryPattern("ones"))
+    child = BinaryImage(name="child", size=8, offset=4, pattern=BinaryPattern("0xA5"))
+    child.add_image(BinaryImage(name="leaf", offset=2, binary=b"\x01\x02"))
+    image.add_image(child)
+    image.add_image(BinaryImage(name="no_pattern", size=4, offset=0x10, binary=b"\x03"))
+    image.add_image(BinaryImage(name="overflow", size=2, offset=0x18, binary=b"\x04" * 4))
+    image.add_image(BinaryImage(name="end", size=2, offset=0x1C))
+    assert image.export() == (
+        b"\xff" * 4
+        + b"\xa5\xa5\x01\x02\xa5\xa5\xa5\xa5"
+        + b"\xff" * 4
+        + b"\x03\x00\x00\x00"
+        + b"\xff" * 4
+        + b"\x04" * 4
+        + b"\x00" * 2
+    )
+    small = BinaryImage(name="small", size=4)
+    small.add_image(BinaryImage(name="big", size=8))
+    with pytest.raises(ValueError):
+        small.export()
+
+
+def test_binary_image_validate_overlap():
+    """Overlapping images are detected also if their order changes after adding."""
+    image = BinaryImage(name="main", size=0x100)
+    images = [BinaryImage(name=f"img{idx}", size=0x10, offset=0x10 * idx) for idx in range(8)]
+    for img in images:
+        image.add_image(img)
+    image.add_image(BinaryImage(name="empty", offset=0x20))
+    image.validate()
+    images[0].offset = 0x38
+    with pytest.raises(SPSDKOverlapError):
+        image.validate()
+
+
+def test_binary_image_many_regions():
+    """Layout of many images is loaded, validated and exported."""
+    count = 200
+    config = {
+        "name": "regions",
+        "regions": [{"binary_block": {"size": 16, "pattern": idx & 0xFF}} for idx in range(count)],
+    }
+    image = BinaryImage.load_from_config(config)
+    image.validate()
+    data = image.export()
+    assert len(data) == len(image) == count * 16
+    assert data == b"".join(bytes([idx & 0xFF] * 16) for idx in range(count))
+
+
+def test_binary_image_lazy_binary(data_dir, tmpdir):
+    """Plain binary is loaded from file only when its content is needed."""
+    path = os.path.join(data_dir, "images/image.bin")
+    with open(path, "rb") as f:
+        data = f.read()
+    image = BinaryImage.load_binary_image(path, alignment=0x1000, pattern=BinaryPattern("ones"))
+    segment = image.sub_images[0]
+    assert segment._binary_file
+    assert len(image) == len(segment) == align(len(data), 0x1000)
+    exported = image.export()
+    assert exported == data + b"\xff" * (len(image) - len(data))
+    out_path = os.path.join(tmpdir, "out", "image.bin")
+    image.save_binary_image(out_path)
+    with open(out_path, "rb") as f:
+        assert f.read() == exported
+    assert segment._binary_file
+    assert segment.binary == data
+    assert not segment._binary_file
+    # the text formats are still parsed
+    image = BinaryImage.load_binary_image(os.path.join(data_dir, "images/image.hex"))
+    assert not image.sub_images[0]._binary_file
+
+
+def test_binary_image_lazy_binary_changed(data_dir, tmpdir):
+    """Change of the lazily loaded file is detected."""
+    path = os.path.join(tmpdir, "image.bin")
+    shutil.copy(os.path.join(data_dir, "images/image.bin"), path)
+    image = BinaryImage.load_binary_image(path)
+    with open(path, "ab") as f:
+        f.write(b"\x00")
+    with pytest.raises(SPSDKError, match="has been changed"):
+        image.export()
+
+
+def test_binary_image_export_to_stream(data_dir):
+    """Streamed image is the same as exported one."""
+    path = os.path.join(data_dir, "images/image.bin")
+    image = BinaryImage(name="main", pattern=BinaryPattern("inc"))
+    image.add_image(BinaryImage(name="block", size=0x100, offset=0x10, binary=b"\x01" * 0x20))
+    image.add_image(BinaryImage.load_binary_image(path, offset=0x200, pattern=BinaryPattern("0")))
+    image.add_image(BinaryImage(name="tail", size=0x20, offset=0x4000))
+    gap_image = BinaryImage(name="gap")
+    gap_image.add_image(BinaryImage(name="far", size=0x10, offset=0x180000, binary=b"\x03"))
+    for img in [image, image.sub_images[1], gap_image]:
+        stream = io.BytesIO()
+        assert img.export_to_stream(stream) == len(img)
+        assert stream.getvalue() == img.export()
+    # overlapping images are exported into memory
+    image.add_image(BinaryImage(name="overlap", size=0x10, offset=0x300, binary=b"\x02" * 0x10))
+    stream = io.BytesIO()
+    image.export_to_stream(stream)
+    assert stream.getvalue() == image.export()
+
+
+@pytest.mark.parametrize(
+    "header",
+    [bytes(0x20000), b"ABCD" * 0x8000, b"\xff" * 0x100],
+    ids=["zeros", "ascii", "ones"],
+)
+def test_binary_image_lazy_binary_header(header, tmpdir):
+    """Plain binaries are loaded lazily whatever their beginning is."""
+    path = os.path.join(tmpdir, "image.bin")
+    data = header + b"\x01\x02\x03\x04"
+    with open(path, "wb") as f:
+        f.write(data)
+    image = BinaryImage.load_binary_image(path)
+    assert image.sub_images[0]._binary_file
+    assert image.export() == data
+
+
+def test_binary_image_save_over_source(data_dir, tmpdir):
+    """Image can be saved over the file it was loaded from."""
+    path = os.path.join(tmpdir, "image.bin")
+    shutil.copy(os.path.join(data_dir, "images/image.bin"), path)
+    with open(path, "rb") as f:
+        data = f.read()
+    BinaryImage.load_binary_image(path).save_binary_image(path)
+    with open(path, "rb") as f:
+        assert f.read() == data
+    image = BinaryImage(name="merged")
+    image.add_image(BinaryImage.load_binary_image(path))
+    image.add_image(BinaryImage(name="tail", size=0x10, offset=len(data), binary=b"\x01" * 0x10))
+    image.save_binary_image(path)
+    with open(path, "rb") as f:
+        assert f.read() == data + b"\x01" * 0x10
@@ -7,13 +7,16 @@
 
 
 import os
+import shutil
 from typing import List
+from unittest.mock import patch
 
 import pytest
 
+from spsdk import SPSDK_DATA_FOLDER
 from spsdk.exceptions import SPSDKValueError
 from spsdk.utils import database
-from spsdk.utils.database import Database, DatabaseManager, SPSDKErrorMissingDevice
+from spsdk.utils.database import Database, DatabaseCache, DatabaseManager, SPSDKErrorMissingDevice
 
 
 class SPSDK_TestDatabase:
@@ -168,3 +171,93 @@ def test_load_database():
 def test_load_database_without_cache():
     database.SPSDK_CACHE_DISABLED = True
     assert isinstance(DatabaseManager().db, Database)
+
+
+@pytest.fixture
+def test_db_copy(tmpdir, data_dir):
+    path = os.path.join(tmpdir, "test_db")
+    shutil.copytree(os.path.join(data_dir, "test_db"), path)
+    return path
+
+
+def test_lazy_device_loading(test_db_copy):
+    db = Database(test_db_copy)
+    assert len(db._devices) == 0
+    assert db.get_device("dev1_alias").device_alias.name == "dev1"
+    assert sorted(dev.name for dev in db._devices) == ["dev1", "dev1_alias"]
+    assert db.get_device_features("dev1", "rev1").get_int("feature1", "atrribute_int1") == 1
+    assert len(db._devices) == 2
+    assert sorted(db.devices.devices_names) == ["dev1", "dev1_alias", "dev2"]
+    with pytest.raises(SPSDKErrorMissingDevice):
+        db.get_device("invalid")
+
+
+def test_database_cache_shards(tmpdir, test_db_copy):
+    cache = DatabaseCache(os.path.join(tmpdir, "cache"))
+    db = Database(test_db_copy, cache=cache)
+    db.get_device("dev1_alias")
+    assert sorted(os.listdir(os.path.join(cache.path, "devices"))) == [
+        "dev1.cache",
+        "dev1_alias.cache",
+    ]
+    with patch("spsdk.utils.database.Device.load") as device_load:
+        cached_db = Database(test_db_copy, cache=cache)
+        dev = cached_db.get_device("dev1_alias")
+        device_load.assert_not_called()
+    assert dev.revisions.get("new_rev").get_int("feature1", "atrribute_int1") == 1
+    # changed source invalidates just the shards created from it
+    dev1_path = os.path.join(test_db_copy, "devices", "dev1", "database.yaml")
+    with open(dev1_path, "a") as f:
+        f.write("\n")
+    assert cache.load("devices", "dev1") is None
+    assert cache.load("devices", "dev1_alias") is None
+    db.get_device("dev2")
+    with open(os.path.join(test_db_copy, "devices", "dev2", "database.yaml"), "a") as f:
+        f.write("\n")
+    assert cache.load("devices", "dev2") is None
+    assert Database(test_db_copy, cache=cache).get_device("dev1_alias").name == "dev1_alias"
+    assert cache.load("devices", "dev1_alias") is not None
+
+
+def test_database_device_from_cache(tmpdir):
+    """Single device is loaded from warm cache without parsing its description."""
+    cache = DatabaseCache(os.path.join(tmpdir, "cache"))
+    cold = Database(SPSDK_DATA_FOLDER, cache=cache).get_device("lpc55s6x")
+    assert cache.load("devices", "lpc55s6x") is not None
+    with patch("spsdk.utils.database.load_configuration") as load_config:
+        warm = Database(SPSDK_DATA_FOLDER, cache=cache).get_device("lpc55s6x")
+    load_config.assert_not_called()
+    assert warm.name == cold.name
+    assert warm.info.memory_map == cold.info.memory_map
+    assert warm.revisions.revision_names() == cold.revisions.revision_names()
+
+
+def test_db_hash_visits_files_once(test_db_copy):
+    db_files = [
+        os.path.join(root, file)
+        for root, _, files in os.walk(test_db_copy)
+        for file in files
+        if file.endswith(".yaml")
+    ]
+    with patch("spsdk.utils.database.os.stat", wraps=os.stat) as stat:
+        db_hash = DatabaseManager.get_db_hash(test_db_copy)
+    assert sorted(call.args[0] for call in stat.call_args_list) == sorted(db_files)
+    assert DatabaseManager.get_db_hash(test_db_copy) == db_hash
+    with open(db_files[0], "a") as f:
+        f.write("\n")
+    assert DatabaseManager.get_db_hash(test_db_copy) != db_hash
+
+
+def test_cache_manifest(tmpdir, test_db_copy, monkeypatch):
+    cache_path = os.path.join(tmpdir, "cache")
+    monkeypatch.setattr(database, "SPSDK_DATA_FOLDER", test_db_copy)
+    monkeypatch.setattr(DatabaseManager, "_db_cache_file_name", cache_path)
+    DatabaseManager._check_cache_manifest()
+    Database(test_db_copy, cache=DatabaseCache(cache_path)).get_device("dev1")
+    DatabaseManager._check_cache_manifest()
+    assert os.path.exists(os.path.join(cache_path, "devices", "dev1.cache"))
+    # change of any file in data folder drops the whole cache
+    with open(os.path.join(test_db_copy, "devices", "dev2", "database.yaml"), "a") as f:
+        f.write("\n")
+    DatabaseManager._check_cache_manifest()
+    assert os.listdir(cache_path) == ["manifest"]
@@ -8,11 +8,14 @@
 
 import os
 from typing import Any, Dict
+from unittest.mock import patch
 
 import pytest
 from ruamel.yaml import YAML
 
+from spsdk import SPSDK_DATA_FOLDER
 from spsdk.exceptions import SPSDKError
+from spsdk.utils.database import DatabaseCache
 from spsdk.utils.exceptions import (
     SPSDKRegsError,
     SPSDKRegsErrorBitfieldNotFound,
@@ -20,6 +23,7 @@ from spsdk.utils.exceptions import (
     SPSDKRegsErrorRegisterGroupMishmash,
     SPSDKRegsErrorRegisterNotFound,
 )
+from spsdk.utils.images import BinaryPattern
 from spsdk.utils.misc import (
     Endianness,
     load_configuration,
@@ -27,7 +31,7 @@ from spsdk.utils.misc import (
     value_to_bytes,
     value_to_int,
 )
-from spsdk.utils.registers import Registers, RegsBitField, RegsEnum, RegsRegister
+from spsdk.utils.registers import Registers, RegistersCache, RegsBitField, RegsEnum, RegsRegister
 
 TEST_DEVICE_NAME = "TestDevice1"
 TEST_REG_NAME = "TestReg"
@@ -227,6 +231,51 @@ def test_register_duplicate():
         regs.add_register(reg1)
 
 
+def test_register_alias_lookup():
+    """Test lookups of registers added at the same offset and of group registers."""
+    regs = create_simple_regs()
+    alias = RegsRegister("Alias", TEST_REG_OFFSET + 4, TEST_REG_WIDTH)
+    alias.add_bitfield(RegsBitField(alias, "AliasBitfield", 0, 1))
+    regs.add_register(alias)
+    reg2 = regs.find_reg(TEST_REG_NAME + "_2")
+    assert regs.find_reg("Alias") is reg2
+    assert reg2.find_bitfield("AliasBitfield").name == "AliasBitfield"
+    assert regs.get_reg_names() == [TEST_REG_NAME, TEST_REG_NAME + "_2"]
+    # the alias doesn't block the register of the same name, the first one is found
+    regs.add_register(RegsRegister("Alias", TEST_REG_OFFSET + 8, TEST_REG_WIDTH))
+    assert regs.find_reg("Alias") is reg2
+    # aliases and group members added directly to the register are found too
+    reg2.add_alias("DirectAlias")
+    assert regs.find_reg("DirectAlias") is reg2
+    group = RegsRegister("Group", 0, 0)
+    regs.add_register(group)
+    group.add_group_reg(RegsRegister("Group0", TEST_REG_OFFSET + 12, TEST_REG_WIDTH))
+    with pytest.raises(SPSDKRegsErrorRegisterNotFound):
+        regs.find_reg("Group0")
+    assert regs.find_reg("Group0", include_group_regs=True).offset == TEST_REG_OFFSET + 12
+    # the group got its offset from the first member
+    regs.add_register(RegsRegister("GroupAlias", TEST_REG_OFFSET + 12, TEST_REG_WIDTH))
+    assert regs.find_reg("GroupAlias") is group
+    regs.remove_registers()
+    with pytest.raises(SPSDKRegsErrorRegisterNotFound):
+        regs.find_reg(TEST_REG_NAME)
+
+
+def test_registers_find_many():
+    """Registers and bitfields are found by name among many registers."""
+    count = 200
+    regs = Registers(TEST_DEVICE_NAME)
+    for idx in range(count):
+        reg = RegsRegister(f"Reg{idx}", 4 * (idx + 1), 32)
+        for bit in range(32):
+            reg.add_bitfield(RegsBitField(reg, f"Bit{bit}", bit, 1))
+        regs.add_register(reg)
+    for idx in range(count):
+        reg = regs.find_reg(f"Reg{idx}")
+        assert reg.offset == 4 * (idx + 1)
+        assert reg.find_bitfield("Bit31").offset == 31
+
+
 def test_register_invalid_val():
     """Invalid value register test."""
     reg = RegsRegister(
@@ -967,3 +1016,143 @@ def test_regs(
             assert reg_val == excepted_val
 
     regs.reset_values()
+
+
+def test_registers_compact_storage():
+    """Registers and bitfields don't carry per-instance dictionaries."""
+    reg = RegsRegister(TEST_REG_NAME, TEST_REG_OFFSET, 64, alt_widths=[64, 32])
+    bitfield = RegsBitField(reg, TEST_BITFIELD_NAME, 4, 8)
+    reg.add_bitfield(bitfield)
+    for obj in [reg, bitfield, RegsEnum(TEST_ENUM_NAME, 0, TEST_ENUM_DESCR)]:
+        assert not hasattr(obj, "__dict__")
+    assert reg.alt_widths == [32, 64]
+    bitfield.set_value(0xAB)
+    assert reg.get_value() == 0xAB0
+    assert reg.get_bytes_value() == b"\x00\x00\x0a\xb0"
+    bitfield.width = 4
+    assert bitfield.get_value() == 0xB
+
+
+def test_registers_export_layout():
+    """Bulk export packs registers in the same layout as the registers image."""
+    regs = Registers(TEST_DEVICE_NAME, base_endianness=Endianness.LITTLE)
+    for idx, width in enumerate([32, 16, 64]):
+        reg = RegsRegister(f"Reg{idx}", 0x10 * (3 - idx), width)
+        regs.add_register(reg)
+        reg.set_value(0x1122334455667788 & ((1 << width) - 1))
+    for size, pattern in [(0, BinaryPattern("zeros")), (0x40, BinaryPattern("0xA5"))]:
+        data = regs.export(size, pattern)
+        assert data == regs.image_info(size, pattern).export()
+    assert len(regs.export()) == 0x34
+    regs2 = Registers(TEST_DEVICE_NAME, base_endianness=Endianness.LITTLE)
+    for reg in regs.get_registers():
+        regs2.add_register(RegsRegister(reg.name, reg.offset, reg.width))
+    regs2.parse(regs.export())
+    assert regs2 == regs
+
+
+@pytest.fixture
+def regs_cache(tmpdir):
+    cache = RegistersCache(cache=DatabaseCache(str(tmpdir)))
+    with patch("spsdk.utils.registers.registers_cache", cache):
+        yield cache
+
+
+def test_registers_cache_clone(regs_cache: RegistersCache, data_dir):
+    """Each registers instance gets its own copy of the cached registers."""
+    group = [{"name": "TestRegA", "alternative_widths": [64, 32]}]
+    regs = Registers(TEST_DEVICE_NAME)
+    regs.load_registers_from_xml(data_dir + "/grp_regs.xml", grouped_regs=group)
+    regs2 = Registers(TEST_DEVICE_NAME)
+    regs2.load_registers_from_xml(data_dir + "/grp_regs.xml", grouped_regs=group)
+    assert (regs_cache.hits, regs_cache.misses) == (1, 1)
+    assert regs == regs2
+
+    reg = regs.find_reg("TestRegA")
+    reg2 = regs2.find_reg("TestRegA")
+    assert reg is not reg2
+    reg.add_setvalue_hook(lambda val, context: val ^ 0xFF)
+    reg.set_value(0x1234)
+    assert reg.get_value() == 0x12CB
+    assert reg2.get_value() == 0
+    assert regs.find_reg("TestRegA0", include_group_regs=True).get_value() == 0x12CB
+    assert regs2.find_reg("TestRegA0", include_group_regs=True).get_value() == 0
+    assert group[0]["alternative_widths"] == [64, 32]
+    # different grouping is cached separately
+    regs3 = Registers(TEST_DEVICE_NAME)
+    regs3.load_registers_from_xml(data_dir + "/grp_regs.xml")
+    assert regs_cache.misses == 2
+    assert regs3.find_reg("TestRegA0").offset == 0x400
+
+
+def test_registers_cache_bitfields(regs_cache: RegistersCache, data_dir):
+    """Bitfields of cloned registers belong to the clones."""
+    regs = Registers(TEST_DEVICE_NAME)
+    regs.load_registers_from_xml(data_dir + "/registers.xml")
+    regs2 = Registers(TEST_DEVICE_NAME)
+    regs2.load_registers_from_xml(data_dir + "/registers.xml")
+    for reg, reg2 in zip(regs.get_registers(), regs2.get_registers()):
+        for bitfield, bitfield2 in zip(reg.get_bitfields(), reg2.get_bitfields()):
+            assert bitfield.parent is reg and bitfield2.parent is reg2
+            assert reg2.find_bitfield(bitfield.name) is bitfield2
+            bitfield.set_value(1)
+            assert bitfield2.get_value() == bitfield2.get_reset_value()
+
+
+def test_registers_cache_alias(regs_cache: RegistersCache, tmpdir):
+    """Bitfields of register aliased at the same offset keep their own parent in clones."""
+    xml = os.path.join(tmpdir, "alias.xml")
+    with open(xml, "w", encoding="utf-8") as f:
+        f.write(
+            '<regs><register offset="0x4" width="32" name="Reg">\n'
+            '<bit_field offset="0" width="16" name="Low"/></register>\n'
+            '<register offset="0x4" width="32" name="RegAlias">\n'
+            '<bit_field offset="16" width="16" name="High"/></register></regs>\n'
+        )
+    for _ in range(2):
+        regs = Registers(TEST_DEVICE_NAME)
+        regs.load_registers_from_xml(xml)
+        reg = regs.find_reg("RegAlias")
+        reg.set_value(0x12345678)
+        reg.find_bitfield("High").set_value(0xFFFF)
+        reg.find_bitfield("Low").set_value(0)
+        assert reg.get_value() == 0x12340000
+        assert reg.find_bitfield("High").parent.get_value() == 0xFFFF0000
+    assert regs_cache.hits == 1
+
+
+def test_registers_cache_changed_file(regs_cache: RegistersCache, data_dir, tmpdir):
+    """Changed XML file is loaded again, the templates are stored on disk."""
+    xml = os.path.join(tmpdir, "registers.xml")
+    regs = Registers(TEST_DEVICE_NAME)
+    regs.load_registers_from_xml(data_dir + "/registers.xml")
+    regs.write_xml(xml)
+    Registers(TEST_DEVICE_NAME).load_registers_from_xml(xml)
+    regs.find_reg(TEST_REG_NAME).name = "RenamedReg"
+    regs.write_xml(xml)
+    os.utime(xml, ns=(0, 0))
+    changed_regs = Registers(TEST_DEVICE_NAME)
+    changed_regs.load_registers_from_xml(xml)
+    assert changed_regs.find_reg("RenamedReg")
+    assert (regs_cache.hits, regs_cache.misses) == (0, 3)
+
+    regs_cache.clear()
+    cached_regs = Registers(TEST_DEVICE_NAME)
+    cached_regs.load_registers_from_xml(xml)
+    assert cached_regs == changed_regs
+    assert regs_cache.disk_hits == 1
+    assert "1 templates, 0 hits, 1 disk hits, 3 misses" in str(regs_cache)
+
+
+def test_registers_cache_device_xml(regs_cache: RegistersCache):
+    """Creating the registers from cached template doesn't parse the XML file."""
+    xml = os.path.join(SPSDK_DATA_FOLDER, "devices", "mcxn9xx", "pfr_cmpa_a1.xml")
+    loaded = Registers(TEST_DEVICE_NAME)
+    loaded.load_registers_from_xml(xml)
+    with patch("spsdk.utils.registers.ET.parse") as parse:
+        for _ in range(3):
+            cached = Registers(TEST_DEVICE_NAME)
+            cached.load_registers_from_xml(xml)
+            assert cached == loaded
+    parse.assert_not_called()
+    assert (regs_cache.hits, regs_cache.misses) == (3, 1)
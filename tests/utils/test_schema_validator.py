@@ -5,16 +5,24 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import copy
 import os
 from typing import Any, Dict, Optional
+from unittest.mock import patch
 
+import fastjsonschema
 import pytest
 import yaml
 
 from spsdk.exceptions import SPSDKError
 from spsdk.utils.database import DatabaseManager
 from spsdk.utils.misc import use_working_directory
-from spsdk.utils.schema_validator import CommentedConfig, check_config
+from spsdk.utils.schema_validator import (
+    CommentedConfig,
+    ValidatorCache,
+    check_config,
+    validator_cache,
+)
 
 # schema for testing commented YAML configuration
 _TEST_CONFIG_SCHEMA = {
@@ -307,3 +315,111 @@ def test_load_schema_file() -> None:
 
     with pytest.raises(SPSDKError):
         DatabaseManager().db.get_schema_file("total_invalid_name")
+
+
+CACHE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "n1": {"type": ["number", "string"], "format": "number"},
+        "f1": {"type": "string", "format": "file"},
+    },
+}
+
+
+def test_validator_cache_search_paths(tmpdir) -> None:
+    """Cached validator uses formatters of the current call."""
+    schema = copy.deepcopy(CACHE_SCHEMA)
+    schema["properties"]["cache_test"] = {"type": "string"}
+    for idx in range(2):
+        folder = os.path.join(tmpdir, str(idx))
+        os.mkdir(folder)
+        with open(os.path.join(folder, f"file{idx}.bin"), "wb") as f:
+            f.write(bytes(16))
+    misses = validator_cache.misses + validator_cache.disk_hits
+    hits = validator_cache.hits
+    check_config({"f1": "file0.bin"}, [schema], search_paths=[os.path.join(tmpdir, "0")])
+    check_config({"f1": "file1.bin"}, [schema], search_paths=[os.path.join(tmpdir, "1")])
+    with pytest.raises(SPSDKError):
+        check_config({"f1": "file1.bin"}, [schema], search_paths=[os.path.join(tmpdir, "0")])
+    assert validator_cache.misses + validator_cache.disk_hits == misses + 1
+    assert validator_cache.hits == hits + 2
+
+
+def test_validator_cache_fingerprint() -> None:
+    formats = {"number": lambda x: True, "file": lambda x: False}
+    fingerprint = ValidatorCache.fingerprint([CACHE_SCHEMA], formats)
+    assert fingerprint == ValidatorCache.fingerprint([copy.deepcopy(CACHE_SCHEMA)], dict(formats))
+    # implementation of callable formatters doesn't matter
+    assert fingerprint == ValidatorCache.fingerprint([CACHE_SCHEMA], {"number": 1, "file": 2})
+    assert fingerprint != ValidatorCache.fingerprint([CACHE_SCHEMA], {"number": lambda x: True})
+    assert fingerprint != ValidatorCache.fingerprint([CACHE_SCHEMA, {"required": ["n1"]}], formats)
+    assert fingerprint != ValidatorCache.fingerprint([CACHE_SCHEMA], {**formats, "hex": "^0x"})
+
+
+def test_validator_cache_fingerprint_memoized(tmpdir) -> None:
+    formats = {"number": lambda x: True, "file": lambda x: True}
+    schemas = [CACHE_SCHEMA]
+    cache = ValidatorCache(cache_dir=str(tmpdir))
+    with patch.object(ValidatorCache, "fingerprint", wraps=ValidatorCache.fingerprint) as mock:
+        validator = cache.get_validator(schemas, formats)
+        assert cache.get_validator(schemas, dict(formats)) is validator
+        assert mock.call_count == 1
+        # other schema objects are fingerprinted again
+        assert cache.get_validator([copy.deepcopy(CACHE_SCHEMA)], formats) is validator
+        assert mock.call_count == 2
+        cache.get_validator(schemas, {**formats, "hex": "^0x"})
+        assert mock.call_count == 3
+    assert cache.hits == 2
+
+
+def test_validator_cache_schema_id(tmpdir) -> None:
+    """The main validation function is found regardless of its generated name."""
+    formats = {"number": lambda x: True, "file": lambda x: True}
+    schema = {**CACHE_SCHEMA, "$id": "https://spsdk.test/cache.json", "required": ["n1"]}
+    cache = ValidatorCache(cache_dir=str(tmpdir))
+    validator = cache.get_validator([schema], formats)
+    validator({"n1": 1}, custom_formats=formats)
+    with pytest.raises(fastjsonschema.JsonSchemaValueException):
+        validator({}, custom_formats=formats)
+    other_cache = ValidatorCache(cache_dir=str(tmpdir))
+    other_cache.get_validator([schema], formats)
+    assert other_cache.disk_hits == 1
+
+
+def test_validator_cache_lru_and_disk(tmpdir) -> None:
+    formats = {"number": lambda x: x != "bad", "file": lambda x: True}
+    schemas = [{**CACHE_SCHEMA, "required": [name]} for name in ["a", "b", "c"]]
+    cache = ValidatorCache(max_size=2, cache_dir=str(tmpdir))
+    for schema in schemas:
+        cache.get_validator([schema], formats)
+    assert len(cache) == 2 and cache.misses == 3
+    assert len(os.listdir(tmpdir)) == 3
+    # the first validator was evicted from memory, but it's loaded from disk
+    validator = cache.get_validator([schemas[0]], formats)
+    assert cache.disk_hits == 1
+    cache.get_validator([schemas[0]], formats)
+    assert cache.hits == 1
+    validator({"a": 1, "n1": "1"}, custom_formats=formats)
+    with pytest.raises(fastjsonschema.JsonSchemaValueException):
+        validator({"a": 1, "n1": "bad"}, custom_formats=formats)
+    with pytest.raises(fastjsonschema.JsonSchemaValueException):
+        validator({}, custom_formats=formats)
+
+    # another process reuses the validators stored on disk
+    other_cache = ValidatorCache(cache_dir=str(tmpdir))
+    for schema in schemas:
+        other_cache.get_validator([schema], formats)
+    assert other_cache.disk_hits == 3 and other_cache.misses == 0
+
+
+def test_validator_cache_corrupted_file(tmpdir) -> None:
+    formats = {"number": lambda x: True, "file": lambda x: True}
+    cache = ValidatorCache(cache_dir=str(tmpdir))
+    cache.get_validator([CACHE_SCHEMA], formats)
+    for file_name in os.listdir(tmpdir):
+        with open(os.path.join(tmpdir, file_name), "w") as f:
+            f.write("this is not python")
+    cache.clear()
+    validator = cache.get_validator([CACHE_SCHEMA], formats)
+    assert cache.misses == 2
+    validator({"n1": 1}, custom_formats=formats)